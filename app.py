@@ -1,6 +1,6 @@
 import streamlit as st
 from datetime import datetime
-from utils.supabase_db import SupabaseDB  # SupabaseDB 클래스를 import
+from utils.storage_backend import get_db  # 현재 세션의 데이터베이스 백엔드 (없으면 생성)
 import os
 from dotenv import load_dotenv
 import bcrypt
@@ -164,17 +164,18 @@ if 'current_page' not in st.session_state:
 
 # 세션 상태 초기화
 if 'db' not in st.session_state:
-    # Supabase 연결 정보 확인
+    # Supabase 연결 정보 확인 (로컬 SQLite 백엔드는 연결 정보 불필요)
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_KEY")
+    use_supabase = os.getenv("STORAGE_BACKEND", "supabase").strip().lower() != "sqlite"
     
-    if not supabase_url or not supabase_key:
+    if use_supabase and (not supabase_url or not supabase_key):
         st.error(translate("Supabase 연결 정보가 설정되어 있지 않습니다. '데이터 관리' 메뉴에서 설정해주세요."))
     else:
-        st.session_state.db = SupabaseDB()  # SupabaseDB 클래스의 인스턴스 생성
+        db = get_db()  # STORAGE_BACKEND 설정에 맞는 백엔드 인스턴스 생성
         # 관리자 계정 목록 로드
         try:
-            admin_users = st.session_state.db.get_all_users()
+            admin_users = db.get_all_users()
             admin_emails = [user.get('이메일', '').strip().lower() for user in admin_users if user.get('권한', '') == '관리자']
             st.session_state.admin_accounts = admin_emails
         except Exception as e:
@@ -221,7 +222,7 @@ else:
     # 관리자 권한 확인 및 업데이트 (페이지 접근 시마다 확인)
     if 'db' in st.session_state and hasattr(st.session_state, 'user_email'):
         try:
-            all_users = st.session_state.db.get_all_users()
+            all_users = get_db().get_all_users()
             admin_emails = [user.get('이메일', '').strip().lower() for user in all_users if user.get('권한', '') == '관리자']
             st.session_state.admin_accounts = admin_emails
             
@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from utils.user_data import load_user_data, save_user_data
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 import bcrypt
 from utils.translations import translate
 
@@ -21,7 +21,7 @@ def show_admin_management():
         # DB 연결이 있으면 관리자 계정 목록 로드
         if 'db' in st.session_state:
             try:
-                admin_users = [user.get('이메일', '').strip().lower() for user in st.session_state.db.get_all_users() if user.get('권한', '') == '관리자']
+                admin_users = [user.get('이메일', '').strip().lower() for user in get_db().get_all_users() if user.get('권한', '') == '관리자']
                 st.session_state.admin_accounts = admin_users
                 print(f"[DEBUG] 관리자 계정 목록: {admin_users}")
             except Exception as e:
@@ -74,7 +74,7 @@ def show_admin_section():
     st.subheader(translate("관리자 계정 목록"))
     
     # Supabase에서 관리자 계정 로드
-    db = SupabaseDB()
+    db = get_db()
     admin_users = [user for user in db.get_all_users() if user.get('권한', '') == '관리자']
     
     # 관리자 계정을 데이터프레임으로 변환
@@ -179,7 +179,7 @@ def show_user_section():
         return
     
     # Supabase에서 사용자 계정 로드
-    db = SupabaseDB()
+    db = get_db()
     regular_users = [user for user in db.get_all_users() if user.get('권한', '') != '관리자']
         
     # 사용자 목록 표시
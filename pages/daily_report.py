@@ -7,7 +7,6 @@ import sys
 import os
 import numpy as np
 import json
-from utils.supabase_db import SupabaseDB
 from utils.translations import translate
 
 # 프로젝트 루트 디렉토리를 path에 추가
@@ -6,6 +6,7 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from utils.translations import translate
+from utils.storage_backend import get_db
 
 # 전역 설정 변수
 TARGET_DEFECT_RATE = 0.02  # 목표 불량률 (%)
@@ -44,20 +45,12 @@ def calculate_achievement_rate(records):
     # 작업효율은 최대 100%로 제한
     return min(((total_production - total_defects) / total_target) * 100, 100)
 
-def show_worker_performance(records):
-    """작업자별 실적 표시"""
-    if not records:
+def show_worker_performance(worker_stats):
+    """작업자별 실적 표시 (worker_stats: get_production_summary로 집계한 작업자별 합계)"""
+    if worker_stats.empty:
         return
     
-    # 데이터프레임 변환
-    df = pd.DataFrame(records)
-    
-    # 작업자별 집계
-    worker_stats = df.groupby('작업자').agg({
-        '목표수량': 'sum',
-        '생산수량': 'sum',
-        '불량수량': 'sum'
-    }).reset_index()
+    worker_stats = worker_stats.copy()
     
     # KPI 계산 - 최대 100%로 제한
     worker_stats['달성률'] = (worker_stats['생산수량'] / worker_stats['목표수량'] * 100).round(1)
@@ -235,23 +228,24 @@ def show_dashboard():
         if st.button(translate("데이터 새로고침"), use_container_width=True):
             st.rerun()
     
-    # 데이터 로드
-    records = st.session_state.db.get_production_records(
-        start_date=start_date.strftime('%Y-%m-%d'),
-        end_date=end_date.strftime('%Y-%m-%d')
-    )
-    
-    if not records:
-        st.info(translate(f"{date_title} 기간의 생산 실적이 없습니다."))
-        return
-    
-    # 데이터프레임 변환
-    df = pd.DataFrame(records)
-    
-    # 라인 필터링
-    if selected_line != translate("전체"):
-        df = df[df['라인번호'] == selected_line]
-        if df.empty:
+    # 데이터 로드 - 전체 라인은 라인별, 특정 라인은 작업자별 합계를 DB에서 집계
+    if selected_line == translate("전체"):
+        stats = get_db().get_production_summary(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d'),
+            group_by=['라인번호']
+        )
+        if stats.empty:
+            st.info(translate(f"{date_title} 기간의 생산 실적이 없습니다."))
+            return
+    else:
+        stats = get_db().get_production_summary(
+            start_date=start_date.strftime('%Y-%m-%d'),
+            end_date=end_date.strftime('%Y-%m-%d'),
+            group_by=['작업자'],
+            filters={'라인번호': selected_line}
+        )
+        if stats.empty:
             st.info(translate(f"{date_title} 기간의 {selected_line} 라인 생산 실적이 없습니다."))
             return
     
@@ -259,9 +253,9 @@ def show_dashboard():
     st.markdown(f"<div class='section-title'>{date_title} {translate('주요 KPI 요약')}</div>", unsafe_allow_html=True)
     
     # KPI 계산
-    total_target = df['목표수량'].sum()
-    total_production = df['생산수량'].sum()
-    total_defects = df['불량수량'].sum()
+    total_target = stats['목표수량'].sum()
+    total_production = stats['생산수량'].sum()
+    total_defects = stats['불량수량'].sum()
     
     # 달성률은 최대 100%로 제한
     production_rate = min(round((total_production / total_target) * 100, 1), 100) if total_target > 0 else 0
@@ -334,11 +328,7 @@ def show_dashboard():
     # 라인별/작업자별 실적
     if selected_line == translate("전체"):
         # 라인별 실적 데이터
-        line_stats = df.groupby('라인번호').agg({
-            '목표수량': 'sum',
-            '생산수량': 'sum',
-            '불량수량': 'sum'
-        }).reset_index()
+        line_stats = stats.copy()
         
         # KPI 계산
         line_stats['달성률'] = (line_stats['생산수량'] / line_stats['목표수량'] * 100).round(1)
@@ -399,7 +389,7 @@ def show_dashboard():
     
     # 특정 라인이 선택된 경우 작업자별 실적 표시
     else:
-        show_worker_performance(df.to_dict('records'))
+        show_worker_performance(stats)
     
     # KPI 알림 섹션 추가
     st.markdown(f"<div class='section-title'>{translate('KPI 상태 알림')}</div>", unsafe_allow_html=True)
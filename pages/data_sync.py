@@ -16,7 +16,9 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from utils.local_storage import LocalStorage
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
+from utils.sync_engine import SYNC_TABLES, build_sync_plan, load_backend_rows, apply_sync_plan
+from utils.backup_archive import write_backup, RestoreJob
 
 # config_local.py가 있으면 관리자 계정 정보 로드, 없으면 기본값 사용
 try:
@@ -27,6 +29,11 @@ except ImportError:
 # 환경 변수 로드
 load_dotenv()
 
+def show_sync_plans(plans):
+    """동기화 계획의 데이터별 추가/수정/삭제 건수 표시"""
+    summary = [dict({translate('데이터'): translate(plan.label)}, **plan.counts()) for plan in plans]
+    st.dataframe(pd.DataFrame(summary), use_container_width=True, hide_index=True)
+
 def show_data_sync():
     st.title(translate("💾 데이터 관리"))
     
@@ -83,83 +90,69 @@ def show_data_sync():
                 key="app_to_supabase_options"
             )
             
-            if st.button(translate("앱 -> Supabase 동기화"), key="app_to_supabase_btn"):
-                with st.spinner(translate("데이터를 동기화 중입니다...")):
-                    sync_results = []
-                    
+            # 양쪽 행의 내용 해시를 비교하여 변경분만 계산하고, 건수를 확인한 뒤 반영
+            if st.button(translate("변경 사항 확인"), key="app_to_supabase_btn"):
+                with st.spinner(translate("Supabase 데이터와 비교 중입니다...")):
                     try:
-                        db = st.session_state.db
-                        
-                        # 작업자 데이터 동기화
-                        if translate("작업자 데이터") in st.session_state.sync_options_app:
-                            if 'workers' in st.session_state and st.session_state.workers:
-                                for worker in st.session_state.workers:
-                                    db.add_worker(
-                                        employee_id=worker.get("사번", ""),
-                                        name=worker.get("이름", ""),
-                                        department=worker.get("부서", "CNC"),
-                                        line_number=worker.get("라인번호", "")
-                                    )
-                                sync_results.append(translate("✅ 작업자 데이터 동기화 완료"))
-                            else:
-                                sync_results.append(translate("⚠️ 동기화할 작업자 데이터가 없습니다"))
-                        
-                        # 생산 실적 데이터 동기화
-                        if translate("생산 실적 데이터") in st.session_state.sync_options_app:
-                            if 'production_data' in st.session_state and st.session_state.production_data:
-                                for record in st.session_state.production_data:
-                                    db.add_production_record(
-                                        date=record.get("날짜", datetime.now().strftime("%Y-%m-%d")),
-                                        worker=record.get("작업자", ""),
-                                        line_number=record.get("라인번호", ""),
-                                        model=record.get("모델차수", ""),
-                                        target_quantity=record.get("목표수량", 0),
-                                        production_quantity=record.get("생산수량", 0),
-                                        defect_quantity=record.get("불량수량", 0),
-                                        note=record.get("특이사항", "")
-                                    )
-                                sync_results.append(translate("✅ 생산 실적 데이터 동기화 완료"))
-                            else:
-                                sync_results.append(translate("⚠️ 동기화할 생산 실적 데이터가 없습니다"))
-                        
-                        # 사용자 데이터 동기화
-                        if translate("사용자 데이터") in st.session_state.sync_options_app:
-                            if 'users' in st.session_state and st.session_state.users:
-                                for user in st.session_state.users:
-                                    db.add_user(
-                                        email=user.get("이메일", ""),
-                                        password=user.get("비밀번호", ""),
-                                        name=user.get("이름", ""),
-                                        role=user.get("권한", "user")
-                                    )
-                                sync_results.append(translate("✅ 사용자 데이터 동기화 완료"))
-                            else:
-                                sync_results.append(translate("⚠️ 동기화할 사용자 데이터가 없습니다"))
-                        
-                        # 모델 데이터 동기화
-                        if translate("모델 데이터") in st.session_state.sync_options_app:
-                            if 'models' in st.session_state and st.session_state.models:
-                                for model in st.session_state.models:
-                                    db.add_model(
-                                        model_name=model.get("모델명", ""),
-                                        process=model.get("공정", "")
-                                    )
-                                sync_results.append(translate("✅ 모델 데이터 동기화 완료"))
-                            else:
-                                sync_results.append(translate("⚠️ 동기화할 모델 데이터가 없습니다"))
+                        db = get_db()
+                        plans = []
+                        for table, spec in SYNC_TABLES.items():
+                            if translate(spec['label']) not in st.session_state.sync_options_app:
+                                continue
+                            app_rows = st.session_state.get(spec['session_key']) or []
+                            # 앱에 데이터가 없으면 비교하지 않음 (전체 삭제 계획 방지)
+                            if not app_rows:
+                                st.warning(translate(f"⚠️ 동기화할 {spec['label']}가 없습니다"))
+                                continue
+                            plans.append(build_sync_plan(table, app_rows, load_backend_rows(db, table)))
+                        st.session_state.sync_plans_app = plans
+                    except Exception as e:
+                        st.error(translate(f"데이터 비교 중 오류가 발생했습니다: {str(e)}"))
+            
+            plans = st.session_state.get('sync_plans_app')
+            if plans:
+                show_sync_plans(plans)
+                allow_deletes = st.checkbox(translate("앱에 없는 행은 Supabase에서 삭제"), value=False, key="app_to_supabase_allow_delete")
+                
+                if st.button(translate("앱 -> Supabase 동기화"), key="app_to_supabase_commit_btn"):
+                    with st.spinner(translate("데이터를 동기화 중입니다...")):
+                        sync_results = []
                         
-                        st.success(translate("데이터 동기화가 완료되었습니다!"))
-                        for result in sync_results:
-                            st.write(result)
+                        try:
+                            db = get_db()
+                            for plan in plans:
+                                if not plan.has_changes or (not allow_deletes and not plan.inserts and not plan.updates):
+                                    sync_results.append(translate(f"✅ {plan.label} 변경 사항 없음"))
+                                    continue
+                                
+                                result = apply_sync_plan(db, plan, allow_deletes)
+                                message = f"{plan.label}: 추가 {result['추가']}건, 수정 {result['수정']}건, 삭제 {result['삭제']}건"
+                                if result['실패'] or result['errors']:
+                                    error = result['errors'][0] if result['errors'] else ''
+                                    sync_results.append(translate(f"⚠️ {message}, 실패 {result['실패']}건 {error}"))
+                                else:
+                                    sync_results.append(translate(f"✅ {message}"))
                             
-                    except Exception as e:
-                        st.error(translate(f"데이터 동기화 중 오류가 발생했습니다: {str(e)}"))
+                            # 반영한 계획은 다시 사용하지 않음 (다음 동기화 전에 다시 비교)
+                            del st.session_state['sync_plans_app']
+                            st.success(translate("데이터 동기화가 완료되었습니다!"))
+                            for result in sync_results:
+                                st.write(result)
+                                
+                        except Exception as e:
+                            st.error(translate(f"데이터 동기화 중 오류가 발생했습니다: {str(e)}"))
         
         # Supabase -> 앱 동기화
         with col2:
             st.write(translate("### Supabase -> 앱 동기화"))
             st.write(translate("Supabase 데이터베이스의 데이터를 앱으로 가져옵니다."))
             
+            # 로컬 복제본이 있으면 백그라운드에서 변경분만 동기화되므로 상태만 표시
+            replica = getattr(st.session_state.get('db'), 'replica', None)
+            if replica is not None:
+                st.caption(translate(f"로컬 복제본({replica.path})이 {replica.interval}초마다 변경분을 자동으로 동기화합니다."))
+                st.dataframe(pd.DataFrame(replica.status()), use_container_width=True, hide_index=True)
+            
             # 동기화 대상 선택
             st.session_state.sync_options_db = st.multiselect(
                 translate("동기화할 데이터 선택"),
@@ -168,143 +161,136 @@ def show_data_sync():
                 key="supabase_to_app_options"
             )
             
-            if st.button(translate("Supabase -> 앱 동기화"), key="supabase_to_app_btn"):
-                with st.spinner(translate("데이터를 동기화 중입니다...")):
-                    sync_results = []
-                    
+            # Supabase 데이터와 앱 데이터를 비교하여 바뀔 건수를 먼저 표시
+            if st.button(translate("변경 사항 확인"), key="supabase_to_app_btn"):
+                with st.spinner(translate("데이터를 비교 중입니다... (대용량 데이터는 시간이 걸릴 수 있습니다)")):
                     try:
-                        db = st.session_state.db
-                        
-                        # 작업자 데이터 가져오기
-                        if translate("작업자 데이터") in st.session_state.sync_options_db:
-                            from pages.worker_management import load_worker_data
-                            st.session_state.workers = load_worker_data()
-                            sync_results.append(translate(f"✅ 작업자 데이터 {len(st.session_state.workers)}개 로드 완료"))
-                        
-                        # 생산 실적 데이터 가져오기
-                        if translate("생산 실적 데이터") in st.session_state.sync_options_db:
-                            with st.spinner(translate("생산 실적 데이터 동기화 중... (대용량 데이터는 시간이 걸릴 수 있습니다)")):
-                                try:
-                                    # 직접 페이지네이션을 통해 모든 데이터 가져오기
-                                    page_size = 1000
-                                    offset = 0
-                                    all_records = []
-                                    
-                                    # 먼저 캐시 무효화
-                                    db._invalidate_cache()
-                                    
-                                    # 페이지네이션으로 모든 데이터 가져오기
-                                    while True:
-                                        print(f"[DEBUG] 생산 데이터 페이지 로드 중: offset={offset}, limit={page_size}")
-                                        response = db.client.table('Production').select('*').limit(page_size).offset(offset).execute()
-                                        records = response.data
-                                        
-                                        if not records:
-                                            break
-                                            
-                                        all_records.extend(records)
-                                        record_count = len(all_records)
-                                        print(f"[DEBUG] 현재까지 로드된 생산 데이터: {record_count}개")
-                                        
-                                        if len(records) < page_size:
-                                            break
-                                            
-                                        offset += page_size
-                                    
-                                    # 전체 데이터를 세션 상태에 저장
-                                    st.session_state.production_data = all_records
-                                    record_count = len(all_records)
-                                    
-                                    # production.py의 load_production_data 함수 대신 직접 구현
-                                    sync_results.append(translate(f"✅ 생산 실적 데이터 {record_count}개 로드 완료 (페이지네이션 사용)"))
-                                except Exception as e:
-                                    import traceback
-                                    print(f"[ERROR] 생산 데이터 페이지네이션 중 오류: {str(e)}")
-                                    print(traceback.format_exc())
-                                    
-                                    # 오류 발생 시 기존 방식으로 시도
-                                    from pages.production import load_production_data
-                                    st.session_state.production_data = load_production_data()
-                                    record_count = len(st.session_state.production_data)
-                                    
-                                    if record_count >= 10000:
-                                        sync_results.append(translate(f"✅ 생산 실적 데이터 {record_count}개 로드 완료 (최대 조회 제한: 10000개)"))
-                                    else:
-                                        sync_results.append(translate(f"✅ 생산 실적 데이터 {record_count}개 로드 완료"))
-                        
-                        # 사용자 데이터 가져오기
-                        if translate("사용자 데이터") in st.session_state.sync_options_db:
-                            st.session_state.users = db.get_all_users()
-                            sync_results.append(translate(f"✅ 사용자 데이터 {len(st.session_state.users)}개 로드 완료"))
-                        
-                        # 모델 데이터 가져오기
-                        if translate("모델 데이터") in st.session_state.sync_options_db:
-                            from pages.model_management import load_model_data
-                            st.session_state.models = load_model_data()
-                            sync_results.append(translate(f"✅ 모델 데이터 {len(st.session_state.models)}개 로드 완료"))
-                        
-                        st.success(translate("데이터 동기화가 완료되었습니다!"))
-                        for result in sync_results:
-                            st.write(result)
-                        
+                        db = get_db()
+                        plans = []
+                        for table, spec in SYNC_TABLES.items():
+                            if translate(spec['label']) in st.session_state.sync_options_db:
+                                app_rows = st.session_state.get(spec['session_key']) or []
+                                plans.append(build_sync_plan(table, load_backend_rows(db, table), app_rows))
+                        st.session_state.sync_plans_db = plans
                     except Exception as e:
-                        st.error(translate(f"데이터 동기화 중 오류가 발생했습니다: {str(e)}"))
+                        st.error(translate(f"데이터 비교 중 오류가 발생했습니다: {str(e)}"))
+            
+            plans = st.session_state.get('sync_plans_db')
+            if plans:
+                show_sync_plans(plans)
+                
+                if st.button(translate("Supabase -> 앱 동기화"), key="supabase_to_app_commit_btn"):
+                    sync_results = []
+                    for plan in plans:
+                        # 비교에 사용한 Supabase 데이터로 앱 데이터를 교체
+                        st.session_state[SYNC_TABLES[plan.table]['session_key']] = plan.source_rows
+                        counts = plan.counts()
+                        sync_results.append(translate(
+                            f"✅ {plan.label} {len(plan.source_rows)}개 로드 완료 (추가 {counts['추가']}건, 수정 {counts['수정']}건, 삭제 {counts['삭제']}건)"))
+                    
+                    del st.session_state['sync_plans_db']
+                    st.success(translate("데이터 동기화가 완료되었습니다!"))
+                    for result in sync_results:
+                        st.write(result)
         
         # 데이터 백업 및 복원
         st.write(translate("### 데이터 백업 및 복원"))
         col1, col2 = st.columns(2)
         
-        # 데이터 백업
+        # 데이터 백업 (현재 백엔드의 데이터를 페이지 단위로 읽어 gzip NDJSON 파일로 바로 기록)
         with col1:
             st.write(translate("데이터 백업"))
-            if st.button(translate("JSON 파일로 백업"), key="backup_to_json_btn"):
-                # 세션 상태의 데이터 수집
-                backup_data = {
-                    "workers": st.session_state.get("workers", []),
-                    "production_data": st.session_state.get("production_data", []),
-                    "models": st.session_state.get("models", []),
-                    "backup_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                }
-                
-                # JSON 문자열로 변환
-                json_data = json.dumps(backup_data, ensure_ascii=False, indent=2)
-                
-                # 다운로드 링크 생성
-                st.download_button(
-                    label=translate("백업 파일 다운로드"),
-                    data=json_data,
-                    file_name=f"data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-                    mime="application/json",
-                    key="download_backup_btn"
-                )
-                
-                st.success(translate("데이터가 성공적으로 백업되었습니다."))
+            if st.button(translate("백업 파일 생성"), key="backup_to_json_btn"):
+                with st.spinner(translate("백업 파일을 생성 중입니다...")):
+                    try:
+                        backup_path = os.path.join(project_root, 'backups', f"data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson.gz")
+                        counts = write_backup(get_db(), backup_path)
+                        st.session_state.backup_file = backup_path
+                        st.success(translate(f"데이터가 성공적으로 백업되었습니다. (작업자 {counts['workers']}개, 모델 {counts['models']}개, 생산 실적 {counts['production']}개)"))
+                    except Exception as e:
+                        st.error(translate(f"데이터 백업 중 오류가 발생했습니다: {str(e)}"))
+            
+            # 다운로드 링크 생성 (압축된 파일을 그대로 전달)
+            backup_path = st.session_state.get('backup_file')
+            if backup_path and os.path.exists(backup_path):
+                with open(backup_path, 'rb') as backup_file:
+                    st.download_button(
+                        label=translate("백업 파일 다운로드"),
+                        data=backup_file,
+                        file_name=os.path.basename(backup_path),
+                        mime="application/gzip",
+                        key="download_backup_btn"
+                    )
         
         # 데이터 복원
         with col2:
             st.write(translate("데이터 복원"))
-            uploaded_file = st.file_uploader(translate("백업 파일 선택"), type=["json"], key="backup_file_uploader")
+            uploaded_file = st.file_uploader(translate("백업 파일 선택"), type=["gz", "json"], key="backup_file_uploader")
             
             if uploaded_file is not None:
+                # 같은 파일을 같은 백엔드에 복원하다 중단된 적이 있으면 체크포인트부터 이어서 진행
+                restore_job = None
+                restart_restore = False
+                if not uploaded_file.name.endswith('.json'):
+                    restore_job = RestoreJob(get_db(), uploaded_file)
+                    checkpoint = restore_job.load_checkpoint()
+                    if checkpoint:
+                        st.info(translate(f"이전 복원이 생산 실적 {checkpoint['rows_done']}행까지 진행된 뒤 중단되었습니다 ({checkpoint['updated_at']}). 복원하면 이어서 진행합니다."))
+                        restart_restore = st.checkbox(translate("처음부터 다시 복원"), value=False, key="restore_restart")
+                
                 if st.button(translate("백업 파일에서 복원"), key="restore_from_backup_btn"):
-                    try:
-                        # JSON 파일 로드
-                        backup_data = json.loads(uploaded_file.getvalue().decode('utf-8'))
+                    if restore_job is None:
+                        # 이전 형식(JSON) 백업 파일은 앱 데이터로만 복원
+                        try:
+                            backup_data = json.loads(uploaded_file.getvalue().decode('utf-8'))
+                            
+                            if "workers" in backup_data:
+                                st.session_state.workers = backup_data["workers"]
+                            
+                            if "production_data" in backup_data:
+                                st.session_state.production_data = backup_data["production_data"]
+                            
+                            if "models" in backup_data:
+                                st.session_state.models = backup_data["models"]
+                            
+                            backup_time = backup_data.get("backup_time", translate("알 수 없음"))
+                            st.success(translate(f"데이터가 성공적으로 복원되었습니다. (백업 시간: {backup_time})"))
+                        except Exception as e:
+                            st.error(translate(f"데이터 복원 중 오류가 발생했습니다: {str(e)}"))
+                    else:
+                        # 압축 파일을 한 줄씩 읽어 현재 백엔드에 배치 단위로 반영
+                        progress_bar = st.progress(0.0)
+                        progress_text = st.empty()
                         
-                        # 데이터 복원
-                        if "workers" in backup_data:
-                            st.session_state.workers = backup_data["workers"]
+                        def report_progress(rows, fraction):
+                            progress_bar.progress(fraction)
+                            progress_text.write(translate(f"{rows}개 행 복원 중..."))
                         
-                        if "production_data" in backup_data:
-                            st.session_state.production_data = backup_data["production_data"]
+                        if restart_restore:
+                            restore_job.clear_checkpoint()
+                        result = restore_job.run(progress=report_progress)
+                        progress_text.empty()
                         
-                        if "models" in backup_data:
-                            st.session_state.models = backup_data["models"]
+                        # 앱 데이터는 다음 조회 시 백엔드에서 다시 로드
+                        for key in ('workers', 'models', 'production_data'):
+                            st.session_state.pop(key, None)
                         
-                        backup_time = backup_data.get("backup_time", translate("알 수 없음"))
-                        st.success(translate(f"데이터가 성공적으로 복원되었습니다. (백업 시간: {backup_time})"))
-                    except Exception as e:
-                        st.error(translate(f"데이터 복원 중 오류가 발생했습니다: {str(e)}"))
+                        manifest = result['manifest'] or {}
+                        message = translate(f"추가 {result['추가']}건, 수정 {result['수정']}건, 키 기준 반영 {result['반영']}건, 중복 키로 건너뜀 {result['중복']}건, 실패 {result['실패']}건 (백업 시간: {manifest.get('created_at', translate('알 수 없음'))})")
+                        if result['interrupted']:
+                            st.error(translate("복원이 중단되었습니다. 다시 복원하면 마지막으로 반영된 배치 다음부터 이어서 진행합니다.") + f" - {message}")
+                            reasons = result['batch_errors'] or result['errors']
+                            if reasons:
+                                st.write(reasons[0])
+                        elif result['errors']:
+                            st.error(translate(f"데이터 복원 중 오류가 발생했습니다: {result['errors'][0]}") + f" - {message}")
+                        elif not result['complete']:
+                            st.warning(translate("백업 파일의 행 수가 요약과 다릅니다. 파일이 손상되었을 수 있습니다.") + f" - {message}")
+                        elif result['중복']:
+                            st.warning(translate(f"백업 파일에 날짜+작업자+모델차수+라인번호가 같은 생산 실적이 있어 {result['중복']}건은 마지막 행만 반영했습니다.") + f" - {message}")
+                        else:
+                            progress_bar.progress(1.0)
+                            st.success(translate("데이터가 성공적으로 복원되었습니다.") + f" - {message}")
     
     # Supabase 설정 탭
     with tab2:
@@ -459,15 +445,114 @@ def show_data_sync():
       created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
       updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
     );
+
+    -- 생산 실적 집계 함수 (리포트 페이지에서 그룹별 합계만 전송받기 위해 사용)
+    -- group_by: '날짜', '연도', '월', '작업자', '라인번호', '모델차수' 중 집계 기준 목록
+    CREATE OR REPLACE FUNCTION production_summary(
+      start_date DATE,
+      end_date DATE,
+      group_by TEXT[] DEFAULT '{}',
+      worker TEXT DEFAULT NULL,
+      line TEXT DEFAULT NULL,
+      model TEXT DEFAULT NULL
+    )
+    RETURNS TABLE (
+      날짜 DATE,
+      연도 INTEGER,
+      월 INTEGER,
+      작업자 TEXT,
+      라인번호 TEXT,
+      모델차수 TEXT,
+      목표수량 BIGINT,
+      생산수량 BIGINT,
+      불량수량 BIGINT
+    )
+    LANGUAGE sql STABLE
+    AS $$
+      SELECT
+        CASE WHEN '날짜' = ANY(group_by) THEN p.날짜 END,
+        CASE WHEN '연도' = ANY(group_by) THEN EXTRACT(YEAR FROM p.날짜)::INTEGER END,
+        CASE WHEN '월' = ANY(group_by) THEN EXTRACT(MONTH FROM p.날짜)::INTEGER END,
+        CASE WHEN '작업자' = ANY(group_by) THEN p.작업자 END,
+        CASE WHEN '라인번호' = ANY(group_by) THEN p.라인번호 END,
+        CASE WHEN '모델차수' = ANY(group_by) THEN p.모델차수 END,
+        SUM(p.목표수량),
+        SUM(p.생산수량),
+        SUM(p.불량수량)
+      FROM Production p
+      WHERE p.날짜 BETWEEN start_date AND end_date
+        AND (worker IS NULL OR p.작업자 = worker)
+        AND (line IS NULL OR p.라인번호 = line)
+        AND (model IS NULL OR p.모델차수 = model)
+      GROUP BY 1, 2, 3, 4, 5, 6
+      ORDER BY 1, 2, 3, 4, 5, 6;
+    $$;
+
+    -- 기간 조회 및 집계용 인덱스
+    CREATE INDEX IF NOT EXISTS idx_production_date ON Production (날짜);
+
+    -- 행을 수정할 때 updated_at 갱신 (로컬 복제본이 수정된 행만 가져오는 데 사용)
+    CREATE OR REPLACE FUNCTION set_updated_at()
+    RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+      NEW.updated_at = NOW();
+      RETURN NEW;
+    END;
+    $$;
+
+    CREATE OR REPLACE TRIGGER set_users_updated_at BEFORE UPDATE ON Users FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+    CREATE OR REPLACE TRIGGER set_workers_updated_at BEFORE UPDATE ON Workers FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+    CREATE OR REPLACE TRIGGER set_production_updated_at BEFORE UPDATE ON Production FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+    CREATE OR REPLACE TRIGGER set_model_updated_at BEFORE UPDATE ON Model FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+    CREATE INDEX IF NOT EXISTS idx_production_updated_at ON Production (updated_at, id);
+
+    -- 테이블 데이터 버전 (행 수, 최대 id, 최대 updated_at) - 캐시가 최신인지 요청 한 번으로 확인하는 데 사용
+    CREATE OR REPLACE FUNCTION table_version(table_name TEXT)
+    RETURNS TABLE (row_count BIGINT, max_id BIGINT, max_updated_at TIMESTAMP WITH TIME ZONE)
+    LANGUAGE plpgsql STABLE
+    AS $$
+    BEGIN
+      IF table_name NOT IN ('Users', 'Workers', 'Production', 'Model', 'users', 'workers', 'production', 'model') THEN
+        RAISE EXCEPTION 'unknown table %', table_name;
+      END IF;
+      RETURN QUERY EXECUTE format('SELECT COUNT(*), MAX(id)::BIGINT, MAX(updated_at) FROM %I', table_name);
+    END;
+    $$;
+
+    -- 생산 실적 자연 키(날짜+작업자+모델차수+라인번호) 고유 인덱스 - 백업 복원을 키 기준 upsert로 처리하여 다시 실행해도 중복되지 않도록 함
+    -- 같은 키의 행이 이미 있으면 먼저 정리한 뒤 실행하세요 (인덱스가 없으면 복원은 기간별 비교 방식으로 동작)
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_production_natural_key ON Production (날짜, 작업자, 모델차수, 라인번호);
+
+    -- 생산 실적 자연 키 고유 인덱스가 있는지 확인 (앱이 데이터를 쓰지 않고 키 기준 upsert 가능 여부를 확인하는 데 사용)
+    CREATE OR REPLACE FUNCTION production_natural_key_supported()
+    RETURNS BOOLEAN
+    LANGUAGE sql STABLE
+    AS $$
+      SELECT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        WHERE lower(t.relname) = 'production'
+          AND i.indisunique
+          AND i.indpred IS NULL
+          AND i.indnatts = 4
+          AND ARRAY(SELECT a.attname::TEXT FROM pg_attribute a WHERE a.attrelid = t.oid AND a.attnum = ANY(i.indkey))
+              @> ARRAY['날짜', '작업자', '모델차수', '라인번호']
+      );
+    $$;
             """
             st.code(sql_script, language="sql")
         
         st.info("위 SQL 스크립트를 Supabase의 SQL 편집기에서 실행하여 필요한 테이블을 생성할 수 있습니다.")
 
-        # 캐시 초기화
-        if 'db' in st.session_state:
-            st.session_state.db._invalidate_cache()
-            st.session_state.production_data = None
+        # SQL 스크립트를 실행한 뒤에만 캐시 초기화 (집계 함수/자연 키 인덱스 등 다시 확인)
+        if st.button(translate("스크립트 실행 후 캐시 초기화"), key="setup_invalidate_cache_btn"):
+            if 'db' in st.session_state:
+                get_db()._invalidate_cache()
+                st.session_state.production_data = None
+            st.success(translate("캐시가 초기화되었습니다."))
         
     # 데이터 초기화 탭
     with tab3:
@@ -483,46 +568,42 @@ def show_data_sync():
         
         if st.button(translate("데이터 초기화"), key="reset_btn", disabled=(confirm_text != "RESET")):
             try:
-                db = st.session_state.db
+                db = get_db()
                 if reset_type == translate("생산 실적"):
                     # 생산 실적 데이터 초기화
-                    try:
-                        result = db.client.table('Production').delete().neq('id', 0).execute()
+                    if db.delete_all_production():
                         st.success(translate("생산 실적 데이터가 초기화되었습니다."))
                         # 세션 상태 초기화
                         st.session_state.production_data = None
-                    except Exception as e:
-                        st.error(translate(f"생산 실적 데이터 초기화 중 오류 발생: {str(e)}"))
+                    else:
+                        st.error(translate("생산 실적 데이터 초기화 중 오류가 발생했습니다."))
                         
                 elif reset_type == translate("모델 데이터"):
                     # 모델 데이터 초기화 
-                    try:
-                        result = db.client.table('Model').delete().neq('id', 0).execute()
+                    if db.delete_all_models():
                         st.success(translate("모델 데이터가 초기화되었습니다."))
                         # 세션 상태 초기화
                         st.session_state.models = None
-                    except Exception as e:
-                        st.error(translate(f"모델 데이터 초기화 중 오류 발생: {str(e)}"))
+                    else:
+                        st.error(translate("모델 데이터 초기화 중 오류가 발생했습니다."))
                         
                 elif reset_type == translate("작업자 데이터"):
                     # 작업자 데이터 초기화
-                    try:
-                        result = db.client.table('Workers').delete().neq('id', 0).execute()
+                    if db.delete_all_workers():
                         st.success(translate("작업자 데이터가 초기화되었습니다."))
                         # 세션 상태 초기화
                         st.session_state.workers = None
-                    except Exception as e:
-                        st.error(translate(f"작업자 데이터 초기화 중 오류 발생: {str(e)}"))
+                    else:
+                        st.error(translate("작업자 데이터 초기화 중 오류가 발생했습니다."))
                         
                 elif reset_type == translate("사용자 데이터"):
                     # 사용자 데이터 초기화 (관리자 데이터는 유지)
-                    try:
-                        result = db.client.table('Users').delete().not_eq('권한', '관리자').execute()
+                    if db.delete_all_users(keep_role='관리자'):
                         st.success(translate(f"일반 사용자 데이터가 초기화되었습니다. (관리자 계정은 유지됩니다)"))
                         # 세션 상태 초기화
                         st.session_state.users = None
-                    except Exception as e:
-                        st.error(translate(f"사용자 데이터 초기화 중 오류 발생: {str(e)}"))
+                    else:
+                        st.error(translate("사용자 데이터 초기화 중 오류가 발생했습니다."))
                 
                 # 캐시 초기화
                 db._invalidate_cache()
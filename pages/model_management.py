@@ -3,19 +3,13 @@ import pandas as pd
 import json
 import os
 from datetime import datetime
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from utils.translations import translate
 
 def load_model_data():
     try:
         # Supabase에서 모델 데이터 로드
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
-        
-        db = st.session_state.db
-        
-        # 캐시 무효화 먼저 수행
-        db._invalidate_cache('models')
+        db = get_db()
         
         models = db.get_all_models()
         print(f"[DEBUG] 로드된 모델 데이터: {len(models)}개")
@@ -29,7 +23,7 @@ def load_model_data():
 def save_model_data(model_data):
     try:
         # Supabase에 모델 데이터 저장
-        db = SupabaseDB()
+        db = get_db()
         success = db.add_model(
             model_name=model_data["모델명"],
             process=model_data["공정"]
@@ -102,7 +96,7 @@ def show_model_management():
                 
                 if st.button(translate("삭제")):
                     model_id = model_options[selected_model]
-                    db = SupabaseDB()
+                    db = get_db()
                     if db.delete_model(model_id):
                         st.success(translate("모델이 삭제되었습니다."))
                         # 데이터 다시 로드
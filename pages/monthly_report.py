@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from datetime import datetime, timedelta, date
 import calendar
 from dateutil.relativedelta import relativedelta
@@ -95,25 +95,17 @@ def show_monthly_report():
     # 해당 월의 마지막 날짜 계산
     last_day = date(year, month, calendar.monthrange(year, month)[1])
     
-    # 데이터 조회
-    records = st.session_state.db.get_production_records(
+    # 데이터 조회 (작업자별 합계는 DB에서 집계)
+    worker_stats = get_db().get_production_summary(
         start_date=first_day.strftime('%Y-%m-%d'),
-        end_date=last_day.strftime('%Y-%m-%d')
+        end_date=last_day.strftime('%Y-%m-%d'),
+        group_by=['작업자']
     )
     
-    if not records:
+    if worker_stats.empty:
         st.info(translate(f"{translate(first_day.strftime('%Y년 %m월'))} 기간의 생산 데이터가 없습니다."))
         return
         
-    df = pd.DataFrame(records)
-        
-    # 작업자별 통계 계산
-    worker_stats = df.groupby('작업자').agg({
-        '목표수량': 'sum',
-        '생산수량': 'sum',
-        '불량수량': 'sum'
-    }).reset_index()
-        
     # 작업효율 계산
     worker_stats['작업효율'] = round(
         ((worker_stats['생산수량'] - worker_stats['불량수량']) / worker_stats['목표수량']) * 100,
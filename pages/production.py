@@ -5,8 +5,9 @@ import json
 import os
 import sys
 import uuid
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from utils.local_storage import LocalStorage
+from utils.production_import import import_production_file
 import utils.common as common
 from utils.translations import translate
 
@@ -38,7 +39,7 @@ def paginate_dataframe(dataframe, page_size, page_num):
 def save_production_data(data):
     try:
         # Supabase에 데이터 저장
-        db = SupabaseDB()
+        db = get_db()
         success = db.add_production_record(
             date=data["날짜"] if "날짜" in data else data.get("생산일자", ""),
             worker=data["작업자"],
@@ -65,21 +66,13 @@ def save_production_data(data):
 def load_production_data():
     try:
         # Supabase에서 데이터 로드
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
+        db = get_db()
         
-        db = st.session_state.db
-        
-        # 캐시 무효화 먼저 수행
-        db._invalidate_cache()
-        
-        # 전체 기간의 데이터를 로드하도록 수정
-        # 시작일을 충분히 과거로, 종료일을 충분히 미래로 설정
-        start_date = "2020-01-01"
-        end_date = "2030-12-31"
-        
-        print(f"[DEBUG] 생산 데이터 로드 시도: {start_date} ~ {end_date}")
-        records = db.get_production_records(start_date=start_date, end_date=end_date)
+        # 전체 기간(2020-01-01 ~ 2030-12-31)의 데이터를 로드
+        # 모든 세션이 같은 읽기 전용 스냅샷을 참조하므로 레코드를 직접 수정하지 않아야 함
+        # 로컬 복제본이 동기화되어 있으면 Supabase 전체 조회 없이 복제본에서 만들어짐
+        print(f"[DEBUG] 생산 데이터 로드 시도: 공유 데이터셋")
+        records = db.get_production_dataset()
         record_count = len(records)
         print(f"[DEBUG] 로드된 생산 데이터: {record_count}개")
         
@@ -110,10 +103,11 @@ def show_production_management():
     st.session_state.production_data = load_production_data()
     
     # 탭 생성
-    tab1, tab2, tab3 = st.tabs([
+    tab1, tab2, tab3, tab4 = st.tabs([
         translate("실적 등록"), 
         translate("실적 수정"), 
-        translate("실적 조회")
+        translate("실적 조회"),
+        translate("일괄 등록")
     ])
     
     with tab1:
@@ -124,6 +118,9 @@ def show_production_management():
         
     with tab3:
         view_production_data()
+    
+    with tab4:
+        import_production_data()
 
 def edit_production_data():
     st.subheader(translate("실적 수정"))
@@ -306,11 +303,10 @@ def edit_production_data():
                             }
                             
                             # 데이터베이스 업데이트
-                            if 'db' not in st.session_state:
-                                st.session_state.db = SupabaseDB()
+                            db = get_db()
                             
                             print(f"[DEBUG] 데이터 수정 시도: 레코드 ID {record_id}, 데이터: {updated_data}")
-                            success = st.session_state.db.update_production_record(record_id, updated_data)
+                            success = db.update_production_record(record_id, updated_data)
                             
                             if success:
                                 st.success(translate("✅ 데이터가 성공적으로 수정되었습니다."))
@@ -351,10 +347,9 @@ def edit_production_data():
                             if not record_id:
                                 st.error(translate("레코드 ID를 찾을 수 없습니다."))
                             else:
-                                if 'db' not in st.session_state:
-                                    st.session_state.db = SupabaseDB()
+                                db = get_db()
                                 
-                                success = st.session_state.db.delete_production_record(record_id)
+                                success = db.delete_production_record(record_id)
                                 
                                 if success:
                                     st.success(translate("✅ 데이터가 성공적으로 삭제되었습니다."))
@@ -449,6 +444,51 @@ def add_production_data():
                 except Exception as e:
                     st.error(f"{translate('생산 실적 저장 중 오류가 발생했습니다')}: {str(e)}")
 
+def import_production_data():
+    st.subheader(translate("생산 실적 일괄 등록"))
+    st.info(translate("CSV 또는 엑셀(xlsx) 파일의 생산 실적을 한 번에 등록합니다. 첫 행은 헤더이며 "
+                      "날짜, 작업자, 라인번호, 모델차수, 목표수량, 생산수량, 불량수량, 특이사항 컬럼을 사용합니다."))
+    
+    uploaded_file = st.file_uploader(translate("생산 실적 파일 선택"), type=["csv", "xlsx"], key="production_import_uploader")
+    if uploaded_file is None:
+        return
+    
+    if st.button(translate("파일 가져오기"), key="production_import_btn", use_container_width=True):
+        # 등록된 작업자/모델만 허용
+        workers = st.session_state.workers if 'workers' in st.session_state else []
+        models = st.session_state.models if 'models' in st.session_state else []
+        known_workers = {worker.get('이름', '') for worker in workers if worker.get('이름')}
+        known_models = {model.get('모델명', '') for model in models if model.get('모델명')}
+        
+        progress_text = st.empty()
+        with st.spinner(translate("파일을 가져오는 중입니다...")):
+            result = import_production_file(
+                get_db(), uploaded_file, uploaded_file.name, known_workers, known_models,
+                progress=lambda rows: progress_text.write(translate(f"{rows}행 처리 중..."))
+            )
+        progress_text.empty()
+        
+        if result['missing_columns']:
+            st.error(translate(f"필수 컬럼이 없습니다: {', '.join(result['missing_columns'])}"))
+            return
+        
+        error_count = len(result['errors'])
+        if result['inserted']:
+            st.success(translate(f"생산 실적 {result['inserted']}건이 등록되었습니다. (전체 {result['total']}행)"))
+        if error_count:
+            # 오류 행은 등록하지 않으므로 보고서를 보고 수정한 뒤 다시 가져오면 됨 (이미 등록된 행은 중복으로 건너뜀)
+            st.warning(translate(f"{error_count}행은 오류로 등록되지 않았습니다."))
+            st.dataframe(result['errors'], use_container_width=True, hide_index=True)
+            st.download_button(
+                label=translate("오류 보고서 다운로드"),
+                data=result['errors'].to_csv(index=False).encode('utf-8-sig'),
+                file_name=f"import_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                key="production_import_errors_btn"
+            )
+        elif not result['inserted']:
+            st.warning(translate("등록할 생산 실적이 없습니다."))
+
 def view_production_data():
     st.subheader(translate("실적 조회"))
     
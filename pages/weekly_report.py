@@ -3,7 +3,7 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
 import plotly.graph_objects as go
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from utils.translations import translate
 
 def show_weekly_report():
@@ -59,28 +59,28 @@ def show_weekly_report():
     start_date = weeks[selected_week_idx][1]
     end_date = weeks[selected_week_idx][2]
     
-    # 데이터 조회
+    # 데이터 조회 (작업자별 합계는 DB에서 집계)
+    worker_stats = None
     try:
-        # 세션 상태에 db가 없으면 새로 생성
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
+        # 현재 세션의 백엔드 (없으면 get_db가 생성)
+        db = get_db()
         
-        records = st.session_state.db.get_production_records(
+        worker_stats = db.get_production_summary(
             start_date=start_date.strftime('%Y-%m-%d'),
-            end_date=end_date.strftime('%Y-%m-%d')
+            end_date=end_date.strftime('%Y-%m-%d'),
+            group_by=['작업자']
         )
     except Exception as e:
         st.error(f"{translate('데이터 조회 중 오류 발생')}: {e}")
         import traceback
         st.code(traceback.format_exc())
 
-    if not records:
+    if worker_stats is None or worker_stats.empty:
         st.info(translate(f"{translate(start_date.strftime('%Y년 %m월 %d일'))} ~ {translate(end_date.strftime('%Y년 %m월 %d일'))} 기간의 생산 데이터가 없습니다."))
         return
 
-    if records:
-        df = pd.DataFrame(records)
-        worker_stats = calculate_worker_stats(df)  # 작업자별 통계 계산
+    if not worker_stats.empty:
+        worker_stats = calculate_worker_stats(worker_stats)  # 작업자별 통계 계산
 
         # KPI 및 최고 성과자 계산
         best_performers = calculate_best_performers(worker_stats)
@@ -217,13 +217,9 @@ def show_weekly_report():
             hide_index=True
         )
         
-def calculate_worker_stats(df):
-    # 작업자별 통계 계산
-    worker_stats = df.groupby('작업자').agg({
-        '목표수량': 'sum',
-        '생산수량': 'sum',
-        '불량수량': 'sum'
-    }).reset_index()
+def calculate_worker_stats(worker_stats):
+    # 작업자별 통계 계산 (작업자별 합계는 get_production_summary에서 집계됨)
+    worker_stats = worker_stats.copy()
     
     # 작업효율 계산
     worker_stats['작업효율'] = round(
@@ -3,7 +3,7 @@ import pandas as pd
 from datetime import datetime
 import json
 import os
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from utils.translations import translate
 
 def load_worker_data():
@@ -11,13 +11,10 @@ def load_worker_data():
         print("[DEBUG] 작업자 데이터 로드 시작")
         
         # 데이터베이스 객체 가져오기
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
-            print("[DEBUG] 새 SupabaseDB 인스턴스 생성")
+        db = get_db()
         
-        # 전체 캐시 무효화 후 데이터 로드
-        st.session_state.db._invalidate_cache()
-        workers = st.session_state.db.get_workers()
+        # 작업자 데이터 로드 (등록/수정/삭제 내용은 캐시에 바로 반영됨)
+        workers = db.get_workers()
         print(f"[INFO] 작업자 데이터 {len(workers)}개 로드 완료")
         
         # 작업자 데이터 출력 (디버깅용)
@@ -35,10 +32,9 @@ def load_worker_data():
 def save_worker_data(worker):
     try:
         # Supabase에 작업자 데이터 저장
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
+        db = get_db()
         
-        success = st.session_state.db.add_worker(
+        success = db.add_worker(
             employee_id=worker["사번"],
             name=worker["이름"],
             department=worker["부서"],
@@ -60,35 +56,21 @@ def update_worker_data(old_name, new_name, new_id, new_line):
         print(f"[DEBUG] 작업자 정보 업데이트 시도: {old_name} → {new_name}, 사번: {new_id}, 라인: {new_line}")
         
         # 데이터베이스 객체 가져오기
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
-            print("[DEBUG] 새 SupabaseDB 인스턴스 생성")
+        db = get_db()
         
         # DB 연결 확인
-        if not st.session_state.db.client:
-            print("[ERROR] Supabase 클라이언트 연결이 설정되지 않았습니다")
+        if not db.is_connected():
+            print("[ERROR] 데이터베이스 연결이 설정되지 않았습니다")
             st.error(translate("데이터베이스 연결 오류. 관리자에게 문의하세요."))
             return False
         
-        # 캐시 파일 존재 여부 확인 및 삭제
-        try:
-            import os
-            if os.path.exists('cache/supabase_cache.json'):
-                os.remove('cache/supabase_cache.json')
-                print("[INFO] 캐시 파일 삭제 성공")
-        except Exception as e:
-            print(f"[ERROR] 캐시 파일 삭제 실패: {e}")
-            
         # 작업자 정보 업데이트 시도
-        success = st.session_state.db.update_worker(old_name, new_name, new_id, new_line)
+        success = db.update_worker(old_name, new_name, new_id, new_line)
         
         if success:
             print(f"[INFO] 작업자 '{old_name}'의 정보가 성공적으로 업데이트되었습니다")
             st.success(f"{translate('작업자')} '{old_name}'{translate('의 정보가 업데이트되었습니다.')}")
             
-            # 전체 캐시 무효화
-            st.session_state.db._invalidate_cache()
-            
             # 작업자 데이터 즉시 새로고침
             workers = load_worker_data()
             if workers:
@@ -115,35 +97,21 @@ def delete_worker_data(worker_name):
         print(f"[DEBUG] 작업자 삭제 시도: {worker_name}")
         
         # 데이터베이스 객체 가져오기
-        if 'db' not in st.session_state:
-            st.session_state.db = SupabaseDB()
-            print("[DEBUG] 새 SupabaseDB 인스턴스 생성")
+        db = get_db()
         
         # DB 연결 확인
-        if not st.session_state.db.client:
-            print("[ERROR] Supabase 클라이언트 연결이 설정되지 않았습니다")
+        if not db.is_connected():
+            print("[ERROR] 데이터베이스 연결이 설정되지 않았습니다")
             st.error(translate("데이터베이스 연결 오류. 관리자에게 문의하세요."))
             return False
         
-        # 캐시 파일 존재 여부 확인 및 삭제
-        try:
-            import os
-            if os.path.exists('cache/supabase_cache.json'):
-                os.remove('cache/supabase_cache.json')
-                print("[INFO] 캐시 파일 삭제 성공")
-        except Exception as e:
-            print(f"[ERROR] 캐시 파일 삭제 실패: {e}")
-        
         # 작업자 삭제 시도
-        success = st.session_state.db.delete_worker(worker_name)
+        success = db.delete_worker(worker_name)
         
         if success:
             print(f"[INFO] 작업자 '{worker_name}'이(가) 성공적으로 삭제되었습니다")
             st.success(f"{translate('작업자')} '{worker_name}'{translate('이(가) 삭제되었습니다.')}")
             
-            # 전체 캐시 무효화
-            st.session_state.db._invalidate_cache()
-            
             # 작업자 데이터 즉시 새로고침
             workers = load_worker_data()
             if workers is not None:
@@ -173,25 +141,14 @@ def show_worker_management():
         st.session_state.delete_mode = False
         st.session_state.delete_worker_name = ""
     
-    # Supabase 연결 초기화
-    if 'db' not in st.session_state:
-        print("[INFO] SupabaseDB 인스턴스 생성")
-        st.session_state.db = SupabaseDB()
+    # 데이터베이스 객체 가져오기
+    db = get_db()
     
     # 작업자 데이터 로드 버튼
     if st.button(translate("🔄 데이터 새로고침"), key="refresh_all", use_container_width=True):
         print("[INFO] 전체 데이터 새로고침 요청")
-        # 캐시 파일 삭제
-        try:
-            import os
-            if os.path.exists('cache/supabase_cache.json'):
-                os.remove('cache/supabase_cache.json')
-                print("[INFO] 캐시 파일 삭제 성공")
-        except Exception as e:
-            print(f"[ERROR] 캐시 파일 삭제 실패: {e}")
-        
-        # 캐시 무효화
-        st.session_state.db._invalidate_cache()
+        # 작업자 캐시 무효화
+        db._invalidate_tag('workers')
         
         # 데이터 새로고침
         st.session_state.workers = load_worker_data()
@@ -275,17 +232,8 @@ def show_worker_management():
         # 작업자 목록 다시 로드하는 버튼 추가
         if st.button(translate("작업자 목록 새로고침"), key="reload_worker_list"):
             with st.spinner(translate("작업자 데이터 로드 중...")):
-                # 캐시 무효화 먼저 수행
-                st.session_state.db._invalidate_cache()
-                
-                # 캐시 파일 삭제
-                try:
-                    import os
-                    if os.path.exists('cache/supabase_cache.json'):
-                        os.remove('cache/supabase_cache.json')
-                        print("[INFO] 캐시 파일 삭제 성공")
-                except Exception as e:
-                    print(f"[ERROR] 캐시 파일 삭제 실패: {e}")
+                # 작업자 캐시 무효화 먼저 수행
+                db._invalidate_tag('workers')
                 
                 # 데이터 다시 로드
                 st.session_state.workers = load_worker_data()
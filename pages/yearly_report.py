@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 from datetime import datetime, timedelta
 from utils.translations import translate
 
@@ -46,18 +46,15 @@ def show_yearly_report():
     # 데이터 조회
     start_date = f"{year}-01-01"
     end_date = f"{year}-12-31"
-    records = st.session_state.db.get_production_records(
-        start_date=start_date,
-        end_date=end_date
-    )
+    # 월별/라인별 합계는 DB에서 집계하여 그룹 수만큼의 행만 조회
+    monthly_stats = get_db().get_production_summary(start_date, end_date, group_by=['월'])
     
-    if records:
-        df = pd.DataFrame(records)
+    if not monthly_stats.empty:
         
         # 연간 종합 현황 계산
-        total_target = df['목표수량'].sum()
-        total_production = df['생산수량'].sum()
-        total_defects = df['불량수량'].sum()
+        total_target = monthly_stats['목표수량'].sum()
+        total_production = monthly_stats['생산수량'].sum()
+        total_defects = monthly_stats['불량수량'].sum()
         
         # 연간 KPI 계산
         production_rate = round((total_production / total_target) * 100, 1)
@@ -102,13 +99,6 @@ def show_yearly_report():
         
         # 월별 현황
         st.subheader(translate("월별 현황"))
-        monthly_stats = df.groupby(pd.to_datetime(df['날짜']).dt.month).agg({
-            '목표수량': 'sum',
-            '생산수량': 'sum',
-            '불량수량': 'sum'
-        }).reset_index()
-        monthly_stats = monthly_stats.rename(columns={'날짜': '월'})
-        
         # 월별 현황 테이블 표시 - 열 이름 번역하기
         monthly_display = monthly_stats.copy()
         monthly_display.columns = [translate(col) for col in monthly_display.columns]
@@ -121,11 +111,7 @@ def show_yearly_report():
         
         # 라인별 연간 현황
         st.subheader(translate("라인별 연간 현황"))
-        line_stats = df.groupby('라인번호').agg({
-            '목표수량': 'sum',
-            '생산수량': 'sum',
-            '불량수량': 'sum'
-        }).reset_index()
+        line_stats = get_db().get_production_summary(start_date, end_date, group_by=['라인번호'])
         
         # 라인별 KPI 계산
         line_stats['생산목표달성률'] = round((line_stats['생산수량'] / line_stats['목표수량']) * 100, 1)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# 프로젝트 루트 디렉토리를 path에 추가 (pages/*.py와 같은 방식)
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
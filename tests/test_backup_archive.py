@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from utils.backup_archive import RestoreJob, iter_backup, write_backup
+from utils.sqlite_backend import SQLiteBackend
+
+BATCH_SIZE = 10
+
+
+def production_rows(count):
+    return [{'날짜': f'2024-01-{index % 28 + 1:02d}', '작업자': f'작업자{index}', '라인번호': 'L1', '모델차수': 'A모델',
+             '목표수량': 100, '생산수량': index, '불량수량': 0, '특이사항': ''}
+            for index in range(count)]
+
+
+@pytest.fixture
+def backup_path(tmp_path):
+    source = SQLiteBackend(str(tmp_path / 'source.db'))
+    source.add_worker('W001', '김작업', 'CNC', 'L1')
+    source.add_model('A모델', '조립')
+    source.add_production_records(production_rows(35))
+    path = str(tmp_path / 'backup.ndjson.gz')
+    write_backup(source, path)
+    return path
+
+
+def test_backup_contains_manifest_rows_and_summary(backup_path):
+    with open(backup_path, 'rb') as f:
+        items = list(iter_backup(f))
+
+    assert items[0][0] == 'manifest'
+    assert items[-1] == ('summary', {'workers': 1, 'models': 1, 'production': 35})
+    assert sum(1 for kind, item in items if kind == 'row' and item['table'] == 'production') == 35
+
+
+def test_restore_resumes_from_checkpoint(tmp_path, backup_path):
+    target = SQLiteBackend(str(tmp_path / 'target.db'))
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+    original_upsert = target.upsert_production_records
+    calls = []
+
+    def failing_second_batch(rows, **kwargs):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            return [{'chunk': 0, 'rows': len(rows), 'success': False, 'error': '연결 끊김'}]
+        return original_upsert(rows, **kwargs)
+
+    target.upsert_production_records = failing_second_batch
+    with open(backup_path, 'rb') as f:
+        job = RestoreJob(target, f, batch_size=BATCH_SIZE, checkpoint_dir=checkpoint_dir)
+        result = job.run()
+
+        # 첫 배치만 체크포인트에 기록되고, 실패한 배치의 오류는 결과에 섞이지 않음
+        assert result['interrupted'] and not result['complete']
+        assert result['반영'] == BATCH_SIZE
+        assert result['실패'] == 0 and result['errors'] == []
+        assert result['batch_errors'] == ['연결 끊김']
+        assert job.load_checkpoint()['rows_done'] == BATCH_SIZE
+
+        target.upsert_production_records = original_upsert
+        result = RestoreJob(target, f, batch_size=BATCH_SIZE, checkpoint_dir=checkpoint_dir).run()
+
+    assert result['resumed_from'] == BATCH_SIZE
+    assert result['complete'] and not result['interrupted']
+    assert result['반영'] == 35
+    assert not os.listdir(checkpoint_dir)
+    assert len(target.get_production_records('2024-01-01', '2024-12-31')) == 35
+    assert [worker['이름'] for worker in target.get_workers(use_cache=False)] == ['김작업']
+
+
+def test_restore_twice_does_not_duplicate(tmp_path, backup_path):
+    target = SQLiteBackend(str(tmp_path / 'target.db'))
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+
+    for _ in range(2):
+        with open(backup_path, 'rb') as f:
+            assert RestoreJob(target, f, batch_size=BATCH_SIZE, checkpoint_dir=checkpoint_dir).run()['complete']
+
+    assert len(target.get_production_records('2024-01-01', '2024-12-31')) == 35
+
+
+def test_rows_collapsed_by_natural_key_are_reported(tmp_path):
+    # 고유 인덱스가 없는 원본에는 자연 키가 같은 행이 있을 수 있음
+    source = SQLiteBackend(str(tmp_path / 'source.db'), natural_key_unique=False)
+    rows = production_rows(5)
+    source.add_production_records(rows + [dict(rows[0], 생산수량=999)])
+    path = str(tmp_path / 'backup.ndjson.gz')
+    write_backup(source, path)
+
+    target = SQLiteBackend(str(tmp_path / 'target.db'))
+    with open(path, 'rb') as f:
+        result = RestoreJob(target, f, batch_size=BATCH_SIZE, checkpoint_dir=str(tmp_path / 'checkpoints')).run()
+
+    assert result['complete']
+    assert result['반영'] == 5
+    assert result['중복'] == 1
+    assert len(target.get_production_records('2024-01-01', '2024-12-31')) == 5
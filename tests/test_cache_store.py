@@ -0,0 +1,71 @@
+import pytest
+
+from utils.cache_store import CacheStore
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheStore(str(tmp_path / 'cache.db'))
+
+
+def test_set_and_get(cache):
+    cache.set('workers', [{'이름': '김작업'}], 60, tag='workers')
+
+    assert cache.get('workers') == [{'이름': '김작업'}]
+    assert cache.get('missing') is None
+
+
+def test_expired_entry_is_returned_only_within_max_stale(cache):
+    cache.set('key', [1], -5)
+
+    assert cache.get('key') is None
+    assert cache.get_entry('key', max_stale=60) == ([1], True)
+    assert cache.get_entry('key', max_stale=1) is None
+
+
+def test_delete_tag_removes_only_matching_tag(cache):
+    cache.set('production_all', [], 60, tag='production')
+    cache.set('workers', [], 60, tag='workers')
+
+    assert cache.delete_tag('production') == 1
+    assert cache.get('production_all') is None
+    assert cache.get('workers') == []
+
+
+def test_delete_tag_with_date_removes_only_ranges_containing_date(cache):
+    cache.set('production_2024-01-01', [], 60, tag='production', range_start='2024-01-01', range_end='2024-01-01')
+    cache.set('production_2024-01-02', [], 60, tag='production', range_start='2024-01-02', range_end='2024-01-02')
+    cache.set('production_month', [], 60, tag='production', range_start='2024-01-01', range_end='2024-01-31')
+    cache.set('production_unbounded', [], 60, tag='production')
+    cache.set('summary_2024-01-02', [], 60, tag='production_summary', range_start='2024-01-02', range_end='2024-01-02')
+
+    assert cache.delete_tag('production', '2024-01-02') == 3
+
+    assert cache.get('production_2024-01-01') == []
+    assert cache.get('production_2024-01-02') is None
+    assert cache.get('production_month') is None
+    assert cache.get('production_unbounded') is None
+    assert cache.get('summary_2024-01-02') == []
+
+
+def test_find_range_entries_and_update_tag(cache):
+    meta = {'filters': {}, 'columns': None}
+    cache.set('production_2024-01-01', [{'id': 1}], 60, tag='production', range_start='2024-01-01', range_end='2024-01-01', meta=meta)
+    cache.set('production_2024-01-05', [{'id': 2}], 60, tag='production', range_start='2024-01-05', range_end='2024-01-05', meta=meta)
+
+    entries = cache.find_range_entries('production', '2024-01-01', '2024-01-03')
+    assert [entry['key'] for entry in entries] == ['production_2024-01-01']
+    assert entries[0]['meta'] == meta
+
+    cache.update_tag('production', {'2024-01-05'}, lambda data, meta, start, end: data + [{'id': 3}])
+    assert cache.get('production_2024-01-01') == [{'id': 1}]
+    assert cache.get('production_2024-01-05') == [{'id': 2}, {'id': 3}]
+
+
+def test_delete_prefix(cache):
+    cache.set('production_a', [], 60)
+    cache.set('production_b', [], 60)
+    cache.set('users', [], 60)
+
+    assert cache.delete_prefix('production_') == 2
+    assert cache.get('users') == []
@@ -0,0 +1,119 @@
+import io
+
+import pandas as pd
+
+from utils import production_import
+from utils.production_import import import_production_file, normalize_import_columns, validate_import_chunk
+from utils.sqlite_backend import SQLiteBackend
+
+WORKERS = {'김작업', '이생산'}
+MODELS = {'A모델'}
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=['날짜', '작업자', '라인번호', '모델차수', '목표수량', '생산수량', '불량수량', '특이사항'])
+
+
+def valid_row(**values):
+    row = {'날짜': '2024-01-01', '작업자': '김작업', '라인번호': 'L1', '모델차수': 'A모델',
+           '목표수량': '100', '생산수량': '90', '불량수량': '1', '특이사항': ''}
+    row.update(values)
+    return row
+
+
+def test_valid_rows_are_cleaned():
+    cleaned, errors = validate_import_chunk(frame([valid_row(날짜='2024/1/5', 생산수량='1,200', 불량수량='')]), WORKERS, MODELS)
+
+    assert errors.tolist() == ['']
+    assert cleaned.loc[0, '날짜'] == '2024-01-05'
+    assert cleaned.loc[0, '생산수량'] == 1200
+    assert cleaned.loc[0, '불량수량'] == 0
+
+
+def test_invalid_rows_are_flagged_per_column():
+    rows = [
+        valid_row(날짜='2024-02-30'),
+        valid_row(작업자='없는사람'),
+        valid_row(모델차수=''),
+        valid_row(생산수량='-1'),
+        valid_row(생산수량='1.5'),
+        valid_row(생산수량='5', 불량수량='6'),
+        valid_row(생산수량=''),
+    ]
+
+    _, errors = validate_import_chunk(frame(rows), WORKERS, MODELS)
+
+    assert '날짜 형식 오류' in errors[0]
+    assert '등록되지 않은 작업자' in errors[1]
+    assert '모델 없음' in errors[2]
+    assert '생산수량 오류' in errors[3]
+    assert '생산수량 오류' in errors[4]
+    assert errors[5] == '불량수량이 생산수량보다 큼'
+    assert '생산수량 없음' in errors[6]
+
+
+def test_duplicate_keys_within_file_and_across_chunks():
+    seen_keys = set()
+    first = frame([valid_row(), valid_row(생산수량='80'), valid_row(작업자='이생산')])
+    _, errors = validate_import_chunk(first, WORKERS, MODELS, seen_keys)
+
+    assert errors[0] == '' and errors[2] == ''
+    assert '파일 내 중복' in errors[1]
+
+    second = frame([valid_row(), valid_row(라인번호='L2')])
+    _, errors = validate_import_chunk(second, WORKERS, MODELS, seen_keys)
+
+    assert '파일 내 중복' in errors[0]
+    assert errors[1] == ''
+
+
+def test_invalid_row_does_not_hide_later_valid_duplicate():
+    # 오류가 있는 행은 키 비교에서 제외되므로 같은 키의 올바른 행은 추가 대상
+    _, errors = validate_import_chunk(frame([valid_row(생산수량='x'), valid_row()]), WORKERS, MODELS)
+
+    assert errors[0] != ''
+    assert errors[1] == ''
+
+
+def test_header_aliases_are_normalized():
+    normalized = normalize_import_columns(pd.DataFrame(columns=[' 생산일자 ', '모델명', '비고']))
+
+    assert list(normalized.columns) == ['날짜', '모델차수', '특이사항']
+
+
+def test_reimport_reports_existing_rows_as_duplicates(tmp_path):
+    db = SQLiteBackend(str(tmp_path / 'production.db'))
+    content = frame([valid_row(), valid_row(작업자='이생산')]).to_csv(index=False).encode('utf-8')
+
+    first = import_production_file(db, io.BytesIO(content), 'import.csv', WORKERS, MODELS)
+    second = import_production_file(db, io.BytesIO(content), 'import.csv', WORKERS, MODELS)
+
+    assert first['inserted'] == 2 and first['errors'].empty
+    assert second['inserted'] == 0
+    assert second['errors']['행'].tolist() == [2, 3]
+    assert second['errors']['오류'].str.startswith('이미 등록된 실적').all()
+    assert len(db.get_production_records('2024-01-01', '2024-01-01')) == 2
+
+
+def test_failed_existing_lookup_skips_chunk(tmp_path, monkeypatch):
+    db = SQLiteBackend(str(tmp_path / 'production.db'))
+    content = frame([valid_row(), valid_row(작업자='이생산')]).to_csv(index=False).encode('utf-8')
+    import_production_file(db, io.BytesIO(content), 'import.csv', WORKERS, MODELS)
+    monkeypatch.setattr(db, 'get_production_records', lambda *args, **kwargs: None)
+
+    result = import_production_file(db, io.BytesIO(content), 'import.csv', WORKERS, MODELS)
+
+    assert result['inserted'] == 0
+    assert result['errors']['행'].tolist() == [2, 3]
+    assert result['errors']['오류'].str.startswith('기존 실적 조회 실패').all()
+    monkeypatch.undo()
+    assert len(db.get_production_records('2024-01-01', '2024-01-01')) == 2
+
+
+def test_encoding_is_detected_from_bounded_blocks(monkeypatch):
+    monkeypatch.setattr(production_import, 'ENCODING_SNIFF_SIZE', 4)
+    korean = 'ASCII 다음 한글'
+
+    assert production_import._detect_encoding(io.BytesIO(korean.encode('utf-8'))) == 'utf-8-sig'
+    assert production_import._detect_encoding(io.BytesIO(korean.encode('cp949'))) == 'cp949'
+    assert production_import._detect_encoding(io.BytesIO(('a' * 20 + '한').encode('cp949'))) == 'cp949'
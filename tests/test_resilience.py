@@ -0,0 +1,123 @@
+import pytest
+
+from utils import resilience
+from utils.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_retry, is_transient_error
+
+
+class CodedError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(resilience.time, 'sleep', lambda seconds: None)
+
+
+def test_transient_error_classification():
+    assert is_transient_error(ConnectionError())
+    assert is_transient_error(TimeoutError())
+    assert is_transient_error(CodedError('503'))
+    assert is_transient_error(CodedError('PGRST000'))
+    assert is_transient_error(CodedError('40001'))
+    assert not is_transient_error(CodedError('23505'))
+    assert not is_transient_error(CodedError('42P10'))
+    assert not is_transient_error(ValueError('bug'))
+
+
+def test_retry_policy_delay_is_bounded():
+    policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=2.0)
+    for attempt in range(6):
+        assert 0 <= policy.delay(attempt) <= min(2.0, 0.5 * 2 ** attempt)
+
+
+def test_transient_errors_are_retried_until_success():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError('down')
+        return 'ok'
+
+    assert call_with_retry(flaky, RetryPolicy(attempts=3, budget=60)) == 'ok'
+    assert len(calls) == 3
+
+
+def test_non_transient_errors_are_not_retried():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise CodedError('23505')
+
+    with pytest.raises(CodedError):
+        call_with_retry(broken, RetryPolicy(attempts=3, budget=60))
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_state_transitions(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, 'time', lambda: now[0])
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30)
+
+    # 연속 실패가 기준에 도달하면 열림
+    breaker.record_failure()
+    assert not breaker.is_open and breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+    # reset_timeout이 지나면 시험 요청 하나만 허용, 실패하면 다시 열림
+    now[0] += 31
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow()
+
+    # 시험 요청이 성공하면 닫힘
+    now[0] += 31
+    assert breaker.allow()
+    breaker.record_success()
+    assert not breaker.is_open and breaker.allow() and breaker.failures == 0
+
+
+def test_open_circuit_rejects_calls_without_sending():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    calls = []
+
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(lambda: calls.append(1), RetryPolicy(attempts=3), breaker)
+    assert calls == []
+
+
+def test_server_errors_with_code_do_not_open_circuit():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+
+    def rejected():
+        raise CodedError('23505')
+
+    with pytest.raises(CodedError):
+        call_with_retry(rejected, RetryPolicy(attempts=1), breaker)
+    assert not breaker.is_open
+
+
+def test_trial_ending_in_unexpected_error_does_not_block_circuit(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, 'time', lambda: now[0])
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 31
+
+    def bad_response():
+        raise ValueError('응답 처리 오류')
+
+    with pytest.raises(ValueError):
+        call_with_retry(bad_response, RetryPolicy(attempts=3), breaker)
+
+    # 시험 요청은 실패로 끝나 다시 열리고, reset_timeout이 지나면 다음 시험 요청을 허용
+    assert breaker.is_open and not breaker.allow()
+    now[0] += 31
+    assert call_with_retry(lambda: 'ok', RetryPolicy(attempts=1), breaker) == 'ok'
+    assert not breaker.is_open
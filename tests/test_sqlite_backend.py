@@ -0,0 +1,42 @@
+import pytest
+
+from utils.sqlite_backend import SQLiteBackend
+
+
+def production_row(**values):
+    row = {'날짜': '2024-01-01', '작업자': '김작업', '라인번호': 'L1', '모델차수': 'A모델',
+           '목표수량': 100, '생산수량': 90, '불량수량': 0, '특이사항': ''}
+    row.update(values)
+    return row
+
+
+def test_primary_store_rejects_duplicate_natural_key(tmp_path):
+    db = SQLiteBackend(str(tmp_path / 'production.db'))
+
+    assert db.supports_natural_key_upsert()
+    assert db.add_production_records([production_row()])[0]['success']
+    assert not db.add_production_records([production_row(생산수량=10)])[0]['success']
+
+
+def test_replica_store_keeps_rows_sharing_natural_key(tmp_path):
+    path = str(tmp_path / 'replica.db')
+    # 이전 버전이 만든 고유 인덱스도 복제본으로 열면 제거
+    SQLiteBackend(path)
+    replica = SQLiteBackend(path, natural_key_unique=False)
+
+    assert not replica.supports_natural_key_upsert()
+    assert replica.upsert_rows('Production', [production_row(id=1), production_row(id=2)]) == 2
+    assert replica.upsert_rows('Production', [production_row(id=1, 생산수량=5)]) == 1
+
+    rows = replica.get_production_records('2024-01-01', '2024-01-01')
+    assert sorted((row['id'], row['생산수량']) for row in rows) == [(1, 5), (2, 90)]
+
+
+def test_upsert_rows_never_deletes_other_ids(tmp_path):
+    db = SQLiteBackend(str(tmp_path / 'production.db'))
+    db.upsert_rows('Production', [production_row(id=1)])
+
+    with pytest.raises(Exception):
+        db.upsert_rows('Production', [production_row(id=2)])
+
+    assert [row['id'] for row in db.get_production_records('2024-01-01', '2024-01-01')] == [1]
@@ -0,0 +1,65 @@
+from utils.sync_engine import build_sync_plan, row_hash, row_key
+
+
+def production_row(**values):
+    row = {'날짜': '2024-01-01', '작업자': '김작업', '라인번호': 'L1', '모델차수': 'A모델',
+           '목표수량': 100, '생산수량': 90, '불량수량': 1, '특이사항': ''}
+    row.update(values)
+    return row
+
+
+def test_same_id_with_changed_content_is_update():
+    target = [production_row(id=1)]
+    source = [production_row(id=1, 생산수량=95)]
+
+    plan = build_sync_plan('production', source, target)
+
+    assert plan.inserts == [] and plan.deletes == []
+    assert plan.updates == [(target[0], source[0])]
+    assert plan.unchanged == 0
+
+
+def test_rows_without_id_are_matched_by_hash():
+    target = [production_row(id=7), production_row(id=8, 작업자='이생산')]
+    source = [production_row(작업자='이생산'), production_row()]
+
+    plan = build_sync_plan('production', source, target)
+
+    assert plan.unchanged == 2
+    assert not plan.has_changes
+
+
+def test_rows_without_id_fall_back_to_natural_key():
+    target = [production_row(id=3, 날짜='2024-01-01T00:00:00')]
+    source = [production_row(생산수량=50)]
+
+    plan = build_sync_plan('production', source, target)
+
+    assert row_key('production', target[0]) == row_key('production', source[0])
+    assert [pair[0]['id'] for pair in plan.updates] == [3]
+    assert plan.inserts == [] and plan.deletes == []
+
+
+def test_unmatched_rows_become_inserts_and_deletes():
+    target = [production_row(id=1), production_row(id=2, 작업자='박공정')]
+    source = [production_row(id=1), production_row(작업자='최조립')]
+
+    plan = build_sync_plan('production', source, target)
+
+    assert [row['작업자'] for row in plan.inserts] == ['최조립']
+    assert [row['id'] for row in plan.deletes] == [2]
+    assert plan.counts() == {'추가': 1, '수정': 0, '삭제': 1, '변경 없음': 1}
+
+
+def test_protected_rows_are_not_deleted():
+    target = [{'id': 1, '이메일': 'admin@example.com', '이름': '관리자', '비밀번호': 'x', '권한': '관리자'},
+              {'id': 2, '이메일': 'user@example.com', '이름': '사용자', '비밀번호': 'x', '권한': 'user'}]
+
+    plan = build_sync_plan('users', [], target)
+
+    assert [row['id'] for row in plan.deletes] == [2]
+
+
+def test_hash_ignores_representation_differences():
+    assert row_hash('production', production_row(생산수량='90')) == row_hash('production', production_row(생산수량=90.0))
+    assert row_hash('production', production_row()) != row_hash('production', production_row(불량수량=2))
@@ -1,5 +1,5 @@
 import bcrypt
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 import streamlit as st
 import os
 
@@ -21,7 +21,7 @@ def initialize_admin():
         admin_password = ADMIN_PASSWORD
         admin_name = ADMIN_NAME
         
-        db = SupabaseDB()
+        db = get_db()
         existing_user = db.get_user(admin_email)
         
         if not existing_user:
@@ -55,7 +55,7 @@ def check_password(email: str, password: str) -> bool:
     """
     try:
         # Google Sheets에서 사용자 정보 가져오기
-        db = SupabaseDB()
+        db = get_db()
         user = db.get_user(email)
         
         if user is None:
@@ -83,7 +83,7 @@ def create_user(email: str, password: str, name: str, role: str = 'user') -> boo
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         
         # Google Sheets에 사용자 정보 저장
-        db = SupabaseDB()
+        db = get_db()
         return db.create_user(email, hashed.decode('utf-8'), name, role)
     except Exception as e:
         print(f"사용자 생성 중 오류 발생: {e}")
@@ -0,0 +1,321 @@
+"""
+gzip 압축 NDJSON 백업 파일 생성 및 복원 모듈
+
+백업 파일(.ndjson.gz)은 한 줄에 JSON 객체 하나씩 기록합니다.
+  - 첫 줄: 매니페스트 {'type': 'manifest', 'format', 'version', 'created_at', 'tables'}
+  - 데이터: {'type': 'row', 'table': 테이블, 'row': 한글 필드명 레코드}
+  - 마지막 줄: {'type': 'summary', 'counts': {테이블: 행 수}} (복원 시 파일이 잘렸는지 확인)
+
+생성은 생산 실적을 페이지 단위로 받아 바로 압축 파일에 쓰고, 복원(RestoreJob)은 파일을 한 줄씩 읽어
+batch_size개씩 현재 백엔드에 반영하므로 전체 데이터를 메모리에 올리지 않습니다.
+복원은 배치마다 체크포인트를 남기므로 중단된 경우 다시 실행하면 이어서 진행합니다.
+"""
+import os
+import io
+import gzip
+import json
+import hashlib
+from datetime import datetime
+from utils.storage_backend import PRODUCTION_WRITE_CHUNK_SIZE, PRODUCTION_NATURAL_KEY
+from utils.sync_engine import build_sync_plan, load_backend_rows, apply_sync_plan, row_key
+
+BACKUP_FORMAT = 'production-management-backup'
+BACKUP_VERSION = 1
+
+# 백업 대상 테이블 (사용자 데이터는 비밀번호가 포함되므로 백업하지 않음)
+BACKUP_TABLES = ['workers', 'models', 'production']
+
+# 복원 체크포인트 파일 위치 (백업 파일 내용 + 대상 백엔드별로 하나)
+RESTORE_CHECKPOINT_DIR = os.path.join('backups', 'checkpoints')
+
+
+def _json_default(value):
+    """JSON으로 바로 변환되지 않는 값(날짜 등) 처리"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def write_backup(db, path):
+    """현재 백엔드의 작업자/모델/생산 실적을 path에 gzip NDJSON 백업 파일로 저장하고 테이블별 행 수 반환"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    counts = {table: 0 for table in BACKUP_TABLES}
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        def write(item):
+            f.write(json.dumps(item, ensure_ascii=False, default=_json_default))
+            f.write('\n')
+
+        write({
+            'type': 'manifest',
+            'format': BACKUP_FORMAT,
+            'version': BACKUP_VERSION,
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'tables': BACKUP_TABLES
+        })
+
+        for table, rows in (('workers', db.get_workers()), ('models', db.get_all_models())):
+            for row in rows or []:
+                write({'type': 'row', 'table': table, 'row': row})
+                counts[table] += 1
+
+        # 생산 실적은 페이지 단위로 받아 바로 기록 (Supabase 원본 행은 한글 필드명 레코드로 변환)
+        format_page = getattr(db, '_format_production_records', None)
+        for page in db.iter_production_pages():
+            for row in (format_page(page) if format_page else page):
+                write({'type': 'row', 'table': 'production', 'row': row})
+                counts['production'] += 1
+
+        write({'type': 'summary', 'counts': counts})
+
+    print(f"[INFO] 백업 파일 생성 완료: {path}, {counts}")
+    return counts
+
+
+def iter_backup(fileobj):
+    """백업 파일(바이너리 파일 객체)을 한 줄씩 읽어 ('manifest' | 'row' | 'summary', 내용) 반환하는 제너레이터
+
+    첫 줄이 백업 매니페스트가 아니면 ValueError를 발생시킵니다.
+    """
+    with gzip.GzipFile(fileobj=fileobj, mode='rb') as compressed:
+        lines = io.TextIOWrapper(compressed, encoding='utf-8')
+        for number, line in enumerate(lines):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if number == 0:
+                if item.get('type') != 'manifest' or item.get('format') != BACKUP_FORMAT:
+                    raise ValueError("백업 파일 형식이 아닙니다")
+                if item.get('version', 0) > BACKUP_VERSION:
+                    raise ValueError(f"지원하지 않는 백업 파일 버전입니다: {item.get('version')}")
+                yield 'manifest', item
+            elif item.get('type') == 'row':
+                yield 'row', item
+            elif item.get('type') == 'summary':
+                yield 'summary', item.get('counts', {})
+
+
+class RestoreJob:
+    """체크포인트를 남기며 백업 파일을 현재 백엔드에 복원하는 작업
+
+    생산 실적은 batch_size개씩 자연 키(PRODUCTION_NATURAL_KEY) 기준 upsert로 반영하므로 같은 배치를 다시 보내도
+    중복되지 않으며, 배치가 반영될 때마다 처리한 행 수를 체크포인트 파일에 기록합니다.
+    같은 파일을 같은 백엔드에 다시 복원하면 체크포인트 다음 행부터 이어서 진행하고, 완료되면 체크포인트를 지웁니다.
+    자연 키 고유 인덱스가 없는 백엔드(또는 키 값이 빈 행)는 배치마다 같은 기간의 기존 데이터와 비교하여 반영합니다.
+    """
+
+    def __init__(self, db, fileobj, batch_size=PRODUCTION_WRITE_CHUNK_SIZE, checkpoint_dir=RESTORE_CHECKPOINT_DIR):
+        self.db = db
+        self.fileobj = fileobj
+        self.batch_size = batch_size
+        self.job_id = self._job_id()
+        self.checkpoint_path = os.path.join(checkpoint_dir, f"{self.job_id}.json")
+
+    def _job_id(self):
+        """백업 파일 내용과 대상 백엔드로 작업 id 생성 (같은 파일을 같은 백엔드에 복원하면 같은 id)"""
+        digest = hashlib.sha1()
+        target = getattr(self.db, 'url', None) or getattr(self.db, 'path', '')
+        digest.update(f"{type(self.db).__name__}:{target}".encode('utf-8'))
+        self.fileobj.seek(0)
+        for block in iter(lambda: self.fileobj.read(1024 * 1024), b''):
+            digest.update(block)
+        self.fileobj.seek(0)
+        return digest.hexdigest()[:16]
+
+    def load_checkpoint(self):
+        """저장된 체크포인트 ({'rows_done', 'mode', 'result', 'updated_at'}, 없으면 None)"""
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[ERROR] 복원 체크포인트 읽기 실패: {e}")
+            return None
+
+    def _save_checkpoint(self, rows_done, mode, result):
+        """체크포인트 저장 (임시 파일에 쓴 뒤 교체하므로 저장 중에 중단되어도 이전 체크포인트가 남음)"""
+        os.makedirs(os.path.dirname(self.checkpoint_path) or '.', exist_ok=True)
+        state = {
+            'job_id': self.job_id,
+            'rows_done': rows_done,
+            'mode': mode,
+            'result': {kind: result[kind] for kind in ('추가', '수정', '반영', '중복', '실패')},
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        temp_path = self.checkpoint_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        """체크포인트 삭제 (처음부터 다시 복원)"""
+        try:
+            os.remove(self.checkpoint_path)
+        except FileNotFoundError:
+            pass
+
+    def _upsert_batch(self, rows, result):
+        """자연 키 기준 upsert (백엔드에 자연 키 고유 인덱스가 있을 때만 사용)
+
+        같은 배치에 키가 같은 행이 여러 개면 마지막 행만 보내고 (한 요청에서 같은 행을 두 번 수정할 수 없고,
+        고유 인덱스가 있으면 같은 키의 행을 둘 다 저장할 수 없음) 나머지 행 수는 결과의 '중복'에 기록합니다.
+        키 값이 빈 행은 upsert할 수 없으므로 비교 방식으로 반영합니다.
+        """
+        keyed = {}
+        unkeyed = []
+        for row in rows:
+            if all(row.get(field) not in (None, '') for field in PRODUCTION_NATURAL_KEY):
+                keyed[row_key('production', row)] = row
+            else:
+                unkeyed.append(row)
+        collapsed = len(rows) - len(unkeyed) - len(keyed)
+        if collapsed:
+            result['중복'] += collapsed
+            print(f"[ERROR] 백업 배치에 자연 키가 같은 생산 실적 {collapsed}행은 마지막 행만 반영하고 건너뜀")
+
+        if keyed:
+            chunk_results = self.db.upsert_production_records(list(keyed.values()), on_conflict=','.join(PRODUCTION_NATURAL_KEY),
+                                                              chunk_size=self.batch_size)
+            for chunk in chunk_results:
+                if chunk['success']:
+                    result['반영'] += chunk['rows']
+                else:
+                    result['실패'] += chunk['rows']
+                    result['errors'].append(str(chunk['error']))
+            if any(not chunk['success'] for chunk in chunk_results):
+                return
+        if unkeyed:
+            self._diff_batch(unkeyed, result)
+
+    def _diff_batch(self, rows, result):
+        """같은 기간의 기존 데이터와 비교하여 없는 행은 추가, 내용이 다른 행은 수정"""
+        dates = [str(row.get('날짜'))[:10] for row in rows if row.get('날짜')]
+        existing = self.db.get_production_records(min(dates), max(dates)) if dates else []
+        if existing is None:
+            # 기존 데이터를 확인할 수 없으면 모두 추가하면 중복이 생기므로 반영하지 않음
+            result['실패'] += len(rows)
+            result['errors'].append(f"기존 생산 실적 조회 실패로 {len(rows)}행을 반영하지 않음")
+            return
+        self._merge(result, apply_sync_plan(self.db, build_sync_plan('production', rows, existing), allow_deletes=False))
+
+    def _merge(self, result, apply_result):
+        for kind in ('추가', '수정', '실패'):
+            result[kind] += apply_result[kind]
+        result['errors'].extend(apply_result['errors'])
+
+    def run(self, progress=None):
+        """복원 실행 (체크포인트가 있으면 이어서), 결과 반환
+
+        배치 반영에 실패하면 체크포인트를 마지막으로 성공한 배치에 둔 채 중단합니다 (interrupted=True).
+        progress(읽은 행 수, 진행률 0~1)는 배치를 반영할 때마다 호출합니다 (진행률은 압축 파일 기준).
+
+        결과: {'manifest', 'counts': 읽은 행 수, '추가', '수정', '반영': upsert한 행 수,
+               '중복': 자연 키가 같은 다른 행에 덮여 반영하지 않은 행 수, '실패', 'errors',
+               'batch_errors': 중단된 배치의 오류 (실패/errors에는 포함하지 않음),
+               'resumed_from': 이어서 시작한 생산 실적 행 수, 'interrupted', 'complete': 요약 행 수와 일치 여부}
+        """
+        checkpoint = self.load_checkpoint() or {}
+        rows_done = checkpoint.get('rows_done', 0)
+        result = {'manifest': None, 'counts': {}, '추가': 0, '수정': 0, '반영': 0, '중복': 0, '실패': 0, 'errors': [], 'batch_errors': [],
+                  'resumed_from': rows_done, 'interrupted': False, 'complete': False}
+        for kind, count in (checkpoint.get('result') or {}).items():
+            result[kind] = count
+        if rows_done:
+            print(f"[INFO] 복원 체크포인트에서 이어서 진행: 생산 실적 {rows_done}행 이후 ({self.job_id})")
+
+        fileobj = self.fileobj
+        fileobj.seek(0, os.SEEK_END)
+        total_size = fileobj.tell() or 1
+        fileobj.seek(0)
+
+        small_tables = {'workers': [], 'models': []}
+        batch = []
+        read_rows = 0
+        production_rows = 0
+
+        def report():
+            if progress:
+                progress(read_rows, min(fileobj.tell() / total_size, 1.0))
+
+        def flush():
+            """배치를 반영하고 성공하면 체크포인트 기록, 실패하면 False
+
+            자연 키 고유 인덱스가 있으면 upsert, 없거나 확인할 수 없으면 기간별 비교 방식으로 반영합니다.
+            """
+            failed_before = result['실패']
+            collapsed_before = result['중복']
+            errors_before = len(result['errors'])
+            if self.db.supports_natural_key_upsert():
+                mode = 'upsert'
+                self._upsert_batch(batch, result)
+            else:
+                mode = 'diff'
+                self._diff_batch(batch, result)
+            if result['실패'] > failed_before or len(result['errors']) > errors_before:
+                # 실패한 배치는 체크포인트와 결과에 포함하지 않음 (다시 실행하면 이 배치부터 반영)
+                result['실패'] = failed_before
+                result['중복'] = collapsed_before
+                result['batch_errors'] = result['errors'][errors_before:]
+                del result['errors'][errors_before:]
+                return False
+            batch.clear()
+            self._save_checkpoint(production_rows, mode, result)
+            report()
+            return True
+
+        try:
+            summary = None
+            for kind, item in iter_backup(fileobj):
+                if kind == 'manifest':
+                    result['manifest'] = item
+                elif kind == 'summary':
+                    summary = item
+                else:
+                    table = item.get('table')
+                    result['counts'][table] = result['counts'].get(table, 0) + 1
+                    read_rows += 1
+                    # 백업의 id는 다른 데이터베이스의 id일 수 있으므로 자연 키와 내용으로만 비교
+                    row = {field: value for field, value in (item.get('row') or {}).items() if field != 'id'}
+                    if table in small_tables:
+                        small_tables[table].append(row)
+                    elif table == 'production':
+                        production_rows += 1
+                        if production_rows <= rows_done:
+                            continue
+                        batch.append(row)
+                        if len(batch) >= self.batch_size and not flush():
+                            result['interrupted'] = True
+                            break
+            if batch and not result['interrupted'] and not flush():
+                result['interrupted'] = True
+
+            # 작업자/모델은 행 수가 적고 비교 방식이라 다시 실행해도 중복되지 않으므로 매번 반영
+            if not result['interrupted']:
+                for table, rows in small_tables.items():
+                    if rows:
+                        self._merge(result, apply_sync_plan(self.db, build_sync_plan(table, rows, load_backend_rows(self.db, table)), allow_deletes=False))
+                report()
+
+                result['complete'] = summary is not None and all(result['counts'].get(table, 0) == count for table, count in summary.items())
+                if result['complete']:
+                    self.clear_checkpoint()
+                else:
+                    print(f"[ERROR] 백업 파일의 행 수가 요약과 다름 (파일이 잘렸을 수 있음): 읽은 행={result['counts']}, 요약={summary}")
+        except Exception as e:
+            print(f"[ERROR] 백업 복원 중 오류 발생: {e}")
+            import traceback
+            print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+            result['errors'].append(str(e))
+            result['interrupted'] = True
+
+        print(f"[INFO] 백업 복원 결과: 읽은 행={result['counts']}, 추가 {result['추가']}건, 수정 {result['수정']}건, "
+              f"반영 {result['반영']}건, 중복 {result['중복']}건, 실패 {result['실패']}건, 중단={result['interrupted']}")
+        return result
+
+
+def restore_backup(db, fileobj, batch_size=PRODUCTION_WRITE_CHUNK_SIZE, progress=None):
+    """백업 파일을 현재 백엔드에 복원하고 결과 반환 (RestoreJob, 중단된 복원은 이어서 진행)"""
+    return RestoreJob(db, fileobj, batch_size).run(progress)
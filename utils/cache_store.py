@@ -0,0 +1,280 @@
+"""
+SupabaseDB 조회 결과를 키 단위로 저장하는 디스크 캐시 모듈
+
+SQLite 파일 하나에 캐시 항목을 행 단위로 저장합니다.
+조회/저장/삭제는 해당 키의 행만 읽고 쓰며, 만료 시각은 항목마다 따로 저장됩니다.
+각 항목에는 원본 테이블 태그와 날짜 범위를 함께 기록하여, 쓰기 작업 시 해당 날짜를 포함하는 항목만
+무효화하거나 변경된 행을 직접 반영(write-through)할 수 있습니다.
+WAL 모드와 busy timeout을 사용하므로 여러 Streamlit 프로세스가 같은 파일을 공유해도 안전합니다.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+
+
+class CacheStore:
+    def __init__(self, path='cache/supabase_cache.db'):
+        self.path = path
+        self._local = threading.local()
+
+        # 캐시 디렉토리 생성
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                tag TEXT,
+                range_start TEXT,
+                range_end TEXT,
+                meta TEXT
+            )
+        """)
+
+        # 태그 컬럼이 없는 이전 캐시 파일은 컬럼만 추가 (기존 항목은 태그 없이 만료될 때까지 유지)
+        existing_columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        for column in ('tag', 'range_start', 'range_end', 'meta'):
+            if column not in existing_columns:
+                conn.execute(f"ALTER TABLE cache_entries ADD COLUMN {column} TEXT")
+
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_tag ON cache_entries (tag, range_start, range_end)")
+
+        # 태그(원본 테이블)별 데이터 버전 - 캐시 항목이 어떤 원본 상태에서 만들어졌는지 확인하는 데 사용
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_versions (
+                tag TEXT PRIMARY KEY,
+                version TEXT,
+                since REAL,
+                checked_at REAL NOT NULL DEFAULT 0
+            )
+        """)
+
+    def _connect(self):
+        """스레드별 SQLite 연결 반환 (Streamlit 세션은 서로 다른 스레드에서 실행됨)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """만료되지 않은 캐시 항목 조회 (없거나 만료되었으면 None)"""
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key, max_stale=0):
+        """캐시 항목 조회, (데이터, 만료 여부) 반환
+
+        만료 후 max_stale초가 지나지 않은 항목은 만료 여부 True와 함께 반환하고, 그보다 오래되었거나 없으면 None을 반환합니다.
+        만료된 항목은 바로 삭제하지 않고 cleanup_expired에서 정리합니다.
+        """
+        row = self._connect().execute(
+            "SELECT data, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        data, expires_at = row
+        now = time.time()
+        if expires_at <= now - max_stale:
+            return None
+        return json.loads(data), expires_at <= now
+
+    def set(self, key, data, ttl, tag=None, range_start=None, range_end=None, meta=None):
+        """캐시 항목 저장 (ttl: 유효 시간, 초)
+
+        tag는 항목의 원본 테이블, range_start/range_end는 항목이 담고 있는 날짜 범위(YYYY-MM-DD)입니다.
+        범위가 없으면 해당 태그의 모든 날짜를 포함하는 항목으로 취급됩니다.
+        meta에는 조회 조건 등 write-through 시 필요한 부가 정보를 저장합니다.
+        """
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, data, created_at, expires_at, tag, range_start, range_end, meta) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, json.dumps(data, ensure_ascii=False), now, now + ttl, tag, range_start, range_end,
+             json.dumps(meta, ensure_ascii=False) if meta is not None else None)
+        )
+
+    def get_many(self, keys, max_stale=0):
+        """여러 키의 캐시 항목을 한 번에 조회, {키: (데이터, 만료 여부)} 반환
+
+        없거나 만료 후 max_stale초가 지난 키는 제외합니다.
+        """
+        result = {}
+        conn = self._connect()
+        now = time.time()
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, data, expires_at FROM cache_entries WHERE key IN ({placeholders}) AND expires_at > ?",
+                (*chunk, now - max_stale)
+            ).fetchall()
+            for key, data, expires_at in rows:
+                result[key] = (json.loads(data), expires_at <= now)
+        return result
+
+    def set_many(self, entries):
+        """여러 캐시 항목을 하나의 트랜잭션으로 저장
+
+        entries: (key, data, ttl, tag, range_start, range_end, meta) 튜플 목록
+        """
+        now = time.time()
+        rows = [
+            (key, json.dumps(data, ensure_ascii=False), now, now + ttl, tag, range_start, range_end,
+             json.dumps(meta, ensure_ascii=False) if meta is not None else None)
+            for key, data, ttl, tag, range_start, range_end, meta in entries
+        ]
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (key, data, created_at, expires_at, tag, range_start, range_end, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete(self, key):
+        """특정 키의 캐시 항목 삭제"""
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        """접두사로 시작하는 모든 캐시 항목 삭제, 삭제된 항목 수 반환"""
+        if not prefix:
+            return self.clear()
+
+        # LIKE 대신 범위 조건을 사용하여 기본 키 인덱스를 활용
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        cursor = self._connect().execute(
+            "DELETE FROM cache_entries WHERE key >= ? AND key < ?", (prefix, upper)
+        )
+        return cursor.rowcount
+
+    def delete_tag(self, tag, date=None):
+        """태그가 일치하는 캐시 항목 삭제, 삭제된 항목 수 반환
+
+        date가 주어지면 해당 날짜를 범위에 포함하는 항목만 삭제합니다.
+        """
+        if date is None:
+            cursor = self._connect().execute("DELETE FROM cache_entries WHERE tag = ?", (tag,))
+        else:
+            cursor = self._connect().execute(
+                "DELETE FROM cache_entries WHERE tag = ? "
+                "AND (range_start IS NULL OR range_start <= ?) "
+                "AND (range_end IS NULL OR range_end >= ?)",
+                (tag, date, date)
+            )
+        return cursor.rowcount
+
+    def find_range_entries(self, tag, start, end, max_stale=0):
+        """태그가 일치하고 [start, end] 기간과 겹치는 캐시 항목의 키/범위/meta 목록 반환 (데이터는 읽지 않음)
+
+        만료 후 max_stale초가 지나지 않은 항목도 포함합니다.
+        """
+        rows = self._connect().execute(
+            "SELECT key, range_start, range_end, meta FROM cache_entries "
+            "WHERE tag = ? AND expires_at > ? AND range_start IS NOT NULL AND range_end IS NOT NULL "
+            "AND range_start <= ? AND range_end >= ?",
+            (tag, time.time() - max_stale, end, start)
+        ).fetchall()
+        return [
+            {'key': key, 'range_start': range_start, 'range_end': range_end, 'meta': json.loads(meta) if meta else None}
+            for key, range_start, range_end, meta in rows
+        ]
+
+    def update_tag(self, tag, dates, update):
+        """태그가 일치하는 캐시 항목의 데이터를 직접 갱신, 갱신된 항목 수 반환
+
+        dates가 주어지면 그중 하나라도 범위에 포함하는 항목만 대상으로 합니다.
+        update(data, meta, range_start, range_end)는 새 데이터를 반환해야 하며, 만료 시각은 유지됩니다.
+        만료되었지만 아직 정리되지 않은 항목도 갱신하여, 만료된 데이터를 제공하는 동안에도 쓰기 내용이 보이도록 합니다.
+        다른 프로세스의 쓰기와 섞이지 않도록 하나의 쓰기 트랜잭션 안에서 읽고 씁니다.
+        """
+        sql = "SELECT key, data, range_start, range_end, meta FROM cache_entries WHERE tag = ?"
+        params = [tag]
+        if dates:
+            conditions = []
+            for date in dates:
+                conditions.append("((range_start IS NULL OR range_start <= ?) AND (range_end IS NULL OR range_end >= ?))")
+                params.extend([date, date])
+            sql += " AND (" + " OR ".join(conditions) + ")"
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(sql, params).fetchall()
+            for key, data, range_start, range_end, meta in rows:
+                new_data = update(json.loads(data), json.loads(meta) if meta else None, range_start, range_end)
+                conn.execute(
+                    "UPDATE cache_entries SET data = ? WHERE key = ?",
+                    (json.dumps(new_data, ensure_ascii=False), key)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return len(rows)
+
+    def claim_version_check(self, tag, interval):
+        """태그의 데이터 버전을 확인할 차례인지 여부 (마지막 확인 후 interval초가 지났으면 확인 시각을 기록하고 True)
+
+        여러 세션/프로세스가 같은 파일을 공유하므로 동시에 호출되어도 한 곳만 True를 받습니다.
+        """
+        now = time.time()
+        conn = self._connect()
+        conn.execute("INSERT OR IGNORE INTO cache_versions (tag, checked_at) VALUES (?, 0)", (tag,))
+        cursor = conn.execute(
+            "UPDATE cache_versions SET checked_at = ? WHERE tag = ? AND checked_at <= ?", (now, tag, now - interval)
+        )
+        return cursor.rowcount > 0
+
+    def get_version(self, tag):
+        """태그의 데이터 버전 조회, {'version', 'since'} 반환 (기록된 버전이 없으면 None)
+
+        since는 해당 버전을 처음 확인한 시각입니다.
+        """
+        row = self._connect().execute("SELECT version, since FROM cache_versions WHERE tag = ?", (tag,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return {'version': json.loads(row[0]), 'since': row[1]}
+
+    def set_version(self, tag, version, since=None):
+        """태그의 데이터 버전 저장 (version이 None이면 알 수 없는 상태로 기록)"""
+        conn = self._connect()
+        conn.execute("INSERT OR IGNORE INTO cache_versions (tag, checked_at) VALUES (?, 0)", (tag,))
+        conn.execute(
+            "UPDATE cache_versions SET version = ?, since = ? WHERE tag = ?",
+            (json.dumps(version, ensure_ascii=False) if version is not None else None, since, tag)
+        )
+
+    def renew_tag(self, tag, expires_at, created_after):
+        """태그가 일치하고 created_after 이후에 만들어진 항목 중 expires_at보다 먼저 만료되는 항목의 만료 시각을 연장, 연장된 항목 수 반환"""
+        return self._connect().execute(
+            "UPDATE cache_entries SET expires_at = ? WHERE tag = ? AND expires_at < ? AND created_at >= ?",
+            (expires_at, tag, expires_at, created_after)
+        ).rowcount
+
+    def clear(self):
+        """모든 캐시 항목 삭제, 삭제된 항목 수 반환"""
+        return self._connect().execute("DELETE FROM cache_entries").rowcount
+
+    def cleanup_expired(self, grace=0):
+        """만료 후 grace초가 지난 캐시 항목 정리, 삭제된 항목 수 반환"""
+        return self._connect().execute(
+            "DELETE FROM cache_entries WHERE expires_at <= ?", (time.time() - grace,)
+        ).rowcount
@@ -12,7 +12,7 @@ def initialize_test_data(db):
     ]
     
     for emp_id, name, dept, line in workers:
-        db.create_worker(emp_id, name, dept, line)
+        db.add_worker(emp_id, name, dept, line)
     
     # 생산 실적 데이터 생성
     models = ['A모델', 'B모델', 'C모델']
@@ -21,6 +21,7 @@ def initialize_test_data(db):
     end_date = datetime.now()
     start_date = end_date - timedelta(days=90)
     current_date = start_date
+    records = []
     
     while current_date <= end_date:
         for worker in workers:
@@ -28,20 +29,24 @@ def initialize_test_data(db):
             actual_qty = random.randint(70, target_qty)
             defect_qty = random.randint(0, 5)
             
-            db.create_production_record(
-                current_date,
-                worker[1],  # 작업자 이름
-                worker[3],  # 라인번호
-                random.choice(models),
-                target_qty,
-                actual_qty,
-                defect_qty,
-                "정상 생산" if defect_qty == 0 else "품질 이슈 발생"
-            )
+            records.append({
+                '날짜': current_date.strftime('%Y-%m-%d'),
+                '작업자': worker[1],  # 작업자 이름
+                '라인번호': worker[3],
+                '모델차수': random.choice(models),
+                '목표수량': target_qty,
+                '생산수량': actual_qty,
+                '불량수량': defect_qty,
+                '특이사항': "정상 생산" if defect_qty == 0 else "품질 이슈 발생"
+            })
         current_date += timedelta(days=1)
+    
+    # 청크 단위 일괄 추가
+    db.add_production_records(records)
 
 # 앱 시작 시 테스트 데이터 초기화
 if __name__ == "__main__":
-    from utils.supabase_db import SupabaseDB
-    db = SupabaseDB()
-    initialize_test_data(db) 
\ No newline at end of file
+    from utils.storage_backend import create_storage_backend
+    db = create_storage_backend()
+    initialize_test_data(db)
+ 
\ No newline at end of file
@@ -1,6 +1,7 @@
 import streamlit as st
 import bcrypt
 from utils.translation import translate
+from utils.storage_backend import get_db
 
 def verify_password(stored_hash, provided_password):
     """저장된 해시와 제공된 비밀번호를 비교하여 일치하는지 확인"""
@@ -64,7 +65,7 @@ def login():
         # 로그인 처리 로직
         if 'db' in st.session_state:
             try:
-                users = st.session_state.db.get_all_users()
+                users = get_db().get_all_users()
                 print(f"[DEBUG] 총 {len(users)}명의 사용자가 있습니다.")
                 
                 # 일치하는 사용자 찾기
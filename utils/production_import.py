@@ -0,0 +1,261 @@
+"""
+CSV/엑셀(XLSX) 파일의 생산 실적 일괄 등록 모듈
+
+파일을 IMPORT_READ_CHUNK_SIZE행씩 DataFrame으로 읽어 컬럼 단위로 한 번에 검증하고
+(날짜 형식, 등록된 작업자/모델, 수량, 불량수량 ≤ 생산수량, 파일 내 자연 키 중복),
+청크의 기간에 이미 등록된 실적과 자연 키가 같은 행은 중복으로 보고하고 나머지만
+add_production_records로 청크 단위 일괄 추가합니다 (같은 파일을 다시 가져와도 중복 등록되지 않음).
+기존 실적을 조회하지 못한 청크는 추가하지 않고 오류로 보고합니다.
+잘못된 행은 추가하지 않고 파일의 행 번호와 오류 내용을 담은 오류 보고서로 반환합니다.
+"""
+import codecs
+
+import numpy as np
+import pandas as pd
+from utils.storage_backend import PRODUCTION_QUANTITY_FIELDS, PRODUCTION_NATURAL_KEY, PRODUCTION_WRITE_CHUNK_SIZE
+
+# 한 번에 읽어 검증하는 행 수
+IMPORT_READ_CHUNK_SIZE = 2000
+
+# CSV 인코딩을 확인할 때 한 번에 읽는 바이트 수
+ENCODING_SNIFF_SIZE = 64 * 1024
+
+# 가져오는 컬럼과 필수 컬럼
+IMPORT_COLUMNS = ['날짜', '작업자', '라인번호', '모델차수', '목표수량', '생산수량', '불량수량', '특이사항']
+IMPORT_REQUIRED_COLUMNS = ['날짜', '작업자', '라인번호', '모델차수', '생산수량']
+
+# 파일 헤더 별칭 (입력 화면의 항목 이름 등) -> 생산 실적 필드명
+IMPORT_COLUMN_ALIASES = {
+    '생산일자': '날짜',
+    '일자': '날짜',
+    '라인': '라인번호',
+    '모델명': '모델차수',
+    '모델': '모델차수',
+    '목표': '목표수량',
+    '생산': '생산수량',
+    '불량': '불량수량',
+    '비고': '특이사항'
+}
+
+
+def _detect_encoding(fileobj):
+    """CSV 인코딩 확인 (UTF-8이 아니면 엑셀에서 저장한 한글 CSV로 보고 cp949)
+
+    파일 전체를 메모리에 올리지 않도록 ENCODING_SNIFF_SIZE 바이트씩 읽어 확인하며,
+    ASCII가 아닌 문자가 처음 나오는 블록에서 판정이 끝납니다.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    fileobj.seek(0)
+    try:
+        while True:
+            block = fileobj.read(ENCODING_SNIFF_SIZE)
+            if not block:
+                decoder.decode(b'', final=True)
+                return 'utf-8-sig'
+            # 블록 끝에서 잘린 멀티바이트 문자는 다음 블록과 이어서 확인
+            decoder.decode(block)
+            if not block.isascii():
+                return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+    finally:
+        fileobj.seek(0)
+
+
+def _iter_xlsx_chunks(fileobj, chunk_size):
+    """XLSX 첫 번째 시트를 읽기 전용 모드로 chunk_size행씩 DataFrame으로 반환 (openpyxl 필요)"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(value).strip() if value is not None else '' for value in next(rows, [])]
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=header)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header)
+    finally:
+        workbook.close()
+
+
+def iter_import_chunks(fileobj, file_name, chunk_size=IMPORT_READ_CHUNK_SIZE):
+    """파일을 chunk_size행씩 DataFrame으로 읽는 제너레이터 (확장자로 CSV/XLSX 구분)"""
+    if file_name.lower().endswith('.xlsx'):
+        yield from _iter_xlsx_chunks(fileobj, chunk_size)
+        return
+
+    encoding = _detect_encoding(fileobj)
+    for chunk in pd.read_csv(fileobj, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding=encoding):
+        yield chunk
+
+
+def normalize_import_columns(frame):
+    """헤더 공백 제거 및 별칭을 생산 실적 필드명으로 변경"""
+    columns = [str(column).strip() for column in frame.columns]
+    return frame.set_axis([IMPORT_COLUMN_ALIASES.get(column, column) for column in columns], axis=1)
+
+
+def import_row_keys(rows):
+    """생산 실적 행(DataFrame)의 자연 키 문자열 Series (날짜|작업자|모델차수|라인번호)"""
+    keys = rows['날짜'].fillna('').astype(str).str[:10]
+    for field in PRODUCTION_NATURAL_KEY[1:]:
+        keys = keys + '|' + rows[field].fillna('').astype(str)
+    return keys
+
+
+def _existing_keys(db, dates):
+    """dates 기간(최소~최대)에 이미 등록된 생산 실적의 자연 키 집합 (조회 실패 시 None)"""
+    if dates.empty:
+        return set()
+    records = db.get_production_records(dates.min(), dates.max())
+    if records is None:
+        return None
+    if not records:
+        return set()
+    return set(import_row_keys(pd.DataFrame.from_records(records, columns=PRODUCTION_NATURAL_KEY)))
+
+
+def validate_import_chunk(frame, known_workers, known_models, seen_keys=None):
+    """DataFrame 전체를 컬럼 단위로 검증하여 (정리된 DataFrame, 행별 오류 메시지 Series) 반환
+
+    오류가 없는 행은 빈 문자열입니다. seen_keys(자연 키 집합)를 주면 앞 청크까지 나온 키와의 중복도 검사하고
+    이번 청크의 올바른 행의 키를 추가합니다.
+    """
+    frame = frame.copy()
+    for column in IMPORT_COLUMNS:
+        if column not in frame:
+            frame[column] = ''
+    text = {column: frame[column].fillna('').astype(str).str.strip() for column in ['작업자', '라인번호', '모델차수', '특이사항']}
+    errors = pd.Series('', index=frame.index)
+
+    def flag(mask, message):
+        nonlocal errors
+        errors = errors.where(~mask, errors + message + '; ')
+
+    # 날짜: YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD (엑셀 날짜 셀 포함), 존재하지 않는 날짜는 오류
+    parts = frame['날짜'].fillna('').astype(str).str.strip().str.extract(r'^(\d{4})[-./](\d{1,2})[-./](\d{1,2})')
+    dates = pd.to_datetime(
+        pd.DataFrame({'year': parts[0], 'month': parts[1], 'day': parts[2]}).apply(pd.to_numeric, errors='coerce'),
+        errors='coerce'
+    )
+    flag(dates.isna(), '날짜 형식 오류')
+
+    # 작업자/모델은 등록된 값만, 라인번호는 필수
+    flag(text['작업자'] == '', '작업자 없음')
+    flag((text['작업자'] != '') & ~text['작업자'].isin(list(known_workers)), '등록되지 않은 작업자')
+    flag(text['모델차수'] == '', '모델 없음')
+    flag((text['모델차수'] != '') & ~text['모델차수'].isin(list(known_models)), '등록되지 않은 모델')
+    flag(text['라인번호'] == '', '라인번호 없음')
+
+    # 수량: 빈 값은 0 (생산수량은 필수), 숫자가 아니거나 음수/소수이면 오류
+    quantities = {}
+    for field in PRODUCTION_QUANTITY_FIELDS:
+        raw = frame[field].fillna('').astype(str).str.strip().str.replace(',', '', regex=False)
+        values = pd.to_numeric(raw.where(raw != '', '0'), errors='coerce')
+        if field in IMPORT_REQUIRED_COLUMNS:
+            flag(raw == '', f'{field} 없음')
+        flag(values.isna() | (values < 0) | (values.fillna(0) % 1 != 0), f'{field} 오류')
+        quantities[field] = values.fillna(0)
+    flag(quantities['불량수량'] > quantities['생산수량'], '불량수량이 생산수량보다 큼')
+
+    cleaned = pd.DataFrame({
+        '날짜': dates.dt.strftime('%Y-%m-%d'),
+        '작업자': text['작업자'],
+        '라인번호': text['라인번호'],
+        '모델차수': text['모델차수'],
+        **{field: quantities[field].astype('int64') for field in PRODUCTION_QUANTITY_FIELDS},
+        '특이사항': text['특이사항']
+    }, index=frame.index)
+
+    # 같은 파일 안의 자연 키 중복 (날짜+작업자+모델차수+라인번호)
+    # (다른 오류가 없는 행끼리만 비교하여 처음 나온 행은 추가)
+    keys = import_row_keys(cleaned)
+    valid_keys = keys[errors == '']
+    duplicated = valid_keys.duplicated(keep='first')
+    if seen_keys is not None:
+        duplicated |= valid_keys.isin(seen_keys)
+    flag(duplicated.reindex(frame.index, fill_value=False), '파일 내 중복 (날짜+작업자+모델차수+라인번호)')
+    if seen_keys is not None:
+        seen_keys.update(keys[errors == ''])
+
+    return cleaned, errors.str.rstrip('; ')
+
+
+def import_production_file(db, fileobj, file_name, known_workers, known_models,
+                           read_chunk_size=IMPORT_READ_CHUNK_SIZE, progress=None):
+    """CSV/XLSX 파일의 생산 실적을 검증하여 올바른 행만 일괄 추가하고 결과 반환
+
+    progress(처리한 행 수)는 청크마다 호출합니다.
+    결과: {'total': 전체 행 수, 'inserted': 추가된 행 수, 'errors': 오류 보고서 DataFrame(행, 오류), 'missing_columns'}
+    """
+    result = {'total': 0, 'inserted': 0, 'errors': pd.DataFrame(columns=['행', '오류']), 'missing_columns': []}
+    reports = []
+    seen_keys = set()
+    row_offset = 0
+
+    try:
+        for chunk in iter_import_chunks(fileobj, file_name, read_chunk_size):
+            chunk = normalize_import_columns(chunk)
+            if row_offset == 0:
+                missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in chunk]
+                if missing:
+                    print(f"[ERROR] 가져오기 파일에 필수 컬럼 없음: {missing}")
+                    result['missing_columns'] = missing
+                    return result
+
+            # 빈 줄은 건너뜀
+            chunk = chunk.reset_index(drop=True)
+            line_numbers = pd.Series(np.arange(len(chunk)) + row_offset + 2)  # 헤더가 1행
+            row_offset += len(chunk)
+            blank = chunk.fillna('').astype(str).apply(lambda column: column.str.strip() == '').all(axis=1)
+            chunk, line_numbers = chunk[~blank], line_numbers[~blank]
+            result['total'] += len(chunk)
+
+            cleaned, errors = validate_import_chunk(chunk, known_workers, known_models, seen_keys)
+            valid = errors == ''
+
+            # 이미 등록된 실적과 자연 키가 같은 행은 추가하지 않고 중복으로 보고
+            # (기존 실적을 조회할 수 없으면 중복 여부를 알 수 없으므로 청크의 올바른 행을 모두 오류로 보고하고 건너뜀)
+            if valid.any():
+                existing_keys = _existing_keys(db, cleaned.loc[valid, '날짜'])
+                if existing_keys is None:
+                    errors = errors.where(~valid, '기존 실적 조회 실패로 건너뜀 (다시 가져오기 필요)')
+                    valid &= False
+                else:
+                    existing = import_row_keys(cleaned[valid]).isin(existing_keys)
+                    existing = existing.reindex(cleaned.index, fill_value=False)
+                    errors = errors.where(~existing, '이미 등록된 실적 (날짜+작업자+모델차수+라인번호)')
+                    valid &= ~existing
+
+            reports.append(pd.DataFrame({'행': line_numbers[~valid], '오류': errors[~valid]}))
+
+            # 올바른 행은 청크 단위로 일괄 추가하고, 실패한 청크의 행은 오류 보고서에 추가
+            valid_rows = cleaned[valid]
+            if len(valid_rows):
+                chunk_results = db.add_production_records(valid_rows.to_dict('records'), chunk_size=PRODUCTION_WRITE_CHUNK_SIZE)
+                valid_lines = line_numbers[valid].tolist()
+                for chunk_result in chunk_results:
+                    if chunk_result['success']:
+                        result['inserted'] += chunk_result['rows']
+                    else:
+                        start = chunk_result['chunk'] * PRODUCTION_WRITE_CHUNK_SIZE
+                        failed_lines = valid_lines[start:start + chunk_result['rows']]
+                        reports.append(pd.DataFrame({'행': failed_lines, '오류': f"저장 실패: {chunk_result['error']}"}))
+
+            if progress:
+                progress(row_offset)
+    except Exception as e:
+        print(f"[ERROR] 생산 실적 가져오기 중 오류 발생: {e}")
+        import traceback
+        print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+        reports.append(pd.DataFrame({'행': [None], '오류': [f"파일 읽기 오류: {e}"]}))
+
+    reports = [report for report in reports if len(report)]
+    if reports:
+        result['errors'] = pd.concat(reports, ignore_index=True).sort_values('행', na_position='first', ignore_index=True)
+    print(f"[INFO] 생산 실적 가져오기: 전체 {result['total']}행, 추가 {result['inserted']}행, 오류 {len(result['errors'])}행")
+    return result
@@ -0,0 +1,410 @@
+"""
+Supabase 테이블을 로컬 SQLite 복제본으로 증분 동기화하는 모듈
+
+SUPABASE_REPLICA_PATH를 설정한 경우에만 Production, Workers, Model 테이블을 해당 SQLiteBackend 파일에 복제하고,
+백그라운드 스레드가 주기적으로 변경분만 가져옵니다. 복제본 파일은 암호화되지 않으므로 Users 테이블은
+SUPABASE_REPLICA_USERS=true일 때만 복제하며, 이때도 비밀번호 컬럼은 저장하지 않습니다.
+  - 추가: 마지막으로 받은 id보다 큰 행 (id 워터마크)
+  - 수정: 마지막으로 받은 (updated_at, id)보다 나중에 수정된 행 (updated_at 컬럼이 있는 테이블만)
+  - 삭제: 원격/로컬 행 수가 다를 때 원격 id 목록과 비교하여 없어진 id 삭제 (reconcile_interval마다)
+최초 동기화가 끝난 테이블은 is_ready()가 True가 되며, SupabaseDB는 이때부터 생산 실적 조회와 집계를 복제본에서 처리합니다.
+워터마크는 복제본 파일의 replica_state 테이블에 저장되므로 앱을 다시 시작해도 변경분만 가져옵니다.
+"""
+import os
+import time
+import sqlite3
+import threading
+from utils.sqlite_backend import SQLiteBackend
+from utils.resilience import CircuitOpenError
+from utils.storage_backend import PRODUCTION_QUANTITY_FIELDS
+
+# 복제 대상 테이블 (복제본 테이블 이름 -> 원격 테이블 이름 후보)
+REPLICA_TABLES = {
+    'Production': ['Production', 'production'],
+    'Workers': ['Workers', 'workers'],
+    'Model': ['Model', 'model']
+}
+
+# 명시적으로 설정한 경우에만 복제하는 테이블 (SUPABASE_REPLICA_USERS=true)
+REPLICA_USER_TABLES = {
+    'Users': ['Users', 'users']
+}
+
+# 복제본에 저장하지 않는 컬럼 (빈 값으로 저장)
+REPLICA_EXCLUDED_COLUMNS = {
+    'Users': ['비밀번호']
+}
+
+# 프로세스 전체에서 공유하는 복제본 ((URL, KEY, 경로) -> ReplicaSync)
+_replicas = {}
+_replicas_lock = threading.Lock()
+
+
+def get_replica(db):
+    """SupabaseDB 인스턴스의 연결 정보에 해당하는 복제본 반환 (없으면 생성하고 동기화 스레드 시작)
+
+    SUPABASE_REPLICA_PATH가 설정되지 않았거나 빈 문자열이면 복제본을 사용하지 않고 None을 반환합니다.
+    """
+    path = os.getenv('SUPABASE_REPLICA_PATH', '')
+    if not path:
+        return None
+
+    registry_key = (db.url, db.key, path)
+    with _replicas_lock:
+        replica = _replicas.get(registry_key)
+        if replica is None:
+            replica = ReplicaSync(
+                db, path,
+                interval=int(os.getenv('SUPABASE_REPLICA_INTERVAL', '30')),
+                reconcile_interval=int(os.getenv('SUPABASE_REPLICA_RECONCILE_INTERVAL', '600')),
+                include_users=os.getenv('SUPABASE_REPLICA_USERS', '').lower() in ('1', 'true', 'yes'),
+                on_change=lambda dates: db._invalidate_tag('production', dates)
+            )
+            _replicas[registry_key] = replica
+            replica.start()
+    return replica
+
+
+class ReplicaSync:
+    def __init__(self, db, path, interval=30, reconcile_interval=600, include_users=False, on_change=None):
+        """db: 원격 조회에 사용할 SupabaseDB 인스턴스, on_change(dates): 복제본의 생산 실적이 바뀌었을 때 호출
+        include_users가 True이면 Users 테이블도 복제 (비밀번호 제외)
+        """
+        self.db = db
+        self.tables = dict(REPLICA_TABLES, **(REPLICA_USER_TABLES if include_users else {}))
+        self.path = path
+        self.interval = interval
+        self.reconcile_interval = reconcile_interval
+        self.on_change = on_change
+        self.page_size = 1000
+        self.store = SQLiteBackend(path, natural_key_unique=False)
+
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._reconcile_requested = False
+        self._thread = None
+        self._ready_tables = set()
+        self._remote_tables = {}
+        self._unresolved_counts = {}
+        self.last_error = None
+
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS replica_state (
+                table_name TEXT PRIMARY KEY,
+                last_id INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT,
+                updated_id INTEGER NOT NULL DEFAULT 0,
+                last_sync REAL,
+                last_reconcile REAL
+            )
+        """)
+
+        # 이전 버전이 복제한 사용자 데이터 정리 (복제하지 않으면 삭제, 복제하더라도 비밀번호는 지움)
+        if 'Users' in self.tables:
+            self._connect().execute("UPDATE Users SET 비밀번호 = '' WHERE 비밀번호 != ''")
+        else:
+            self._connect().execute("DELETE FROM Users")
+            self._connect().execute("DELETE FROM replica_state WHERE table_name = 'Users'")
+
+    def _connect(self):
+        """스레드별 SQLite 연결 반환 (동기화 상태 테이블용)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _get_state(self, table):
+        """테이블의 동기화 상태 (워터마크) 조회"""
+        row = self._connect().execute(
+            "SELECT last_id, updated_at, updated_id, last_sync, last_reconcile FROM replica_state WHERE table_name = ?",
+            (table,)
+        ).fetchone()
+        if row is None:
+            return {'last_id': 0, 'updated_at': None, 'updated_id': 0, 'last_sync': None, 'last_reconcile': None}
+        return dict(zip(['last_id', 'updated_at', 'updated_id', 'last_sync', 'last_reconcile'], row))
+
+    def _set_state(self, table, state):
+        """테이블의 동기화 상태 저장"""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO replica_state (table_name, last_id, updated_at, updated_id, last_sync, last_reconcile) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (table, state['last_id'], state['updated_at'], state['updated_id'], state['last_sync'], state['last_reconcile'])
+        )
+
+    def start(self):
+        """백그라운드 동기화 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name='supabase-replica-sync', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """interval초마다 (또는 request_sync 호출 시 바로) 변경분 동기화
+        Streamlit 스크립트 밖에서 실행되므로 st.* 를 호출하지 않아야 함
+        """
+        while True:
+            try:
+                self.sync_once()
+            except Exception as e:
+                print(f"[ERROR] 복제본 동기화 중 오류 발생: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def request_sync(self, reconcile=False):
+        """다음 주기를 기다리지 않고 동기화 요청 (reconcile=True이면 삭제된 행 확인도 수행)"""
+        if reconcile:
+            self._reconcile_requested = True
+        self._wakeup.set()
+
+    def is_ready(self, table='Production'):
+        """이 프로세스에서 해당 테이블의 동기화를 한 번 이상 마쳤는지 여부"""
+        return table in self._ready_tables
+
+    def sync_once(self, reconcile=False):
+        """모든 복제 대상 테이블의 변경분을 한 번 동기화, {테이블: 반영된 행 수} 반환"""
+        with self._sync_lock:
+            if not self.db.client:
+                self.db._initialize_connection()
+                if not self.db.client:
+                    self.last_error = 'Supabase 클라이언트가 초기화되지 않음'
+                    return {}
+
+            reconcile = reconcile or self._reconcile_requested
+            self._reconcile_requested = False
+            results = {}
+            for table in self.tables:
+                try:
+                    results[table] = self._sync_table(table, reconcile)
+                    self._ready_tables.add(table)
+                except CircuitOpenError as e:
+                    # 연결할 수 없는 동안에는 남은 테이블도 건너뛰고 다음 주기에 다시 시도
+                    self.last_error = str(e)
+                    print(f"[INFO] 복제본 동기화 건너뜀: {e}")
+                    break
+                except Exception as e:
+                    self.last_error = f"{table}: {e}"
+                    print(f"[ERROR] 복제본 '{table}' 동기화 중 오류 발생: {e}")
+            if any(results.values()):
+                print(f"[INFO] 복제본 동기화: {results}")
+            return results
+
+    def status(self):
+        """테이블별 복제본 상태 목록 (데이터 관리 페이지 표시용)"""
+        result = []
+        for table in self.tables:
+            state = self._get_state(table)
+            result.append({
+                '테이블': table,
+                '행 수': self.store.count_rows(table),
+                '마지막 id': state['last_id'],
+                '마지막 수정 시각': state['updated_at'] or '',
+                '마지막 동기화': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state['last_sync'])) if state['last_sync'] else '',
+                '준비됨': self.is_ready(table)
+            })
+        return result
+
+    def _remote_table(self, table):
+        """원격 테이블 이름과 updated_at 컬럼 여부 확인 ((이름, updated_at 여부), 찾지 못하면 None)"""
+        if table in self._remote_tables:
+            return self._remote_tables[table]
+
+        candidates = self.tables[table]
+        if table == 'Production':
+            schema = self.db._resolve_production_table()
+            candidates = [schema['table']] if schema else []
+
+        for name in candidates:
+            try:
+                response = self._execute(self.db.client.table(name).select('*').limit(1))
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                print(f"[DEBUG] 복제 대상 테이블 '{name}' 확인 실패: {e}")
+                continue
+            if not response.data:
+                # 빈 테이블은 updated_at 여부를 알 수 없으므로 저장하지 않고 다음 주기에 다시 확인
+                return name, False
+            remote = (name, 'updated_at' in response.data[0])
+            self._remote_tables[table] = remote
+            if not remote[1]:
+                print(f"[INFO] '{name}' 테이블에 updated_at 컬럼이 없어 수정된 행은 동기화되지 않음 (추가/삭제만 반영)")
+            return remote
+        return None
+
+    def _execute(self, query):
+        """SupabaseDB와 같은 재시도 정책/회로 차단기를 적용하여 쿼리 실행"""
+        return self.db._call('복제본 동기화', query.execute, 'bulk_read')
+
+    def _sync_table(self, table, reconcile=False):
+        """테이블 하나의 추가/수정/삭제 분을 복제본에 반영, 반영된 행 수 반환"""
+        remote = self._remote_table(table)
+        if remote is None:
+            return 0
+        name, has_updated_at = remote
+        state = self._get_state(table)
+        applied = 0
+        initial = state['last_sync'] is None
+
+        # 1. 추가된 행: id 워터마크 이후 (id 커서 페이지네이션)
+        while True:
+            page = self._execute(self.db.client.table(name).select('*').gt('id', state['last_id']).order('id').limit(self.page_size)).data or []
+            if not page:
+                break
+            applied += self.apply_remote_rows(table, page)
+            state['last_id'] = page[-1]['id']
+            if initial and has_updated_at:
+                # 최초 동기화에서는 받은 행 중 가장 나중에 수정된 행을 수정 워터마크로 사용
+                latest = max(page, key=lambda row: (row.get('updated_at') or '', row['id']))
+                if (latest.get('updated_at') or '', latest['id']) > (state['updated_at'] or '', state['updated_id']):
+                    state['updated_at'], state['updated_id'] = latest.get('updated_at'), latest['id']
+            if len(page) < self.page_size:
+                break
+
+        # 2. 수정된 행: (updated_at, id) 워터마크 이후
+        #    한 번에 수정된 행들은 updated_at이 같을 수 있으므로 같은 시각의 남은 행을 id 순으로 먼저 가져온 뒤 다음 시각으로 이동
+        if has_updated_at and not initial and state['updated_at']:
+            while True:
+                page = self._execute(self.db.client.table(name).select('*').eq('updated_at', state['updated_at'])
+                                     .gt('id', state['updated_id']).order('id').limit(self.page_size)).data or []
+                if page:
+                    applied += self.apply_remote_rows(table, page)
+                    state['updated_id'] = page[-1]['id']
+                    if len(page) == self.page_size:
+                        continue
+
+                page = self._execute(self.db.client.table(name).select('*').gt('updated_at', state['updated_at'])
+                                     .order('updated_at').order('id').limit(self.page_size)).data or []
+                if not page:
+                    break
+                applied += self.apply_remote_rows(table, page)
+                state['updated_at'], state['updated_id'] = page[-1].get('updated_at'), page[-1]['id']
+
+        # 3. 삭제된 행: 행 수가 다를 때만 원격 id 목록과 비교
+        now = time.time()
+        if reconcile or state['last_reconcile'] is None or now - state['last_reconcile'] >= self.reconcile_interval:
+            applied += self._reconcile_deletes(table, name)
+            state['last_reconcile'] = now
+
+        state['last_sync'] = now
+        self._set_state(table, state)
+        return applied
+
+    def _reconcile_deletes(self, table, name):
+        """원격 id 목록과 비교하여 삭제된 행은 복제본에서 삭제하고 빠진 행은 다시 받아 저장, 반영된 행 수 반환
+
+        비교한 뒤에도 행 수가 맞지 않으면 (저장할 수 없는 행 등) 그 행 수 조합을 기록해 두고,
+        원격/로컬 행 수가 바뀌기 전까지는 id 목록 전체 비교를 반복하지 않습니다.
+        """
+        probe = self._execute(self.db.client.table(name).select('id', count='exact').limit(1))
+        remote_count = getattr(probe, 'count', None)
+        local_count = self.store.count_rows(table)
+        if remote_count is not None and remote_count == local_count:
+            self._unresolved_counts.pop(table, None)
+            return 0
+        if remote_count is not None and self._unresolved_counts.get(table) == (remote_count, local_count):
+            return 0
+
+        remote_ids = set()
+        last_id = 0
+        while True:
+            page = self._execute(self.db.client.table(name).select('id').gt('id', last_id).order('id').limit(self.page_size)).data or []
+            remote_ids.update(row['id'] for row in page)
+            if len(page) < self.page_size:
+                break
+            last_id = page[-1]['id']
+
+        local_ids = self.store.get_ids(table)
+        applied = 0
+        removed_ids = local_ids - remote_ids
+        if removed_ids:
+            applied += self.apply_deletes(table, removed_ids)
+
+        # 워터마크 이전인데 복제본에 없는 행은 다시 받아 저장
+        missing_ids = sorted(remote_ids - local_ids)
+        for i in range(0, len(missing_ids), self.page_size):
+            chunk = missing_ids[i:i + self.page_size]
+            page = self._execute(self.db.client.table(name).select('*').in_('id', chunk)).data or []
+            applied += self.apply_remote_rows(table, page)
+
+        local_count = self.store.count_rows(table)
+        if remote_count is not None and remote_count != local_count:
+            self._unresolved_counts[table] = (remote_count, local_count)
+            self.last_error = f"{table}: 복제본 행 수 불일치 (원격 {remote_count}행, 복제본 {local_count}행)"
+            print(f"[ERROR] 복제본 '{table}' 행 수가 원격과 다름 (원격 {remote_count}행, 복제본 {local_count}행) - 행 수가 바뀔 때까지 다시 비교하지 않음")
+        else:
+            self._unresolved_counts.pop(table, None)
+        return applied
+
+    def apply_remote_rows(self, table, rows, notify=True):
+        """원격 행(PostgREST 응답)을 복제본 형식으로 변환하여 저장, 실제로 바뀐 행 수 반환
+
+        생산 실적은 스키마에 맞춰 한글 필드명으로 변환하며, created_at/updated_at은 원본 값을 유지합니다.
+        NOT NULL 컬럼에 NULL이 있으면 수량은 0, 나머지는 빈 문자열로 저장합니다 (REPLICA_EXCLUDED_COLUMNS도 빈 문자열).
+        """
+        if table == 'Production':
+            records = self.db._format_production_records(rows)
+        elif table == 'Model':
+            records = [dict(row, model=row.get('model', row.get('MODEL', row.get('모델명'))),
+                            process=row.get('process', row.get('PROCESS', row.get('공정'))))
+                       for row in rows]
+        else:
+            records = rows
+
+        converted = []
+        for record, row in zip(records, rows):
+            if row.get('id') is None:
+                continue
+            item = {'id': row['id'], 'created_at': row.get('created_at'), 'updated_at': row.get('updated_at')}
+            for column in self.store.TABLE_COLUMNS[table]:
+                value = record.get(column) if column not in REPLICA_EXCLUDED_COLUMNS.get(table, ()) else None
+                if value is None:
+                    value = 0 if column in PRODUCTION_QUANTITY_FIELDS else ''
+                item[column] = value
+            converted.append(item)
+        return self.apply_upserts(table, converted, notify)
+
+    def apply_upserts(self, table, rows, notify=True):
+        """변환된 행을 복제본에 저장하고 생산 실적이 실제로 바뀐 경우 on_change 호출, 바뀐 행 수 반환
+
+        앱에서 직접 쓴 행(write-through, notify=False)이 다음 동기화에서 다시 내려오는 경우처럼 내용이 같은 행은 건너뜁니다.
+        """
+        if not rows:
+            return 0
+
+        existing = self.store.get_rows_by_ids(table, [row['id'] for row in rows])
+        fields = self.store.TABLE_COLUMNS[table]
+        changed = [row for row in rows
+                   if row['id'] not in existing or any(existing[row['id']].get(field) != row.get(field) for field in fields)]
+        if not changed:
+            return 0
+
+        written = self.store.upsert_rows(table, changed)
+        if written != len(changed):
+            self.last_error = f"{table}: 복제본 저장 {written}/{len(changed)}행"
+            print(f"[ERROR] 복제본 '{table}' 저장 행 수 불일치: {len(changed)}행 중 {written}행 저장")
+        if table == 'Production' and notify:
+            dates = [row.get('날짜') for row in changed]
+            dates += [existing[row['id']].get('날짜') for row in changed if row['id'] in existing]
+            self._notify(dates)
+        return len(changed)
+
+    def apply_deletes(self, table, ids, notify=True):
+        """복제본에서 id 목록의 행을 삭제하고 생산 실적이면 on_change 호출, 삭제된 행 수 반환"""
+        existing = self.store.get_rows_by_ids(table, ids) if table == 'Production' and notify else {}
+        removed = self.store.delete_rows(table, ids)
+        if removed and existing:
+            self._notify([row.get('날짜') for row in existing.values()])
+        return removed
+
+    def _notify(self, dates):
+        """복제본의 생산 실적 변경 알림 (캐시/공유 데이터셋 무효화용)"""
+        dates = sorted({date for date in dates if date})
+        if self.on_change is None or not dates:
+            return
+        try:
+            self.on_change(dates)
+        except Exception as e:
+            print(f"[ERROR] 복제본 변경 알림 처리 중 오류 발생: {e}")
@@ -0,0 +1,179 @@
+"""
+Supabase 요청 재시도 정책과 회로 차단기(circuit breaker) 모듈
+
+요청은 call_with_retry로 실행하며, 작업 종류별 RetryPolicy(시도 횟수, 전체 소요 시간 예산)에 따라
+지수 백오프 + 지터(full jitter)로 기다린 뒤 다시 시도합니다. 일시적인 오류(네트워크, 연결, 5xx)만 재시도합니다.
+연결 대상(URL)별 CircuitBreaker는 프로세스 전체에서 공유되며, 일시적인 오류가 연속으로 일정 횟수 발생하면
+reset_timeout초 동안 요청을 보내지 않고 바로 CircuitOpenError를 발생시킵니다 (호출하는 쪽은 캐시/로컬 데이터로 대체).
+그 후 요청 하나를 시험으로 보내 성공하면 다시 닫히고, 실패하면 다시 열립니다.
+"""
+import os
+import time
+import random
+import threading
+
+try:
+    import httpx
+    _HTTPX_TRANSIENT_ERRORS = (httpx.TransportError, httpx.TimeoutException)
+except ImportError:
+    _HTTPX_TRANSIENT_ERRORS = ()
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 요청을 보내지 않은 경우 발생"""
+
+
+class RetryPolicy:
+    def __init__(self, attempts=3, base_delay=0.2, max_delay=2.0, budget=5.0):
+        """attempts: 최대 시도 횟수, base_delay/max_delay: 백오프 기본/최대 대기 시간(초), budget: 재시도를 시작할 수 있는 전체 시간(초)"""
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def delay(self, attempt):
+        """attempt번째 실패 후 대기 시간 (0 ~ 지수 백오프 상한 사이의 임의 값)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# 작업 종류별 재시도 정책
+#   read: 화면 조회 (목록/집계) - 오래 기다리지 않고 캐시로 대체
+#   bulk_read: 생산 실적 페이지 조회 - 페이지 단위로 재시도하므로 받은 페이지는 다시 받지 않음
+#   probe: 데이터 버전 확인 - 재시도하지 않음 (다음 확인 주기에 다시 시도)
+#   write: 추가/수정/삭제 - 중복 쓰기를 막기 위해 재시도하지 않음
+RETRY_POLICIES = {
+    'read': RetryPolicy(attempts=3, base_delay=0.2, max_delay=2.0, budget=5.0),
+    'bulk_read': RetryPolicy(attempts=4, base_delay=0.5, max_delay=5.0, budget=20.0),
+    'probe': RetryPolicy(attempts=1),
+    'write': RetryPolicy(attempts=1)
+}
+
+# 재시도해도 되는 PostgreSQL 오류 코드 (연결 끊김, 서버 재시작, 동시성 충돌 등)
+TRANSIENT_SQLSTATES = {'08000', '08003', '08006', '40001', '40P01', '53300', '57P01', '57P03'}
+
+# 재시도해도 되는 전송 계층 예외 (연결 실패, 타임아웃 등 - 코드가 없는 오류 중 이 예외만 재시도)
+TRANSIENT_EXCEPTIONS = (ConnectionError, OSError) + _HTTPX_TRANSIENT_ERRORS
+
+
+def is_transient_error(error):
+    """일시적인 오류(재시도하면 성공할 수 있는 오류)인지 여부
+
+    PostgREST 오류 코드가 있으면 연결 오류(PGRST0xx), 5xx, 일부 SQLSTATE만 일시적인 오류로 보고,
+    스키마/권한/제약 조건 오류 등 코드가 있는 나머지 오류는 재시도하지 않습니다.
+    코드가 없는 오류는 전송 계층 예외(TRANSIENT_EXCEPTIONS: httpx 전송 오류/타임아웃, ConnectionError, OSError)만
+    일시적인 오류로 보고, 그 밖의 예외(코드 버그 등)는 재시도하지 않습니다.
+    """
+    code = getattr(error, 'code', None)
+    if code is None:
+        return isinstance(error, TRANSIENT_EXCEPTIONS)
+    code = str(code)
+    return code.startswith('PGRST0') or (len(code) == 3 and code.startswith('5')) or code in TRANSIENT_SQLSTATES
+
+
+class CircuitBreaker:
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        """failure_threshold: 회로를 여는 연속 실패 횟수, reset_timeout: 열린 회로를 시험해 볼 때까지의 시간(초)"""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        """회로가 열려 있는지 여부 (시험 요청을 보낼 수 있는 상태 포함)"""
+        return self.opened_at is not None
+
+    def allow(self):
+        """요청을 보내도 되는지 여부 (열린 회로는 reset_timeout이 지나면 요청 하나만 시험으로 허용)"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._trial_in_progress or time.time() - self.opened_at < self.reset_timeout:
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def record_success(self):
+        """요청 성공 (또는 서버가 응답한 일시적이지 않은 오류) - 회로를 닫음"""
+        with self._lock:
+            if self.opened_at is not None:
+                print(f"[INFO] '{self.name}' 연결 복구, 회로 차단 해제")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        """일시적인 오류로 요청 실패 - 연속 실패가 기준을 넘거나 시험 요청이 실패하면 회로를 엶"""
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_progress or (self.opened_at is None and self.failures >= self.failure_threshold):
+                print(f"[ERROR] '{self.name}' 요청 {self.failures}회 연속 실패, {self.reset_timeout}초 동안 회로 차단")
+                self.opened_at = time.time()
+                self._trial_in_progress = False
+
+
+# 연결 대상별 회로 차단기 (이름 -> CircuitBreaker)
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name):
+    """이름(연결 URL 등)에 해당하는 공유 회로 차단기 반환 (없으면 생성)
+
+    연속 실패 횟수와 차단 시간은 SUPABASE_BREAKER_FAILURES, SUPABASE_BREAKER_RESET 환경 변수로 조정합니다.
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=int(os.getenv('SUPABASE_BREAKER_FAILURES', '5')),
+                reset_timeout=int(os.getenv('SUPABASE_BREAKER_RESET', '30'))
+            )
+            _circuit_breakers[name] = breaker
+        return breaker
+
+
+def call_with_retry(fn, policy, breaker=None, label=''):
+    """fn()을 재시도 정책과 회로 차단기를 적용하여 실행하고 결과 반환
+
+    회로가 열려 있으면 바로 CircuitOpenError, 재시도할 수 없거나 시도 횟수/시간 예산을 모두 쓰면 마지막 예외를 발생시킵니다.
+    """
+    started = time.time()
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"'{breaker.name}' 회로 차단 중 - 요청을 보내지 않음: {label}")
+        # 열린 회로에서 허용된 요청은 시험 요청 (어떤 결과로 끝나든 성공/실패를 기록해야 다음 요청을 보낼 수 있음)
+        trial = breaker is not None and breaker.is_open
+        try:
+            result = fn()
+        except Exception as e:
+            transient = is_transient_error(e)
+            if breaker is not None:
+                # 코드가 있는 일시적이지 않은 오류는 서버가 응답한 것이므로 연결 실패로 세지 않음
+                # 코드가 없는 그 밖의 예외는 서버 응답 여부를 알 수 없으므로 회로 상태를 바꾸지 않고,
+                # 시험 요청이었다면 실패로 처리 (회로를 다시 열고 reset_timeout 후 다시 시험)
+                if transient or (trial and getattr(e, 'code', None) is None):
+                    breaker.record_failure()
+                elif getattr(e, 'code', None) is not None:
+                    breaker.record_success()
+            attempt += 1
+            delay = policy.delay(attempt - 1)
+            if (not transient or attempt >= policy.attempts or time.time() - started + delay > policy.budget
+                    or (breaker is not None and breaker.is_open)):
+                raise
+            print(f"[DEBUG] 요청 실패, {delay:.2f}초 후 재시도 ({attempt}/{policy.attempts - 1}): {label}, {e}")
+            time.sleep(delay)
+            continue
+        except BaseException:
+            # 중단(KeyboardInterrupt 등)된 시험 요청도 끝난 것으로 기록
+            if trial:
+                breaker.record_failure()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -0,0 +1,536 @@
+"""
+로컬 SQLite 파일을 사용하는 StorageBackend 구현
+
+Supabase 없이 공장을 운영하거나(STORAGE_BACKEND=sqlite), Supabase 데이터를 로컬에 복제해 두고 빠르게 조회할 때 사용합니다.
+테이블 구조는 데이터 동기화 페이지의 SQL 스크립트와 같고, 생산 실적은 날짜 및 작업자/라인/모델별 날짜 인덱스로
+기간 조회와 집계(GROUP BY)를 DB 안에서 처리합니다.
+WAL 모드와 스레드별 연결을 사용하므로 여러 Streamlit 세션이 같은 파일을 동시에 사용해도 안전합니다.
+"""
+import os
+import sqlite3
+import threading
+from utils.storage_backend import StorageBackend, PRODUCTION_FIELDS, PRODUCTION_QUANTITY_FIELDS, PRODUCTION_NATURAL_KEY, PRODUCTION_WRITE_CHUNK_SIZE
+
+
+class SQLiteBackend(StorageBackend):
+    # 테이블 이름 -> 쓰기 가능한 컬럼 목록 (update 시 허용되는 필드)
+    TABLE_COLUMNS = {
+        'Users': ['이메일', '비밀번호', '이름', '권한'],
+        'Workers': ['사번', '이름', '부서', '라인번호'],
+        'Model': ['model', 'process'],
+        'Production': ['날짜', '작업자', '라인번호', '모델차수', '목표수량', '생산수량', '불량수량', '특이사항']
+    }
+
+    # 집계 기준 -> SQL 식
+    SUMMARY_EXPRESSIONS = {
+        '날짜': '날짜',
+        '연도': 'CAST(substr(날짜, 1, 4) AS INTEGER)',
+        '월': 'CAST(substr(날짜, 6, 2) AS INTEGER)',
+        '작업자': '작업자',
+        '라인번호': '라인번호',
+        '모델차수': '모델차수'
+    }
+
+    def __init__(self, path='data/production.db', natural_key_unique=True):
+        """natural_key_unique: 생산 실적 자연 키 고유 인덱스 사용 여부
+        (원격 데이터를 그대로 복제하는 복제본은 False - Supabase 테이블은 같은 자연 키의 행을 허용할 수 있음)
+        """
+        self.path = path
+        self.natural_key_unique = natural_key_unique
+        self.page_size = 1000
+        self._local = threading.local()
+
+        # 데이터 디렉토리 생성
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._ensure_tables()
+        print(f"[INFO] 로컬 SQLite 저장소 사용: {path}")
+
+    def _connect(self):
+        """스레드별 SQLite 연결 반환 (Streamlit 세션은 서로 다른 스레드에서 실행됨)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_tables(self):
+        """테이블과 인덱스 생성 (이미 있으면 그대로 사용)"""
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS Users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                이메일 TEXT UNIQUE NOT NULL,
+                이름 TEXT NOT NULL,
+                비밀번호 TEXT NOT NULL,
+                권한 TEXT NOT NULL DEFAULT 'user',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS Workers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                사번 TEXT NOT NULL,
+                이름 TEXT NOT NULL,
+                부서 TEXT NOT NULL DEFAULT 'CNC',
+                라인번호 TEXT NOT NULL DEFAULT '',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS Model (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model TEXT NOT NULL,
+                process TEXT NOT NULL DEFAULT '',
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS Production (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                날짜 TEXT NOT NULL,
+                작업자 TEXT NOT NULL,
+                라인번호 TEXT NOT NULL,
+                모델차수 TEXT NOT NULL,
+                목표수량 INTEGER NOT NULL DEFAULT 0,
+                생산수량 INTEGER NOT NULL DEFAULT 0,
+                불량수량 INTEGER NOT NULL DEFAULT 0,
+                특이사항 TEXT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE INDEX IF NOT EXISTS idx_workers_name ON Workers (이름);
+            CREATE INDEX IF NOT EXISTS idx_production_date ON Production (날짜);
+            CREATE INDEX IF NOT EXISTS idx_production_worker_date ON Production (작업자, 날짜);
+            CREATE INDEX IF NOT EXISTS idx_production_line_date ON Production (라인번호, 날짜);
+            CREATE INDEX IF NOT EXISTS idx_production_model_date ON Production (모델차수, 날짜);
+        """)
+
+        # 자연 키 유니크 인덱스 (upsert_production_records의 ON CONFLICT 대상) - 주 저장소로 사용할 때만
+        # 기존 파일에 같은 자연 키의 행이 이미 있으면 만들 수 없으므로 중복을 정리할 때까지 인덱스 없이 사용
+        if not self.natural_key_unique:
+            conn.execute("DROP INDEX IF EXISTS idx_production_natural_key")
+            self.natural_key_index = False
+            return
+        try:
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_production_natural_key ON Production ({', '.join(PRODUCTION_NATURAL_KEY)})")
+            self.natural_key_index = True
+        except sqlite3.IntegrityError as e:
+            print(f"[ERROR] 생산 실적 자연 키 인덱스 생성 실패 (중복 행 정리 필요): {e}")
+            self.natural_key_index = False
+
+    def _query(self, sql, params=()):
+        """SELECT 실행 결과를 컬럼명 딕셔너리 목록으로 반환"""
+        cursor = self._connect().execute(sql, params)
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def _execute(self, sql, params=()):
+        """쓰기 쿼리 실행, 변경된 행 수 반환"""
+        return self._connect().execute(sql, params).rowcount
+
+    def _update_row(self, table, data, where_column, where_value):
+        """허용된 컬럼만 골라 UPDATE 실행, 변경된 행 수 반환"""
+        columns = [column for column in data if column in self.TABLE_COLUMNS[table]]
+        if not columns:
+            print(f"[ERROR] {table} 업데이트할 필드가 없음: {list(data.keys())}")
+            return 0
+        assignments = ', '.join(f"{column} = ?" for column in columns)
+        return self._execute(
+            f"UPDATE {table} SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE {where_column} = ?",
+            [data[column] for column in columns] + [where_value]
+        )
+
+    # 복제/복원용 메서드 (id를 그대로 유지)
+    def upsert_rows(self, table, rows):
+        """id를 유지한 채 행을 추가하거나 같은 id의 행을 수정, 저장한 행 수 반환
+
+        TABLE_COLUMNS와 id/created_at/updated_at 중 첫 번째 행에 있는 필드만 저장합니다.
+        id 기준 ON CONFLICT만 사용하므로 다른 id의 행을 지우지 않습니다 (다른 고유 제약 조건에 걸리면 배치 전체가 실패).
+        """
+        if not rows:
+            return 0
+        columns = [column for column in ['id'] + self.TABLE_COLUMNS[table] + ['created_at', 'updated_at'] if column in rows[0]]
+        placeholders = ', '.join('?' * len(columns))
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in columns if column != 'id')
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (id) DO UPDATE SET {assignments}",
+                [[row.get(column) for column in columns] for row in rows]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount
+
+    def delete_rows(self, table, ids):
+        """id 목록의 행 삭제, 삭제된 행 수 반환"""
+        ids = list(ids)
+        removed = 0
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 삭제
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            removed += self._execute(f"DELETE FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        return removed
+
+    def get_rows_by_ids(self, table, ids):
+        """id 목록의 행을 {id: 행} 딕셔너리로 조회"""
+        ids = list(ids)
+        rows = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            for row in self._query(f"SELECT * FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk):
+                rows[row['id']] = row
+        return rows
+
+    def get_ids(self, table):
+        """테이블의 전체 id 집합"""
+        return {row[0] for row in self._connect().execute(f"SELECT id FROM {table}")}
+
+    def count_rows(self, table):
+        """테이블의 행 수"""
+        return self._connect().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    # 사용자 관련 메서드
+    def get_all_users(self, use_cache=True):
+        """사용자 정보 조회"""
+        try:
+            return self._query("SELECT id, 이메일, 비밀번호, 이름, 권한 FROM Users ORDER BY id")
+        except Exception as e:
+            print(f"[ERROR] 사용자 조회 중 오류 발생: {e}")
+            return []
+
+    def get_user(self, email):
+        """이메일로 사용자 정보 조회"""
+        try:
+            users = self._query("SELECT id, 이메일, 비밀번호, 이름, 권한 FROM Users WHERE 이메일 = ?", (email,))
+            return users[0] if users else None
+        except Exception as e:
+            print(f"[ERROR] 사용자 조회 중 오류 발생: {e}")
+            return None
+
+    def add_user(self, email, password, name, role):
+        """사용자 추가"""
+        try:
+            self._execute("INSERT INTO Users (이메일, 비밀번호, 이름, 권한) VALUES (?, ?, ?, ?)", (email, password, name, role))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 사용자 추가 중 오류 발생: {e}")
+            return False
+
+    def update_user(self, email, data):
+        """사용자 정보 업데이트"""
+        try:
+            self._update_row('Users', data, '이메일', email)
+            return True
+        except Exception as e:
+            print(f"[ERROR] 사용자 업데이트 중 오류 발생: {e}")
+            return False
+
+    def update_user_password(self, email, password):
+        """사용자 비밀번호 업데이트"""
+        return self.update_user(email, {'비밀번호': password})
+
+    def delete_user(self, email):
+        """사용자 삭제"""
+        try:
+            self._execute("DELETE FROM Users WHERE 이메일 = ?", (email,))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 사용자 삭제 중 오류 발생: {e}")
+            return False
+
+    # 작업자 관련 메서드
+    def get_workers(self, use_cache=True):
+        """전체 작업자 데이터 조회"""
+        try:
+            return self._query("SELECT id, 사번, 이름, 부서, 라인번호 FROM Workers ORDER BY id")
+        except Exception as e:
+            print(f"[ERROR] 작업자 조회 중 오류 발생: {e}")
+            return []
+
+    def add_worker(self, employee_id, name, department, line_number):
+        """작업자 추가"""
+        try:
+            self._execute("INSERT INTO Workers (사번, 이름, 부서, 라인번호) VALUES (?, ?, ?, ?)",
+                          (employee_id, name, department, line_number))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 작업자 추가 중 오류 발생: {e}")
+            return False
+
+    def update_worker(self, old_name, new_name, new_id, new_line):
+        """작업자 정보 업데이트 (부서는 유지)"""
+        try:
+            workers = self._query("SELECT id FROM Workers WHERE 이름 = ? ORDER BY id LIMIT 1", (old_name,))
+            if not workers:
+                print(f"[ERROR] 이름으로 작업자를 찾을 수 없음: {old_name}")
+                return False
+            self._update_row('Workers', {'이름': new_name, '사번': new_id, '라인번호': new_line}, 'id', workers[0]['id'])
+            return True
+        except Exception as e:
+            print(f"[ERROR] 작업자 업데이트 중 오류 발생: {e}")
+            return False
+
+    def delete_worker(self, worker_name):
+        """작업자 삭제"""
+        try:
+            workers = self._query("SELECT id FROM Workers WHERE 이름 = ? ORDER BY id LIMIT 1", (worker_name,))
+            if not workers:
+                print(f"[ERROR] 삭제할 작업자를 찾을 수 없음: {worker_name}")
+                return False
+            self._execute("DELETE FROM Workers WHERE id = ?", (workers[0]['id'],))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 작업자 삭제 중 오류 발생: {e}")
+            return False
+
+    # 모델 관련 메서드
+    def get_all_models(self, use_cache=True):
+        """모델 정보 조회"""
+        try:
+            return self._query("SELECT id, model AS 모델명, process AS 공정 FROM Model ORDER BY id")
+        except Exception as e:
+            print(f"[ERROR] 모델 조회 중 오류 발생: {e}")
+            return []
+
+    def add_model(self, model_name, process):
+        """모델 추가"""
+        try:
+            self._execute("INSERT INTO Model (model, process) VALUES (?, ?)", (model_name, process))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 모델 추가 중 오류 발생: {e}")
+            return False
+
+    def update_model(self, model_id, data):
+        """모델 정보 업데이트"""
+        try:
+            field_mapping = {'모델명': 'model', '공정': 'process'}
+            update_data = {field_mapping[k]: v for k, v in data.items() if k in field_mapping}
+            self._update_row('Model', update_data, 'id', model_id)
+            return True
+        except Exception as e:
+            print(f"[ERROR] 모델 업데이트 중 오류 발생: {e}")
+            return False
+
+    def delete_model(self, model_id):
+        """모델 삭제"""
+        try:
+            self._execute("DELETE FROM Model WHERE id = ?", (model_id,))
+            return True
+        except Exception as e:
+            print(f"[ERROR] 모델 삭제 중 오류 발생: {e}")
+            return False
+
+    # 생산 실적 관련 메서드
+    def _production_where(self, start_date=None, end_date=None, filters=None):
+        """생산 실적 조회 조건(WHERE 절)과 인자 생성"""
+        conditions = []
+        params = []
+        if start_date:
+            conditions.append("날짜 >= ?")
+            params.append(str(start_date)[:10])
+        if end_date:
+            conditions.append("날짜 <= ?")
+            params.append(str(end_date)[:10])
+        for column, value in (filters or {}).items():
+            conditions.append(f"{column} = ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def _production_select(self, columns=None, filter_fields=()):
+        """조회할 컬럼 목록 - columns가 주어지면 해당 필드와 id, 조건 필드만"""
+        if not columns:
+            return list(PRODUCTION_FIELDS)
+        wanted = {'id'} | set(columns) | set(filter_fields)
+        return [field for field in PRODUCTION_FIELDS if field in wanted]
+
+    def iter_production_pages(self, start_date=None, end_date=None, worker=None, line=None, model=None, parallel=False, columns=None):
+        """생산 실적을 id 커서(keyset) 페이지 단위로 반환하는 제너레이터 (parallel은 무시)"""
+        filters = {field: value for field, value in (('작업자', worker), ('라인번호', line), ('모델차수', model)) if value}
+        select = ', '.join(self._production_select(columns, filters.keys()))
+        where, params = self._production_where(start_date, end_date, filters)
+        cursor_condition = (" AND " if where else " WHERE ") + "id > ?"
+
+        last_id = 0
+        while True:
+            page = self._query(
+                f"SELECT {select} FROM Production{where}{cursor_condition} ORDER BY id LIMIT ?",
+                params + [last_id, self.page_size]
+            )
+            if not page:
+                break
+            yield page
+            if len(page) < self.page_size:
+                break
+            last_id = page[-1]['id']
+
+    def get_production_records(self, start_date, end_date, worker=None, line=None, model=None, parallel=False, columns=None):
+        """생산 실적 조회 (날짜/조건 인덱스 사용)"""
+        try:
+            records = []
+            for page in self.iter_production_pages(start_date, end_date, worker, line, model, columns=columns):
+                records.extend(page)
+            print(f"[DEBUG] 로컬 생산 실적 조회: {start_date} ~ {end_date}, {len(records)}개")
+            return records
+        except Exception as e:
+            print(f"[ERROR] 생산 실적 조회 중 오류 발생: {e}")
+            import traceback
+            print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+            return None
+
+    def add_production_record(self, date, worker, line_number, model, target_quantity,
+                              production_quantity, defect_quantity, note):
+        """생산 실적 추가"""
+        try:
+            self._execute(
+                "INSERT INTO Production (날짜, 작업자, 라인번호, 모델차수, 목표수량, 생산수량, 불량수량, 특이사항) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(date)[:10], worker, line_number, model, target_quantity, production_quantity, defect_quantity, note)
+            )
+            return True
+        except Exception as e:
+            print(f"[ERROR] 생산 실적 추가 중 오류 발생: {e}")
+            return False
+
+    def add_production_records(self, rows, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """생산 실적 여러 건을 chunk_size개씩 하나의 트랜잭션으로 추가, 청크별 결과 목록 반환"""
+        columns = self.TABLE_COLUMNS['Production']
+        sql = f"INSERT INTO Production ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        results = self._write_chunks(sql, columns, self._production_write_rows(rows), chunk_size)
+        self._write_results_summary('생산 실적 일괄 추가', results)
+        return results
+
+    def upsert_production_records(self, rows, on_conflict='id', chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """on_conflict 컬럼 값이 같은 행은 수정하고 없으면 추가, 청크별 결과 목록 반환"""
+        keys, valid_rows, skipped = self._split_upsert_rows(rows, on_conflict)
+        columns = (['id'] if 'id' in keys else []) + self.TABLE_COLUMNS['Production']
+        assignments = ', '.join(f"{column} = excluded.{column}" for column in columns if column not in keys)
+        sql = (f"INSERT INTO Production ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+               f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {assignments}, updated_at = CURRENT_TIMESTAMP")
+
+        results = []
+        if skipped:
+            print(f"[ERROR] {on_conflict} 값이 없는 생산 실적 {skipped}건은 upsert에서 제외")
+            results.append({'chunk': None, 'rows': skipped, 'success': False, 'error': f"{on_conflict} 값이 없음"})
+        results += self._write_chunks(sql, columns, self._production_write_rows(valid_rows, keep_id='id' in keys), chunk_size)
+        self._write_results_summary('생산 실적 일괄 upsert', results)
+        return results
+
+    def delete_production_records(self, record_ids, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """id 목록의 생산 실적을 chunk_size개씩 하나의 트랜잭션으로 삭제, 청크별 결과 목록 반환"""
+        results = self._write_chunks("DELETE FROM Production WHERE id = ?", ['id'],
+                                     [{'id': record_id} for record_id in record_ids], chunk_size)
+        self._write_results_summary('생산 실적 일괄 삭제', results)
+        return results
+
+    def supports_natural_key_upsert(self):
+        """자연 키 고유 인덱스(idx_production_natural_key)가 만들어졌는지 여부"""
+        return self.natural_key_index
+
+    def _write_chunks(self, sql, columns, rows, chunk_size):
+        """행 목록을 chunk_size개씩 트랜잭션 하나로 실행, 청크별 결과 목록 반환"""
+        conn = self._connect()
+        results = []
+        for index, start in enumerate(range(0, len(rows), chunk_size)):
+            chunk = rows[start:start + chunk_size]
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(sql, [[row[column] for column in columns] for row in chunk])
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                results.append({'chunk': index, 'rows': len(chunk), 'success': True, 'error': None})
+            except Exception as e:
+                print(f"[ERROR] 생산 실적 일괄 쓰기 중 오류 발생 (청크 {index + 1}): {e}")
+                results.append({'chunk': index, 'rows': len(chunk), 'success': False, 'error': str(e)})
+        return results
+
+    def update_production_record(self, record_id, data):
+        """생산 실적 업데이트"""
+        try:
+            if '날짜' in data:
+                data = dict(data, 날짜=str(data['날짜'])[:10])
+            if not self._update_row('Production', data, 'id', record_id):
+                print(f"[ERROR] 업데이트할 레코드를 찾을 수 없음: {record_id}")
+                return False
+            return True
+        except Exception as e:
+            print(f"[ERROR] 생산 실적 업데이트 중 오류 발생: {e}")
+            return False
+
+    def delete_production_record(self, record_id):
+        """생산 실적 삭제"""
+        try:
+            if not self._execute("DELETE FROM Production WHERE id = ?", (record_id,)):
+                print(f"[ERROR] 해당 ID의 레코드를 찾을 수 없음: {record_id}")
+                return False
+            return True
+        except Exception as e:
+            print(f"[ERROR] 레코드 삭제 중 오류 발생: {e}")
+            return False
+
+    def get_production_summary(self, start_date, end_date, group_by=None, filters=None):
+        """기간 내 생산 실적 합계를 group_by 필드별로 SQL GROUP BY로 집계"""
+        group_by, filters = self._summary_arguments(group_by, filters)
+        where, params = self._production_where(start_date, end_date, filters)
+        group_columns = [f"{self.SUMMARY_EXPRESSIONS[field]} AS {field}" for field in group_by]
+        sums = [f"SUM({field}) AS {field}" for field in PRODUCTION_QUANTITY_FIELDS]
+        sql = f"SELECT {', '.join(group_columns + sums)} FROM Production{where}"
+        if group_by:
+            positions = ', '.join(str(i + 1) for i in range(len(group_by)))
+            sql += f" GROUP BY {positions} ORDER BY {positions}"
+        else:
+            # 조건에 맞는 행이 없으면 빈 결과 (합계 NULL 한 행 대신)
+            sql += " HAVING COUNT(*) > 0"
+
+        try:
+            rows = self._query(sql, params)
+        except Exception as e:
+            print(f"[ERROR] 생산 실적 집계 중 오류 발생: {e}")
+            rows = []
+        return self._production_summary_frame(rows, group_by)
+
+    # 연결 확인 및 초기화 메서드
+    def is_connected(self):
+        """데이터베이스 파일을 열 수 있는지 여부"""
+        try:
+            self._query("SELECT 1")
+            return True
+        except Exception as e:
+            print(f"[ERROR] SQLite 연결 확인 중 오류 발생: {e}")
+            return False
+
+    def _delete_all(self, sql, label, params=()):
+        """전체 삭제 쿼리 실행"""
+        try:
+            removed = self._execute(sql, params)
+            print(f"[INFO] {label} 완료 ({removed}행)")
+            return True
+        except Exception as e:
+            print(f"[ERROR] {label} 중 오류 발생: {e}")
+            return False
+
+    def delete_all_production(self):
+        """생산 실적 전체 삭제"""
+        return self._delete_all("DELETE FROM Production", '생산 실적 전체 삭제')
+
+    def delete_all_models(self):
+        """모델 전체 삭제"""
+        return self._delete_all("DELETE FROM Model", '모델 전체 삭제')
+
+    def delete_all_workers(self):
+        """작업자 전체 삭제"""
+        return self._delete_all("DELETE FROM Workers", '작업자 전체 삭제')
+
+    def delete_all_users(self, keep_role='관리자'):
+        """keep_role 권한을 제외한 사용자 전체 삭제"""
+        return self._delete_all("DELETE FROM Users WHERE 권한 != ?", '사용자 전체 삭제', (keep_role,))
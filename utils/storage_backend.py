@@ -0,0 +1,293 @@
+"""
+생산 관리 데이터 저장소(백엔드) 공통 인터페이스
+
+사용자/작업자/모델/생산 실적 CRUD와 기간 조회, 집계를 StorageBackend 하나의 인터페이스로 정의합니다.
+페이지는 get_db()로 현재 세션의 백엔드를 가져오며, 사용할 백엔드는 STORAGE_BACKEND 환경 변수로 선택합니다.
+  - supabase (기본값): Supabase(PostgREST) + 로컬 캐시 (utils/supabase_db.py)
+  - sqlite: 인덱스가 있는 로컬 SQLite 파일 (utils/sqlite_backend.py) - 오프라인 운영 및 로컬 성능 테스트용
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+import pandas as pd
+from dotenv import load_dotenv
+import streamlit as st
+
+# 환경 변수 로드 (STORAGE_BACKEND 등)
+load_dotenv()
+
+# 세션 간에 공유하는 전체 생산 실적 데이터셋의 조회 기간
+PRODUCTION_DATASET_RANGE = ('2020-01-01', '2030-12-31')
+
+# 생산 실적 결과 필드 (get_production_frame의 컬럼 순서 및 타입 지정용)
+PRODUCTION_FIELDS = ['id', '날짜', '작업자', '라인번호', '모델차수', '목표수량', '생산수량', '불량수량', '특이사항']
+PRODUCTION_QUANTITY_FIELDS = ['목표수량', '생산수량', '불량수량']
+PRODUCTION_CATEGORY_FIELDS = ['작업자', '라인번호', '모델차수']
+
+# 생산 실적 자연 키 (백업 복원 시 같은 행을 찾는 기준, upsert의 on_conflict 필드)
+PRODUCTION_NATURAL_KEY = ['날짜', '작업자', '모델차수', '라인번호']
+
+# 생산 실적 일괄 추가/upsert 시 한 번에 보내는 행 수 기본값
+PRODUCTION_WRITE_CHUNK_SIZE = 500
+
+# get_production_summary에서 사용할 수 있는 집계 기준 ('연도'/'월'은 날짜의 연도/월 숫자)
+PRODUCTION_SUMMARY_GROUPS = ['날짜', '연도', '월', '작업자', '라인번호', '모델차수']
+
+
+def create_storage_backend(name=None):
+    """STORAGE_BACKEND 환경 변수(또는 name)에 맞는 백엔드 인스턴스 생성"""
+    name = (name or os.getenv('STORAGE_BACKEND', 'supabase')).strip().lower()
+    if name == 'sqlite':
+        from utils.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(os.getenv('SQLITE_DB_PATH', 'data/production.db'))
+
+    if name != 'supabase':
+        print(f"[ERROR] 알 수 없는 STORAGE_BACKEND '{name}', supabase 백엔드 사용")
+    from utils.supabase_db import SupabaseDB
+    return SupabaseDB()
+
+
+def get_db():
+    """현재 세션의 백엔드 인스턴스 반환 (없으면 생성하여 세션 상태에 저장)
+
+    세션별 상태(스키마 확인 결과 등)는 인스턴스마다 따로 유지되며, 클라이언트와 캐시 저장소만 프로세스 전체에서 공유됩니다.
+    """
+    if 'db' not in st.session_state:
+        st.session_state.db = create_storage_backend()
+    return st.session_state.db
+
+
+class StorageBackend(ABC):
+    """생산 관리 데이터 저장소 인터페이스
+
+    레코드는 모두 한글 필드명 딕셔너리이며, 쓰기 메서드는 성공 여부(True/False)를 반환합니다.
+    """
+
+    # 사용자 관련 메서드
+    @abstractmethod
+    def get_all_users(self, use_cache=True):
+        """사용자 목록 조회 ({'id', '이메일', '비밀번호', '이름', '권한'} 목록)"""
+
+    @abstractmethod
+    def get_user(self, email):
+        """이메일로 사용자 조회 (없으면 None)"""
+
+    @abstractmethod
+    def add_user(self, email, password, name, role):
+        """사용자 추가"""
+
+    def create_user(self, email, password, name, role='user'):
+        """사용자 생성 (auth.py와의 호환성을 위한 메서드)"""
+        return self.add_user(email, password, name, role)
+
+    @abstractmethod
+    def update_user(self, email, data):
+        """사용자 정보 업데이트 (data: 한글 필드명 -> 값)"""
+
+    @abstractmethod
+    def update_user_password(self, email, password):
+        """사용자 비밀번호 업데이트"""
+
+    @abstractmethod
+    def delete_user(self, email):
+        """사용자 삭제"""
+
+    # 작업자 관련 메서드
+    @abstractmethod
+    def get_workers(self, use_cache=True):
+        """작업자 목록 조회 ({'id', '사번', '이름', '부서', '라인번호'} 목록)"""
+
+    @abstractmethod
+    def add_worker(self, employee_id, name, department, line_number):
+        """작업자 추가"""
+
+    @abstractmethod
+    def update_worker(self, old_name, new_name, new_id, new_line):
+        """이름으로 작업자를 찾아 이름/사번/라인번호 업데이트"""
+
+    @abstractmethod
+    def delete_worker(self, worker_name):
+        """이름으로 작업자 삭제"""
+
+    # 모델 관련 메서드
+    @abstractmethod
+    def get_all_models(self, use_cache=True):
+        """모델 목록 조회 ({'id', '모델명', '공정'} 목록)"""
+
+    @abstractmethod
+    def add_model(self, model_name, process):
+        """모델 추가"""
+
+    @abstractmethod
+    def update_model(self, model_id, data):
+        """모델 정보 업데이트 (data: '모델명'/'공정' -> 값)"""
+
+    @abstractmethod
+    def delete_model(self, model_id):
+        """모델 삭제"""
+
+    # 생산 실적 관련 메서드
+    @abstractmethod
+    def get_production_records(self, start_date, end_date, worker=None, line=None, model=None, parallel=False, columns=None):
+        """기간(YYYY-MM-DD)과 조건에 맞는 생산 실적 목록 조회 (id 순서)
+
+        columns에 결과 필드명 목록을 주면 해당 필드와 id, 조건 필드만 포함합니다.
+        조회에 실패하면 None, 결과가 없으면 빈 목록을 반환합니다.
+        """
+
+    @abstractmethod
+    def iter_production_pages(self, start_date=None, end_date=None, worker=None, line=None, model=None, parallel=False, columns=None):
+        """생산 실적을 페이지(레코드 목록) 단위로 반환하는 제너레이터 (id 순서, 백업 등 대량 조회용)"""
+
+    @abstractmethod
+    def add_production_record(self, date, worker, line_number, model, target_quantity,
+                              production_quantity, defect_quantity, note):
+        """생산 실적 추가"""
+
+    @abstractmethod
+    def add_production_records(self, rows, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """생산 실적 여러 건(한글 필드명 레코드 목록)을 chunk_size개씩 나눠 추가하고 청크별 결과 목록 반환
+
+        결과는 {'chunk': 청크 번호, 'rows': 행 수, 'success': 성공 여부, 'error': 오류 메시지} 목록입니다.
+        rows의 id는 무시합니다.
+        """
+
+    @abstractmethod
+    def upsert_production_records(self, rows, on_conflict='id', chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """on_conflict 필드(쉼표로 구분, 고유 제약 조건이 있어야 함) 값이 같은 행은 수정하고 없으면 추가, 청크별 결과 목록 반환
+
+        on_conflict 필드 값이 없는 행은 보내지 않고 실패한 결과('chunk'가 None)로 보고합니다.
+        """
+
+    @abstractmethod
+    def delete_production_records(self, record_ids, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """id 목록의 생산 실적을 chunk_size개씩 나눠 삭제하고 청크별 결과 목록 반환"""
+
+    def supports_natural_key_upsert(self):
+        """생산 실적을 자연 키(PRODUCTION_NATURAL_KEY)로 upsert할 수 있는지 여부
+
+        고유 인덱스가 있으면 True, 없으면 False, 확인할 수 없으면 None을 반환합니다.
+        """
+        return False
+
+    @abstractmethod
+    def update_production_record(self, record_id, data):
+        """생산 실적 업데이트 (data: 한글 필드명 -> 값)"""
+
+    @abstractmethod
+    def delete_production_record(self, record_id):
+        """생산 실적 삭제"""
+
+    @abstractmethod
+    def get_production_summary(self, start_date, end_date, group_by=None, filters=None):
+        """기간 내 목표/생산/불량수량 합계를 group_by 필드별로 집계한 DataFrame 반환
+
+        group_by는 PRODUCTION_SUMMARY_GROUPS 중 필드 목록이며, 없으면 전체 합계 한 행을 반환합니다.
+        filters에는 {'작업자'|'라인번호'|'모델차수': 값} 조건을 지정합니다.
+        """
+
+    def get_production_frame(self, start_date, end_date, worker=None, line=None, model=None, columns=None, parallel=False):
+        """생산 실적을 타입이 지정된 DataFrame으로 조회 (리포트 페이지용)"""
+        records = self.get_production_records(start_date, end_date, worker, line, model, parallel=parallel, columns=columns)
+        return self._production_records_to_frame(records, columns)
+
+    def get_production_dataset(self):
+        """전체 기간(PRODUCTION_DATASET_RANGE) 생산 실적 목록 반환"""
+        start_date, end_date = PRODUCTION_DATASET_RANGE
+        return self.get_production_records(start_date, end_date, parallel=True) or []
+
+    # 연결 확인 및 초기화 메서드 (데이터 관리 페이지용)
+    @abstractmethod
+    def is_connected(self):
+        """저장소를 사용할 수 있는지 여부"""
+
+    @abstractmethod
+    def delete_all_production(self):
+        """생산 실적 전체 삭제"""
+
+    @abstractmethod
+    def delete_all_models(self):
+        """모델 전체 삭제"""
+
+    @abstractmethod
+    def delete_all_workers(self):
+        """작업자 전체 삭제"""
+
+    @abstractmethod
+    def delete_all_users(self, keep_role='관리자'):
+        """keep_role 권한을 제외한 사용자 전체 삭제"""
+
+    # 캐시 관련 메서드 (캐시가 없는 백엔드는 아무 것도 하지 않음)
+    def _invalidate_cache(self, key=None):
+        """캐시 무효화 (key가 None이면 전체)"""
+
+    def _invalidate_tag(self, tag, dates=None):
+        """테이블 태그 단위 캐시 무효화"""
+
+    # 공통 변환 함수
+    def _production_records_to_frame(self, records, columns=None):
+        """한글 필드명 생산 실적 레코드 목록을 타입이 지정된 DataFrame으로 변환
+
+        날짜는 datetime64, 수량은 정수(int64), 작업자/라인번호/모델차수는 category 타입입니다.
+        """
+        if records:
+            frame = pd.DataFrame.from_records(list(records))
+        else:
+            frame = pd.DataFrame(columns=[field for field in PRODUCTION_FIELDS if not columns or field in columns or field == 'id'])
+
+        if '날짜' in frame:
+            frame['날짜'] = pd.to_datetime(frame['날짜'], errors='coerce')
+        for field in PRODUCTION_QUANTITY_FIELDS:
+            if field in frame:
+                frame[field] = pd.to_numeric(frame[field], errors='coerce').fillna(0).astype('int64')
+        for field in PRODUCTION_CATEGORY_FIELDS:
+            if field in frame:
+                frame[field] = frame[field].astype('category')
+        return frame
+
+    def _production_write_rows(self, rows, keep_id=False):
+        """일괄 쓰기용 생산 실적 행 목록 - 모든 행이 같은 필드를 갖도록 기본값을 채움
+
+        배열 insert/upsert는 모든 행의 필드가 같아야 하므로 날짜가 없으면 오늘, 수량은 0, 나머지는 빈 문자열로 채웁니다.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        write_rows = []
+        for row in rows:
+            item = {'id': row.get('id')} if keep_id else {}
+            item['날짜'] = str(row.get('날짜') or today)[:10]
+            for field in PRODUCTION_CATEGORY_FIELDS:
+                item[field] = row.get(field) or ''
+            for field in PRODUCTION_QUANTITY_FIELDS:
+                item[field] = row.get(field) or 0
+            item['특이사항'] = row.get('특이사항') or ''
+            write_rows.append(item)
+        return write_rows
+
+    def _split_upsert_rows(self, rows, on_conflict):
+        """upsert 대상 행을 on_conflict 필드 값이 있는 행과 없는 행 수로 나눔, (필드 목록, 행 목록, 제외된 행 수) 반환"""
+        keys = [key.strip() for key in on_conflict.split(',') if key.strip()]
+        valid = [row for row in rows if all(row.get(key) not in (None, '') for key in keys)]
+        return keys, valid, len(rows) - len(valid)
+
+    def _write_results_summary(self, label, results):
+        """청크별 결과 로그 출력"""
+        succeeded = sum(result['rows'] for result in results if result['success'])
+        failed = sum(result['rows'] for result in results if not result['success'])
+        print(f"[INFO] {label}: 성공 {succeeded}건, 실패 {failed}건 (청크 {len(results)}개)")
+
+    def _summary_arguments(self, group_by, filters):
+        """get_production_summary 인자 정리 - 지원하지 않는 집계 기준과 빈 조건 제외"""
+        group_by = list(group_by or [])
+        unknown = [field for field in group_by if field not in PRODUCTION_SUMMARY_GROUPS]
+        if unknown:
+            print(f"[ERROR] 지원하지 않는 집계 기준 제외: {unknown}")
+            group_by = [field for field in group_by if field in PRODUCTION_SUMMARY_GROUPS]
+        filters = {field: value for field, value in (filters or {}).items() if value and field in PRODUCTION_CATEGORY_FIELDS}
+        return group_by, filters
+
+    def _production_summary_frame(self, rows, group_by):
+        """집계 결과 행 목록을 group_by 필드와 정수 수량 컬럼으로 된 DataFrame으로 변환"""
+        summary = pd.DataFrame(rows or [], columns=group_by + PRODUCTION_QUANTITY_FIELDS)
+        for field in PRODUCTION_QUANTITY_FIELDS:
+            summary[field] = pd.to_numeric(summary[field], errors='coerce').fillna(0).astype('int64')
+        return summary
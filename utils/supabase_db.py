@@ -1,16 +1,81 @@
 import os
-import json
 import time
-import pandas as pd
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from supabase import create_client
 from dotenv import load_dotenv
 import streamlit as st
+from utils.cache_store import CacheStore
+from utils.replica_sync import get_replica
+from utils.resilience import RETRY_POLICIES, CircuitOpenError, call_with_retry, get_circuit_breaker, is_transient_error
+from utils.storage_backend import (
+    StorageBackend, PRODUCTION_DATASET_RANGE, PRODUCTION_QUANTITY_FIELDS, PRODUCTION_CATEGORY_FIELDS, PRODUCTION_WRITE_CHUNK_SIZE
+)
 
 # 환경 변수 로드
 load_dotenv()
 
-class SupabaseDB:
+# 프로세스 전체에서 공유하는 Supabase 클라이언트와 캐시 저장소
+# 모든 세션이 (URL, KEY)별 클라이언트 하나와 그 HTTP 연결 풀을 재사용하고, 테이블 확인 쿼리도 클라이언트당 한 번만 실행합니다.
+# app.py가 매 실행마다 st.cache_resource.clear()를 호출하므로 st.cache_resource 대신 모듈 수준에 보관합니다.
+_shared_clients = {}
+_shared_cache_stores = {}
+_shared_lock = threading.Lock()
+
+# 공유 클라이언트별 생산 실적 테이블 스키마 ((URL, KEY) -> 스키마) - 클라이언트를 새로 만들 때 다시 확인
+_production_schemas = {}
+
+# production_summary 함수(RPC)가 없는 것으로 확인된 클라이언트 ((URL, KEY) 집합) - 로컬 집계로 대체
+_production_summary_unavailable = set()
+
+# table_version 함수(RPC)가 없는 것으로 확인된 클라이언트 ((URL, KEY) 집합) - 테이블을 직접 조회하여 버전 확인
+_table_version_unavailable = set()
+
+# 생산 실적 자연 키 upsert 가능 여부를 확인한 클라이언트 ((URL, KEY) -> True/False) - 고유 인덱스가 있는지 한 번만 확인
+_natural_key_upsert_support = {}
+
+# updated_at 컬럼이 없는 것으로 확인된 테이블 ((URL, KEY, 테이블) 집합) - 행 수와 최대 id로만 버전 확인
+_tables_without_updated_at = set()
+
+# 데이터 버전 태그별 원본 테이블 (None이면 확인된 생산 실적 테이블)과 함께 갱신/무효화하는 캐시 태그
+VERSION_TABLES = {'production': None, 'users': 'Users', 'workers': 'Workers', 'models': 'Model'}
+VERSION_DEPENDENT_TAGS = {'production': ['production', 'production_summary']}
+
+# 만료된 캐시를 백그라운드에서 다시 조회하는 스레드 풀과 갱신 중인 키 (같은 키는 한 번에 하나만 갱신)
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='supabase-refresh')
+_refreshing_keys = set()
+
+# 진행 중인 조회 (키 -> Future) - 여러 세션의 같은 조회는 먼저 시작한 조회의 결과를 기다려 함께 사용
+_in_flight_requests = {}
+
+# 프로세스 전체에서 공유하는 생산 실적 데이터셋 (URL별)
+# {'snapshot': ProductionSnapshot, 'changes': [(변경 번호, 변경된 id 집합, 변경 후 레코드 목록), ...],
+#  'seq': 마지막 변경 번호, 'generation': 무효화될 때마다 증가}
+_production_datasets = {}
+
+# 생산 실적이 바뀔 때마다 증가하는 번호 (URL별)와, 조회 조건별로 만들어 둔 DataFrame (최근 사용 순)
+_production_generations = {}
+_production_frames = OrderedDict()
+_production_frames_limit = 32
+
+class ProductionSnapshot(tuple):
+    """여러 세션이 함께 참조하는 읽기 전용 생산 실적 스냅샷
+    
+    version은 데이터셋이 바뀔 때마다 증가하며, 쓰기 작업은 기존 스냅샷을 고치지 않고
+    바뀌지 않은 레코드를 그대로 공유하는 새 스냅샷을 만듭니다 (copy-on-write).
+    레코드는 여러 세션이 공유하므로 수정하지 말고, 필요하면 복사해서 사용해야 합니다.
+    """
+    def __new__(cls, records, version, created_at, applied_seq):
+        snapshot = super().__new__(cls, records)
+        snapshot.version = version
+        snapshot.created_at = created_at  # 원본(Supabase/캐시)에서 데이터셋을 만든 시각
+        snapshot.applied_seq = applied_seq  # 반영된 마지막 변경 번호
+        return snapshot
+
+class SupabaseDB(StorageBackend):
     def __init__(self):
         """초기화"""
         # 환경 변수 로드
@@ -31,27 +96,60 @@ class SupabaseDB:
         
         self.client = None
         
-        # 캐시 설정
-        self.cache_file = 'cache/supabase_cache.json'
-        self.cache = {}
-        self.cache_timeout = 30  # 캐시 유효 시간 (초) - 30초로 단축
+        # 요청 실패가 이어지면 일정 시간 동안 요청을 보내지 않고 캐시/로컬 데이터로 대체 (URL별로 프로세스 전체에서 공유)
+        self.breaker = get_circuit_breaker(self.url)
+        
+        # 페이지네이션 설정 (병렬 조회 시 동시 요청 수는 환경 변수로 조정 가능)
+        self.page_size = 1000
+        self.fetch_concurrency = int(os.getenv('SUPABASE_FETCH_CONCURRENCY', '4'))
         
-        # 캐시 디렉토리 생성
-        os.makedirs('cache', exist_ok=True)
+        # 캐시 설정 - 키 단위로 읽고 쓰는 SQLite 캐시 저장소
+        self.cache_file = 'cache/supabase_cache.db'
+        self.cache_timeout = 30  # 캐시 유효 시간 (초) - 30초로 단축 (오늘 이후 날짜의 생산 실적 파티션에도 적용)
+        self.past_cache_timeout = int(os.getenv('SUPABASE_PAST_CACHE_TIMEOUT', '21600'))  # 지난 날짜 생산 실적 파티션 유효 시간 (초)
+        # 만료 후 이 시간(초) 안의 캐시는 바로 반환하고 백그라운드에서 갱신 (0이면 만료 시 바로 다시 조회)
+        self.stale_timeout = int(os.getenv('SUPABASE_STALE_TIMEOUT', '300'))
+        # 이 시간(초)마다 테이블의 행 수/최대 id/최대 updated_at을 확인하여 바뀌지 않았으면 캐시를 계속 사용 (0이면 사용 안 함)
+        self.version_probe_interval = int(os.getenv('SUPABASE_VERSION_PROBE_INTERVAL', '5'))
+        with _shared_lock:
+            if self.cache_file not in _shared_cache_stores:
+                _shared_cache_stores[self.cache_file] = CacheStore(self.cache_file)
+            self.cache = _shared_cache_stores[self.cache_file]
         
-        # 캐시 로드
-        self._load_cache()
+        # 오래된 캐시 항목 자동 정리
+        self._cleanup_expired_cache()
         
         # 연결 초기화
         self._initialize_connection()
+        
+        # 로컬 복제본 (SUPABASE_REPLICA_PATH를 설정하지 않으면 None) - 최초 동기화가 끝나면 생산 실적 조회/집계를 복제본에서 처리
+        self.replica = get_replica(self)
     
     def _initialize_connection(self):
-        """Supabase 연결 초기화"""
+        """Supabase 연결 초기화
+        
+        프로세스 공유 클라이언트가 있으면 재사용하고, 없으면 생성하여 등록합니다.
+        이미 연결된 상태에서 다시 호출되면 (조회 실패 후 재연결) 현재 클라이언트를 새 클라이언트로 교체합니다.
+        """
         try:
-            print(f"[DEBUG] Supabase 연결 시도: URL={self.url[:10] if self.url else '없음'}..., KEY={self.key[:5] if self.key else '없음'}...")
-            self.client = create_client(self.url, self.key)
+            registry_key = (self.url, self.key)
+            with _shared_lock:
+                shared_client = _shared_clients.get(registry_key)
+                # 다른 세션이 이미 교체한 경우에는 그 클라이언트를 그대로 사용
+                if shared_client is not None and shared_client is not self.client:
+                    self.client = shared_client
+                    print(f"[DEBUG] 공유 Supabase 클라이언트 재사용")
+                    return
+                
+                print(f"[DEBUG] Supabase 연결 시도: URL={self.url[:10] if self.url else '없음'}..., KEY={self.key[:5] if self.key else '없음'}...")
+                self.client = create_client(self.url, self.key)
+                _shared_clients[registry_key] = self.client
+                _production_schemas.pop(registry_key, None)
+                _production_summary_unavailable.discard(registry_key)
+                _table_version_unavailable.discard(registry_key)
+                _natural_key_upsert_support.pop(registry_key, None)
             print(f"[INFO] Supabase 연결 성공")
-            # 초기 테이블 확인 및 생성
+            # 초기 테이블 확인 및 생성 (새 클라이언트를 만들 때만)
             self._ensure_tables()
         except Exception as e:
             print(f"[ERROR] Supabase 연결 초기화 중 오류 발생: {e}")
@@ -99,105 +197,328 @@ class SupabaseDB:
             import traceback
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
             
-    def _load_cache(self):
-        """캐시 파일 로드"""
+    def _cleanup_expired_cache(self):
+        """만료된 캐시 항목 정리"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    self.cache = {k: (v['time'], v['data']) for k, v in cache_data.items()}
-                # 오래된 캐시 항목 자동 정리
-                self._cleanup_expired_cache()
-                print(f"[DEBUG] 캐시 로드 완료: {len(self.cache)}개 항목")
-            else:
-                print(f"[DEBUG] 캐시 파일이 존재하지 않습니다: {self.cache_file}")
+            removed = self.cache.cleanup_expired(grace=self.stale_timeout)
+            if removed:
+                print(f"[DEBUG] 만료된 캐시 {removed}개 항목 정리")
         except Exception as e:
-            print(f"[ERROR] 캐시 로드 중 오류 발생: {e}")
-            import traceback
-            print(f"[DEBUG] 캐시 로드 중 상세 오류: {traceback.format_exc()}")
-            self.cache = {}
+            print(f"[ERROR] 캐시 정리 중 오류 발생: {e}")
     
-    def _cleanup_expired_cache(self):
-        """만료된 캐시 항목 정리"""
-        current_time = time.time()
-        expired_keys = []
+    def _get_cached_data(self, key, refresh=None):
+        """캐시된 데이터 조회
+        refresh가 주어지면 만료된 지 stale_timeout초 이내의 데이터도 바로 반환하고,
+        refresh()로 백그라운드에서 캐시를 갱신
+        """
+        try:
+            entry = self.cache.get_entry(key, self.stale_timeout if refresh else 0)
+        except Exception as e:
+            print(f"[ERROR] 캐시 조회 중 오류 발생: {e}")
+            return None
         
-        for key, (cache_time, _) in self.cache.items():
-            if current_time - cache_time > self.cache_timeout:
-                expired_keys.append(key)
+        if entry is None:
+            return None
         
-        for key in expired_keys:
-            del self.cache[key]
-            
-        if expired_keys:
-            print(f"[DEBUG] 만료된 캐시 {len(expired_keys)}개 항목 정리")
+        data, stale = entry
+        if stale:
+            print(f"[DEBUG] 만료된 캐시 반환 후 갱신: {key}")
+            self._refresh_in_background(key, refresh)
+        else:
+            print(f"[DEBUG] 캐시 히트: {key}")
+        return data
     
-    def _save_cache(self):
-        """캐시 파일 저장"""
+    def _single_flight(self, key, fetch):
+        """같은 키의 조회가 다른 세션(스레드)에서 진행 중이면 그 결과를 기다려 사용하고, 없으면 직접 조회
+        
+        기다린 쪽은 세션 간에 결과가 공유되지 않도록 레코드 복사본을 받습니다.
+        """
+        with _shared_lock:
+            future = _in_flight_requests.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                _in_flight_requests[key] = future
+        
+        if not owner:
+            print(f"[DEBUG] 진행 중인 동일 조회 결과 대기: {key}")
+            result = future.result()
+            if isinstance(result, list):
+                return [dict(item) if isinstance(item, dict) else item for item in result]
+            return result
+        
         try:
-            # 캐시 디렉토리 생성
-            os.makedirs('cache', exist_ok=True)
-            
-            cache_data = {k: {'time': v[0], 'data': v[1]} for k, v in self.cache.items()}
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False)
-            
-            # 캐시 파일이 너무 커지면 강제로 정리
-            if os.path.getsize(self.cache_file) > 5 * 1024 * 1024:  # 5MB 이상
-                print(f"[DEBUG] 캐시 파일이 너무 큽니다. 오래된 항목 정리")
-                self._cleanup_expired_cache()
+            result = fetch()
+            future.set_result(result)
+            return result
         except Exception as e:
-            print(f"[ERROR] 캐시 저장 중 오류 발생: {e}")
+            future.set_exception(e)
+            raise
+        finally:
+            with _shared_lock:
+                _in_flight_requests.pop(key, None)
     
-    def _get_cached_data(self, key):
-        """캐시된 데이터 조회"""
-        if key in self.cache:
-            cache_time, data = self.cache[key]
-            if time.time() - cache_time < self.cache_timeout:
-                print(f"[DEBUG] 캐시 히트: {key}")
-                return data
-            else:
-                # 만료된 캐시 제거
-                del self.cache[key]
-                print(f"[DEBUG] 만료된 캐시 제거: {key}")
-        return None
+    def _refresh_in_background(self, key, refresh):
+        """백그라운드 스레드에서 캐시 갱신 (같은 키의 갱신이 진행 중이면 건너뜀)
+        갱신 함수는 Streamlit 스크립트 밖에서 실행되므로 st.* 를 호출하지 않아야 함
+        """
+        with _shared_lock:
+            if key in _refreshing_keys:
+                print(f"[DEBUG] 이미 갱신 중인 캐시: {key}")
+                return
+            _refreshing_keys.add(key)
+        
+        def run():
+            try:
+                print(f"[DEBUG] 백그라운드 캐시 갱신 시작: {key}")
+                refresh()
+            except Exception as e:
+                print(f"[ERROR] 백그라운드 캐시 갱신 중 오류 발생: {key}, {e}")
+            finally:
+                with _shared_lock:
+                    _refreshing_keys.discard(key)
+        
+        _refresh_executor.submit(run)
     
-    def _set_cached_data(self, key, data):
-        """데이터 캐시 저장"""
-        self.cache[key] = (time.time(), data)
-        print(f"[DEBUG] 캐시 저장: {key}")
-        self._save_cache()
+    def _set_cached_data(self, key, data, tag=None, range_start=None, range_end=None, meta=None):
+        """데이터 캐시 저장 (tag: 원본 테이블, range_start/range_end: 캐시된 날짜 범위, meta: 조회 조건)"""
+        try:
+            self.cache.set(key, data, self.cache_timeout, tag=tag,
+                           range_start=self._date_key(range_start), range_end=self._date_key(range_end), meta=meta)
+            print(f"[DEBUG] 캐시 저장: {key}")
+        except Exception as e:
+            print(f"[ERROR] 캐시 저장 중 오류 발생: {e}")
     
     def _invalidate_cache(self, key=None):
         """캐시 무효화
         key가 None이면 모든 캐시를 무효화, 아니면 특정 키의 캐시만 무효화
         key에 prefix가 포함된 경우 해당 접두사로 시작하는 모든 캐시 항목 무효화
         """
-        if key is None:
-            print(f"[DEBUG] 모든 캐시 무효화 ({len(self.cache)}개 항목)")
-            self.cache = {}
-        elif key in self.cache:
-            print(f"[DEBUG] 캐시 무효화: {key}")
-            del self.cache[key]
-        else:
-            # 키가 접두사로 시작하는 모든 캐시 삭제
-            keys_to_delete = [k for k in self.cache.keys() if k.startswith(key)]
-            for k in keys_to_delete:
-                del self.cache[k]
-            if keys_to_delete:
-                print(f"[DEBUG] 접두사 '{key}'로 시작하는 캐시 {len(keys_to_delete)}개 무효화")
+        try:
+            if key is None:
+                self._drop_production_dataset()
+                # SQL 스크립트 실행 후 전체 캐시를 비우면 집계 함수(RPC)도 다시 확인
+                _production_summary_unavailable.discard((self.url, self.key))
+                _natural_key_upsert_support.pop((self.url, self.key), None)
+                self._request_replica_sync()
+                removed = self.cache.clear()
+                print(f"[DEBUG] 모든 캐시 무효화 ({removed}개 항목)")
+            else:
+                # 키 자체와 키로 시작하는 모든 캐시 삭제
+                removed = self.cache.delete_prefix(key)
+                if removed:
+                    print(f"[DEBUG] 접두사 '{key}'로 시작하는 캐시 {removed}개 무효화")
+        except Exception as e:
+            print(f"[ERROR] 캐시 무효화 중 오류 발생: {e}")
+    
+    def _invalidate_tag(self, tag, dates=None):
+        """테이블 태그 단위 캐시 무효화
+        dates가 주어지면 해당 날짜들을 범위에 포함하는 캐시 항목만 무효화하고,
+        날짜를 알 수 없으면(None 포함) 해당 테이블의 캐시 전체를 무효화
+        생산 실적 캐시를 무효화하면 공유 데이터셋도 다음 조회 시 다시 만들어지고, 같은 날짜의 집계 캐시도 함께 무효화됨
+        """
+        tags = [tag]
+        if tag == 'production':
+            self._drop_production_dataset()
+            tags.append('production_summary')
+        try:
+            dates = {self._date_key(d) for d in dates} if dates else {None}
+            if None in dates:
+                dates = {None}
+                if tag == 'production':
+                    # 어떤 행이 바뀌었는지 모르면 복제본도 삭제된 행까지 다시 확인
+                    self._request_replica_sync()
+            
+            removed = sum(self.cache.delete_tag(t, date) for t in tags for date in dates)
+            if removed:
+                target = ', '.join(sorted(d for d in dates if d)) or '전체'
+                print(f"[DEBUG] '{tag}' 캐시 {removed}개 무효화 (날짜: {target})")
+        except Exception as e:
+            print(f"[ERROR] 캐시 무효화 중 오류 발생: {e}")
+    
+    def _call(self, label, fn, policy='read'):
+        """Supabase 요청 fn()을 재시도 정책(RETRY_POLICIES)과 회로 차단기를 적용하여 실행
+        
+        일시적인 오류는 지수 백오프 + 지터로 기다린 뒤 다시 시도하며 (클라이언트는 다시 만들지 않음),
+        회로가 열려 있으면 요청을 보내지 않고 바로 CircuitOpenError를 발생시킵니다.
+        """
+        return call_with_retry(fn, RETRY_POLICIES[policy], self.breaker, label)
+    
+    def _cached_fallback(self, key):
+        """조회에 실패했을 때 사용할 캐시 데이터 (만료 여부와 관계없이, 없으면 빈 목록)"""
+        try:
+            entry = self.cache.get_entry(key, max_stale=float('inf'))
+        except Exception as e:
+            print(f"[ERROR] 캐시 조회 중 오류 발생: {e}")
+            return []
+        if entry is None:
+            return []
+        print(f"[INFO] 조회 실패로 캐시된 데이터 사용: {key}")
+        return entry[0]
+    
+    def _request_replica_sync(self):
+        """복제본이 있으면 다음 주기를 기다리지 않고 삭제 확인을 포함한 동기화 요청"""
+        replica = getattr(self, 'replica', None)
+        if replica is not None:
+            replica.request_sync(reconcile=True)
+    
+    def _replica_ready(self):
+        """생산 실적을 복제본에서 조회할 수 있는지 여부"""
+        replica = getattr(self, 'replica', None)
+        return replica is not None and replica.is_ready('Production')
+    
+    def _check_data_version(self, tag):
+        """태그의 원본 테이블 버전(행 수, 최대 id, 최대 updated_at)을 확인하여 캐시 유효성 판단
         
-        self._save_cache()
+        version_probe_interval초에 한 번만 (여러 세션/프로세스 중 한 곳에서) 확인합니다.
+        버전이 그대로이면 그 버전을 확인한 뒤에 만든 캐시 항목의 만료 시각을 연장하고,
+        바뀌었으면 (다른 프로세스의 쓰기) 해당 태그의 캐시를 모두 무효화합니다.
+        연장된 항목도 만든 지 past_cache_timeout초가 지나면 시간 기준으로 만료됩니다.
+        """
+        if not self.client or self.version_probe_interval <= 0:
+            return
+        try:
+            if not self.cache.claim_version_check(tag, self.version_probe_interval):
+                return
+            version = self._probe_data_version(tag)
+            if version is None:
+                return
+            
+            now = time.time()
+            state = self.cache.get_version(tag)
+            if state is None or state['version'] != version:
+                if state is not None:
+                    print(f"[INFO] '{tag}' 데이터 변경 감지 ({state['version']} -> {version}), 캐시 무효화")
+                    self._invalidate_tag(tag)
+                self.cache.set_version(tag, version, now)
+                return
+            
+            renewed = sum(self.cache.renew_tag(t, now + self.cache_timeout, max(state['since'], now - self.past_cache_timeout))
+                          for t in VERSION_DEPENDENT_TAGS.get(tag, [tag]))
+            if renewed:
+                print(f"[DEBUG] '{tag}' 데이터 변경 없음, 캐시 {renewed}개 유지")
+        except CircuitOpenError:
+            # 연결할 수 없는 동안에는 캐시를 그대로 사용
+            return
+        except Exception as e:
+            print(f"[ERROR] 데이터 버전 확인 중 오류 발생: {e}")
+    
+    def _probe_data_version(self, tag):
+        """원본 테이블의 [행 수, 최대 id, 최대 updated_at] 조회 (확인할 수 없으면 None)
+        
+        table_version 함수(RPC)가 있으면 요청 한 번으로, 없으면 행 수/최대 id와 최대 updated_at을 각각 조회합니다.
+        """
+        table_name = VERSION_TABLES[tag]
+        if table_name is None:
+            schema = self._resolve_production_table()
+            if not schema:
+                return None
+            table_name = schema['table']
+        
+        registry_key = (self.url, self.key)
+        if registry_key not in _table_version_unavailable:
+            try:
+                response = self._call('데이터 버전 확인', self.client.rpc('table_version', {'table_name': table_name}).execute, 'probe')
+                row = response.data[0] if response.data else {}
+                return [row.get('row_count'), row.get('max_id'), row.get('max_updated_at')]
+            except Exception as e:
+                message = str(e)
+                if isinstance(e, CircuitOpenError):
+                    raise
+                if 'PGRST202' in message or 'Could not find the function' in message:
+                    _table_version_unavailable.add(registry_key)
+                    print(f"[INFO] table_version 함수가 없어 테이블을 직접 조회하여 버전 확인 (데이터 동기화 페이지의 SQL 스크립트 참고)")
+                else:
+                    print(f"[ERROR] table_version 조회 중 오류 발생, 테이블 직접 조회로 대체: {e}")
+        
+        response = self._call('데이터 버전 확인', self.client.table(table_name).select('id', count='exact').order('id', desc=True).limit(1).execute, 'probe')
+        max_id = response.data[0].get('id') if response.data else None
+        max_updated_at = None
+        if (self.url, self.key, table_name) not in _tables_without_updated_at:
+            try:
+                latest = self._call('데이터 버전 확인', self.client.table(table_name).select('updated_at').not_.is_('updated_at', 'null')
+                                    .order('updated_at', desc=True).limit(1).execute, 'probe')
+                max_updated_at = latest.data[0].get('updated_at') if latest.data else None
+            except Exception as e:
+                if isinstance(e, CircuitOpenError) or is_transient_error(e):
+                    raise
+                _tables_without_updated_at.add((self.url, self.key, table_name))
+                print(f"[INFO] '{table_name}' 테이블의 updated_at을 조회할 수 없어 행 수와 최대 id로만 버전 확인: {e}")
+        return [response.count, max_id, max_updated_at]
+    
+    def _expect_data_version(self, tag, removed_ids, new_rows):
+        """이 앱에서 쓴 내용(원본 행)으로 다음 데이터 버전을 미리 계산하여 저장
+        
+        쓰기 결과는 이미 캐시에 반영되었으므로, 다음 버전 확인에서 다른 프로세스의 쓰기로 오인하여 캐시 전체를 무효화하지 않도록 합니다.
+        최대 id 행을 삭제한 경우처럼 계산할 수 없으면 알 수 없는 버전으로 기록합니다 (다음 확인 시 시간 기준 만료로 돌아감).
+        """
+        try:
+            state = self.cache.get_version(tag)
+            if state is None:
+                return
+            row_count, max_id, max_updated_at = state['version']
+            new_ids = {row.get('id') for row in new_rows}
+            added_ids = new_ids - set(removed_ids)
+            removed_ids = set(removed_ids) - new_ids
+            
+            if row_count is None or None in new_ids or None in removed_ids or (max_id is not None and any(i >= max_id for i in removed_ids)):
+                self.cache.set_version(tag, None)
+                return
+            
+            row_count += len(added_ids) - len(removed_ids)
+            if new_ids:
+                max_id = max([max_id or 0] + list(new_ids))
+            stamps = [row.get('updated_at') for row in new_rows if row.get('updated_at')]
+            if stamps:
+                max_updated_at = max([max_updated_at or ''] + stamps)
+            self.cache.set_version(tag, [row_count, max_id, max_updated_at], state['since'])
+        except Exception as e:
+            print(f"[ERROR] 데이터 버전 갱신 중 오류 발생: {e}")
+    
+    def _apply_cached_list_change(self, tag, removed_ids, new_items, rows=None):
+        """작업자/모델 목록 캐시에 변경 내용을 직접 반영 (removed_ids 항목 제거 후 new_items 추가)
+        
+        rows에는 변경 후 원본 행(PostgREST 응답)을 주며, 다음 데이터 버전 계산에 사용합니다.
+        """
+        self._expect_data_version(tag, removed_ids, rows if rows is not None else new_items)
+        removed_ids = set(removed_ids) | {item.get('id') for item in new_items}
+        
+        def apply(data, meta, range_start, range_end):
+            updated = [item for item in data if item.get('id') not in removed_ids]
+            updated.extend(new_items)
+            return updated
+        
+        try:
+            applied = self.cache.update_tag(tag, None, apply)
+            if applied:
+                print(f"[DEBUG] '{tag}' 캐시 {applied}개에 변경 내용 반영")
+        except Exception as e:
+            print(f"[ERROR] 캐시 반영 중 오류 발생: {e}")
+            self._invalidate_tag(tag)
+    
+    def _date_key(self, value):
+        """캐시 범위 비교용 날짜 문자열(YYYY-MM-DD)로 변환"""
+        if value is None or value == '':
+            return None
+        return str(value)[:10]
     
     # 사용자 관련 메서드
-    def get_all_users(self):
-        """사용자 정보 조회"""
+    def get_all_users(self, use_cache=True):
+        """사용자 정보 조회 (use_cache=False이면 캐시를 건너뛰고 조회하여 캐시 갱신)"""
         try:
-            cached_data = self._get_cached_data('users')
-            if cached_data:
-                return cached_data
+            if use_cache:
+                self._check_data_version('users')
+                fetch = lambda: self._single_flight('users', lambda: self.get_all_users(use_cache=False))
+                cached_data = self._get_cached_data('users', refresh=fetch)
+                if cached_data:
+                    return cached_data
+                return fetch()
             
-            response = self.client.table('Users').select('*').execute()
+            try:
+                response = self._call('사용자 조회', lambda: self.client.table('Users').select('*').execute())
+            except Exception as e:
+                print(f"[ERROR] 사용자 조회 중 오류 발생: {e}")
+                return self._cached_fallback('users')
             users = response.data
             
             # 필드명 매핑
@@ -211,7 +532,7 @@ class SupabaseDB:
                     '권한': user.get('권한', '')
                 })
             
-            self._set_cached_data('users', formatted_users)
+            self._set_cached_data('users', formatted_users, tag='users')
             return formatted_users
         except Exception as e:
             print(f"사용자 조회 중 오류 발생: {e}")
@@ -222,7 +543,7 @@ class SupabaseDB:
     def get_user(self, email):
         """이메일로 사용자 정보 조회"""
         try:
-            response = self.client.table('Users').select('*').eq('이메일', email).execute()
+            response = self._call('사용자 조회', self.client.table('Users').select('*').eq('이메일', email).execute, 'read')
             users = response.data
             
             if users and len(users) > 0:
@@ -241,10 +562,6 @@ class SupabaseDB:
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
             return None
     
-    def create_user(self, email, password, name, role='user'):
-        """사용자 생성 (auth.py와의 호환성을 위한 메서드)"""
-        return self.add_user(email, password, name, role)
-    
     def add_user(self, email, password, name, role):
         """사용자 추가"""
         try:
@@ -255,11 +572,11 @@ class SupabaseDB:
                 '권한': role
             }
             
-            response = self.client.table('Users').insert(data).execute()
+            response = self._call('사용자 추가', self.client.table('Users').insert(data).execute, 'write')
             print(f"[DEBUG] 사용자 추가 응답: {response}")
             
             # 캐시 무효화
-            self._invalidate_cache('users')
+            self._invalidate_tag('users')
             
             return True
         except Exception as e:
@@ -271,11 +588,11 @@ class SupabaseDB:
     def update_user(self, email, data):
         """사용자 정보 업데이트"""
         try:
-            response = self.client.table('Users').update(data).eq('이메일', email).execute()
+            response = self._call('사용자 수정', self.client.table('Users').update(data).eq('이메일', email).execute, 'write')
             print(f"[DEBUG] 사용자 업데이트 응답: {response}")
             
             # 캐시 무효화
-            self._invalidate_cache('users')
+            self._invalidate_tag('users')
             
             return True
         except Exception as e:
@@ -288,11 +605,11 @@ class SupabaseDB:
         """사용자 비밀번호 업데이트"""
         try:
             data = {'비밀번호': password}
-            response = self.client.table('Users').update(data).eq('이메일', email).execute()
+            response = self._call('사용자 수정', self.client.table('Users').update(data).eq('이메일', email).execute, 'write')
             print(f"[DEBUG] 사용자 비밀번호 업데이트 응답: {response}")
             
             # 캐시 무효화
-            self._invalidate_cache('users')
+            self._invalidate_tag('users')
             
             return True
         except Exception as e:
@@ -304,11 +621,11 @@ class SupabaseDB:
     def delete_user(self, email):
         """사용자 삭제"""
         try:
-            response = self.client.table('Users').delete().eq('이메일', email).execute()
+            response = self._call('사용자 삭제', self.client.table('Users').delete().eq('이메일', email).execute, 'write')
             print(f"[DEBUG] 사용자 삭제 응답: {response}")
             
             # 캐시 무효화
-            self._invalidate_cache('users')
+            self._invalidate_tag('users')
             
             return True
         except Exception as e:
@@ -318,16 +635,20 @@ class SupabaseDB:
             return False
     
     # 작업자 관련 메서드
-    def get_workers(self):
-        """전체 작업자 데이터 조회"""
+    def get_workers(self, use_cache=True):
+        """전체 작업자 데이터 조회 (use_cache=False이면 캐시를 건너뛰고 조회하여 캐시 갱신)"""
         try:
             print(f"[DEBUG] get_workers 시작: 캐시 확인 중")
             
             # 캐시 사용 여부 (필요한 경우 캐시 사용)
-            cached_data = self._get_cached_data('workers')
-            if cached_data:
-                print(f"[DEBUG] 캐시된 작업자 데이터 {len(cached_data)}개 반환")
-                return cached_data
+            if use_cache:
+                self._check_data_version('workers')
+                fetch = lambda: self._single_flight('workers', lambda: self.get_workers(use_cache=False))
+                cached_data = self._get_cached_data('workers', refresh=fetch)
+                if cached_data:
+                    print(f"[DEBUG] 캐시된 작업자 데이터 {len(cached_data)}개 반환")
+                    return cached_data
+                return fetch()
             
             print(f"[DEBUG] Supabase에서 작업자 데이터 직접 조회")
             if not self.client:
@@ -337,63 +658,48 @@ class SupabaseDB:
                     print(f"[ERROR] Supabase 재연결 실패")
                     return []
             
-            # 연결 재시도 (최대 3회)
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    print(f"[DEBUG] Workers 테이블 쿼리 실행 (시도 {attempt+1}/{max_retries})")
-                    response = self.client.table('Workers').select('*').execute()
-                    
-                    if hasattr(response, 'data'):
-                        workers = response.data
-                        print(f"[DEBUG] 조회된 작업자 데이터: {len(workers)}개 레코드")
-                        
-                        # 모든 작업자 데이터 출력 (디버깅용)
-                        for i, worker in enumerate(workers):
-                            print(f"[DEBUG] 작업자 {i+1}: {worker}")
-                        
-                        # 필드 매핑 설정
-                        formatted_workers = []
-                        for worker in workers:
-                            worker_data = {
-                                'id': worker.get('id', ''),
-                                '사번': worker.get('사번', ''),
-                                '이름': worker.get('이름', ''),
-                                '부서': worker.get('부서', 'CNC'),
-                                '라인번호': worker.get('라인번호', '')
-                            }
-                            formatted_workers.append(worker_data)
-                        
-                        # 캐시 저장
-                        self._set_cached_data('workers', formatted_workers)
-                        print(f"[INFO] 작업자 데이터 {len(formatted_workers)}개 반환")
-                        return formatted_workers
-                    else:
-                        print(f"[ERROR] 작업자 데이터 조회 응답에 data 필드가 없음 (시도 {attempt+1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            import time
-                            time.sleep(0.5)  # 잠시 대기 후 재시도
-                            self._initialize_connection()  # 연결 재초기화
-                except Exception as e:
-                    print(f"[ERROR] 작업자 조회 중 오류 발생 (시도 {attempt+1}/{max_retries}): {e}")
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)  # 잠시 대기 후 재시도
-                        self._initialize_connection()  # 연결 재초기화
+            # 일시적인 오류는 재시도 정책에 따라 다시 시도하고, 실패하면 만료된 캐시라도 사용
+            try:
+                response = self._call('작업자 조회', lambda: self.client.table('Workers').select('*').execute())
+            except Exception as e:
+                print(f"[ERROR] 작업자 조회 중 오류 발생: {e}")
+                return self._cached_fallback('workers')
             
-            print(f"[ERROR] 최대 재시도 횟수를 초과했습니다.")
-            return []
+            workers = response.data or []
+            print(f"[DEBUG] 조회된 작업자 데이터: {len(workers)}개 레코드")
+            
+            # 모든 작업자 데이터 출력 (디버깅용)
+            for i, worker in enumerate(workers):
+                print(f"[DEBUG] 작업자 {i+1}: {worker}")
+            
+            # 필드 매핑 설정
+            formatted_workers = [self._format_worker(worker) for worker in workers]
+            
+            # 캐시 저장
+            self._set_cached_data('workers', formatted_workers, tag='workers')
+            print(f"[INFO] 작업자 데이터 {len(formatted_workers)}개 반환")
+            return formatted_workers
         except Exception as e:
             print(f"[ERROR] 작업자 조회 중 오류 발생: {e}")
             import traceback
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
             return []
     
+    def _format_worker(self, worker):
+        """Workers 테이블 행을 작업자 목록 형식으로 변환"""
+        return {
+            'id': worker.get('id', ''),
+            '사번': worker.get('사번', ''),
+            '이름': worker.get('이름', ''),
+            '부서': worker.get('부서', 'CNC'),
+            '라인번호': worker.get('라인번호', '')
+        }
+    
     def add_worker(self, employee_id, name, department, line_number):
         """작업자 추가"""
         try:
             # 테이블 구조 확인
-            table_info = self.client.table('Workers').select('*').limit(1).execute()
+            table_info = self._call('작업자 조회', self.client.table('Workers').select('*').limit(1).execute, 'read')
             
             # 데이터 준비
             data = {
@@ -405,11 +711,14 @@ class SupabaseDB:
             
             print(f"[DEBUG] 추가할 작업자 데이터: {data}")
             
-            response = self.client.table('Workers').insert(data).execute()
+            response = self._call('작업자 추가', self.client.table('Workers').insert(data).execute, 'write')
             print(f"[DEBUG] 작업자 추가 응답: {response}")
             
-            # 캐시 무효화
-            self._invalidate_cache('workers')
+            # 캐시 갱신 - 추가된 행을 작업자 목록 캐시에 직접 반영
+            if hasattr(response, 'data') and response.data:
+                self._apply_cached_list_change('workers', [], [self._format_worker(row) for row in response.data], response.data)
+            else:
+                self._invalidate_tag('workers')
             
             return True
         except Exception as e:
@@ -430,14 +739,9 @@ class SupabaseDB:
                     print(f"[ERROR] Supabase 재연결 실패")
                     return False
             
-            # 캐시 무효화 먼저 수행
-            print(f"[DEBUG] 작업자 캐시 무효화")
-            self._invalidate_cache('workers')
-            self._invalidate_cache() # 전체 캐시 무효화
-            
             # Workers 테이블에서 이름으로 작업자 조회
             print(f"[DEBUG] 작업자 '{old_name}' 조회 중")
-            response = self.client.table('Workers').select('*').eq('이름', old_name).execute()
+            response = self._call('작업자 조회', self.client.table('Workers').select('*').eq('이름', old_name).execute, 'read')
             print(f"[DEBUG] 작업자 조회 결과: {response.data if hasattr(response, 'data') else '응답에 데이터 없음'}")
             
             if not hasattr(response, 'data') or not response.data or len(response.data) == 0:
@@ -461,12 +765,14 @@ class SupabaseDB:
             
             # 작업자 정보 업데이트
             print(f"[DEBUG] Workers 테이블 업데이트 시작: worker_id={worker_id}")
-            update_response = self.client.table('Workers').update(update_data).eq('id', worker_id).execute()
+            update_response = self._call('작업자 수정', self.client.table('Workers').update(update_data).eq('id', worker_id).execute, 'write')
             print(f"[DEBUG] 작업자 업데이트 응답: {update_response.data if hasattr(update_response, 'data') else '응답에 데이터 없음'}")
             
-            # 캐시 무효화 추가로 수행
-            self._invalidate_cache('workers')
-            self._invalidate_cache()
+            # 캐시 갱신 - 변경된 행을 작업자 목록 캐시에 직접 반영
+            if hasattr(update_response, 'data') and update_response.data:
+                self._apply_cached_list_change('workers', [worker_id], [self._format_worker(row) for row in update_response.data], update_response.data)
+            else:
+                self._invalidate_tag('workers')
             
             # 응답 확인
             if hasattr(update_response, 'data') and update_response.data and len(update_response.data) > 0:
@@ -495,14 +801,9 @@ class SupabaseDB:
                     print(f"[ERROR] Supabase 재연결 실패")
                     return False
             
-            # 캐시 무효화 먼저 수행
-            print(f"[DEBUG] 작업자 캐시 무효화")
-            self._invalidate_cache('workers')
-            self._invalidate_cache() # 전체 캐시 무효화
-            
             # 작업자 확인
             print(f"[DEBUG] 작업자 '{worker_name}' 조회 중")
-            response = self.client.table('Workers').select('*').eq('이름', worker_name).execute()
+            response = self._call('작업자 조회', self.client.table('Workers').select('*').eq('이름', worker_name).execute, 'read')
             print(f"[DEBUG] 작업자 조회 결과: {response.data if hasattr(response, 'data') else '응답에 데이터 없음'}")
             
             if not hasattr(response, 'data') or not response.data or len(response.data) == 0:
@@ -514,12 +815,11 @@ class SupabaseDB:
             
             # 작업자 삭제
             print(f"[DEBUG] Workers 테이블에서 작업자 삭제 시작: worker_id={worker_id}")
-            delete_response = self.client.table('Workers').delete().eq('id', worker_id).execute()
+            delete_response = self._call('작업자 삭제', self.client.table('Workers').delete().eq('id', worker_id).execute, 'write')
             print(f"[DEBUG] 작업자 삭제 응답: {delete_response.data if hasattr(delete_response, 'data') else '응답에 데이터 없음'}")
             
-            # 캐시 무효화 추가로 수행
-            self._invalidate_cache('workers')
-            self._invalidate_cache()
+            # 캐시 갱신 - 삭제된 작업자를 작업자 목록 캐시에서 제거
+            self._apply_cached_list_change('workers', [worker_id], [])
             
             # 응답 확인
             if hasattr(delete_response, 'data') and delete_response.data:
@@ -537,200 +837,921 @@ class SupabaseDB:
             return False
     
     # 생산 실적 관련 메서드
-    def get_production_records(self, start_date, end_date, worker=None, line=None, model=None):
-        """생산 실적 조회"""
-        print(f"[DEBUG] get_production_records 호출: start_date={start_date}, end_date={end_date}")
+    def _detect_date_field(self, record):
+        """레코드의 키에서 날짜 필드 이름 확인 (찾지 못하면 None)"""
+        if '날짜' in record:
+            return '날짜'
+        if 'date' in record:
+            return 'date'
+        for key in record.keys():
+            if 'date' in key.lower() or '날짜' in key:
+                return key
+        return None
+    
+    def _build_production_field_mapping(self, first_record, date_field):
+        """첫 번째 레코드의 필드 이름으로 생산 실적 필드 매핑 생성"""
+        field_mapping = {
+            'id': 'STT',  # id 필드를 STT로 변경
+            date_field: '날짜',
+            'worker': '작업자',
+            'line_number': '라인번호',
+            'model': '모델차수',
+            'target_quantity': '목표수량',
+            'production_quantity': '생산수량',
+            'defect_quantity': '불량수량',
+            'note': '특이사항'
+        }
         
-        cache_key = f'production_{start_date}_{end_date}'
-        cached_data = self._get_cached_data(cache_key)
+        # 한글 필드명이 있는 경우 매핑 조정
+        if first_record:
+            for key in first_record.keys():
+                if key == 'id' or key == 'STT' or key == 'stt' or key == 'ID':
+                    field_mapping['id'] = key  # id 필드 이름 확인
+                elif key == '작업자' or '작업자' in key:
+                    field_mapping['worker'] = key
+                elif key == '라인번호' or '라인' in key:
+                    field_mapping['line_number'] = key
+                elif key == '모델차수' or '모델' in key:
+                    field_mapping['model'] = key
+                elif key == '목표수량' or '목표' in key:
+                    field_mapping['target_quantity'] = key
+                elif key == '생산수량' or '생산' in key:
+                    field_mapping['production_quantity'] = key
+                elif key == '불량수량' or '불량' in key:
+                    field_mapping['defect_quantity'] = key
+                elif key == '특이사항' or '비고' in key or '메모' in key:
+                    field_mapping['note'] = key
         
-        if cached_data:
-            print(f"[DEBUG] 캐시된 데이터 사용: {len(cached_data)}개 레코드")
-            # 캐시된 데이터에서 필터링
-            return self._filter_production_data(cached_data, start_date, end_date, worker, line, model)
+        return field_mapping
+    
+    def _production_source_fields(self, record, field_mapping):
+        """필드 매핑을 레코드에 맞춰 [(결과 필드명, 실제 컬럼명 또는 None), ...] 목록으로 변환
         
-        try:
-            # 기본 쿼리 생성
-            print(f"[DEBUG] Supabase에서 생산 데이터 직접 조회")
-            if not self.client:
-                print(f"[ERROR] Supabase 클라이언트가 초기화되지 않음")
-                self._initialize_connection()
-                if not self.client:
-                    print(f"[ERROR] Supabase 재연결 실패")
-                    return []
-            
-            # 테이블 이름 확인 (production 또는 Production)
-            table_names = ['Production', 'production']
-            all_records = []
+        영어 필드명, 한글 필드명 순서로 레코드에 있는 컬럼을 찾고, 둘 다 없으면 None(기본값 사용)입니다.
+        """
+        fields = []
+        for eng_field, kor_field in field_mapping.items():
+            if eng_field in record:
+                fields.append((kor_field, eng_field))
+            elif kor_field in record:
+                fields.append((kor_field, kor_field))
+            else:
+                fields.append((kor_field, None))
+        return fields
+    
+    def _compile_production_mapping(self, fields, columns=None, filter_fields=()):
+        """결과 필드 목록을 레코드 변환에 사용할 매핑으로 컴파일
+        
+        {'targets': 결과 필드명 튜플, 'sources': DB 컬럼명 튜플, 'getter': 원본 행에서 값을 한 번에 꺼내는 itemgetter,
+         'template': 컬럼이 없는 필드의 기본값을 담은 결과 레코드 틀, 'identity': DB 컬럼명과 결과 필드명이 모두 같은지 여부}
+        """
+        if columns:
+            wanted_fields = set(columns) | {'id'} | set(filter_fields)
+            fields = [(target, source) for target, source in fields if target in wanted_fields]
+        
+        present = [(target, source) for target, source in fields if source]
+        targets = tuple(target for target, _ in present)
+        sources = tuple(source for _, source in present)
+        template = {target: (0 if target in PRODUCTION_QUANTITY_FIELDS else '') for target, _ in fields}
+        if len(sources) == 1:
+            # 컬럼이 하나면 itemgetter가 튜플 대신 값을 반환하므로 튜플로 감쌈
+            single = itemgetter(sources[0])
+            getter = lambda row: (single(row),)
+        else:
+            getter = itemgetter(*sources)
+        return {
+            'targets': targets,
+            'sources': sources,
+            'getter': getter,
+            'template': template,
+            'identity': targets == sources and len(present) == len(fields)
+        }
+    
+    def _resolve_production_table(self):
+        """생산 실적 테이블 스키마 확인
+        
+        {'table', 'date_field', 'field_mapping', 'columns', 'fields', 'compiled'} 형태의 딕셔너리를 반환합니다.
+        columns는 결과 필드명(한글) -> 실제 DB 컬럼명 매핑이고, fields는 결과 필드명 -> DB 컬럼명(없으면 None) 순서 목록,
+        compiled는 조회 컬럼별로 만들어 둔 변환 매핑입니다 (_compile_production_mapping 참고).
+        날짜 필드를 확인할 수 없으면 (테이블이 비어 있는 경우 등) date_field는 None이며,
+        테이블 자체를 찾을 수 없으면 None을 반환합니다.
+        확인된 결과는 공유 클라이언트 단위로 저장하여 모든 세션이 재사용합니다.
+        """
+        registry_key = (self.url, self.key)
+        schema = _production_schemas.get(registry_key)
+        if schema is not None:
+            return schema
+        
+        empty_table = None
+        for table_name in ['Production', 'production']:
+            try:
+                response = self.client.table(table_name).select('*').limit(1).execute()
+            except Exception as e:
+                print(f"[DEBUG] 테이블 '{table_name}' 스키마 확인 실패: {e}")
+                continue
             
-            # 연결 재시도 (최대 3회)
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # 페이지네이션으로 모든 데이터 가져오기
-                    for table_name in table_names:
-                        try:
-                            page_size = 1000
-                            offset = 0
-                            table_records = []
-                            
-                            while True:
-                                print(f"[DEBUG] 페이지네이션 조회: 테이블={table_name}, 페이지={offset//page_size+1}, offset={offset}, limit={page_size}")
-                                query = self.client.table(table_name).select('*').limit(page_size).offset(offset)
-                                response = query.execute()
-                                
-                                # 응답 검증
-                                if not response or not hasattr(response, 'data'):
-                                    print(f"[DEBUG] 테이블 '{table_name}' 페이지 {offset//page_size+1} 응답 없음")
-                                    break
-                                
-                                records = response.data
-                                if not records:
-                                    print(f"[DEBUG] 테이블 '{table_name}' 페이지 {offset//page_size+1} 데이터 없음")
-                                    break
-                                
-                                table_records.extend(records)
-                                print(f"[DEBUG] 테이블 '{table_name}' 페이지 {offset//page_size+1}: {len(records)}개 레코드 로드됨 (누적: {len(table_records)}개)")
-                                
-                                # 다음 페이지를 위한 offset 증가
-                                if len(records) < page_size:
-                                    break  # 마지막 페이지
-                                
-                                offset += page_size
-                            
-                            if table_records:
-                                print(f"[DEBUG] 테이블 '{table_name}'에서 총 {len(table_records)}개 레코드 로드 완료")
-                                all_records = table_records
-                                break  # 성공적으로 데이터를 가져온 테이블을 사용
-                            
-                        except Exception as e:
-                            print(f"[DEBUG] 테이블 '{table_name}' 페이지네이션 조회 실패: {e}")
-                    
-                    if all_records:
-                        break  # 데이터를 가져왔으므로 재시도 중단
-                    
-                    print(f"[ERROR] 생산 데이터 조회 실패 (시도 {attempt+1}/{max_retries})")
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)  # 잠시 대기 후 재시도
-                        self._initialize_connection()  # 연결 재초기화
-                except Exception as e:
-                    print(f"[ERROR] 생산 실적 조회 중 오류 발생 (시도 {attempt+1}/{max_retries}): {e}")
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)  # 잠시 대기 후 재시도
-                        self._initialize_connection()  # 연결 재초기화
+            rows = response.data if response and hasattr(response, 'data') else None
+            if not rows:
+                print(f"[DEBUG] 테이블 '{table_name}'에 데이터가 없어 날짜 필드를 확인할 수 없음")
+                empty_table = empty_table or table_name
+                continue
             
-            if not all_records:
-                print(f"[DEBUG] 모든 테이블 조회 시도 실패, 빈 결과 반환")
-                return []
+            date_field = self._detect_date_field(rows[0])
+            if not date_field:
+                print(f"[DEBUG] 테이블 '{table_name}'에서 날짜 필드를 찾을 수 없음: {list(rows[0].keys())}")
+                return {'table': table_name, 'date_field': None, 'field_mapping': None, 'columns': None}
+            
+            field_mapping = self._build_production_field_mapping(rows[0], date_field)
+            fields = self._production_source_fields(rows[0], field_mapping)
+            schema = {
+                'table': table_name,
+                'date_field': date_field,
+                'field_mapping': field_mapping,
+                'columns': {target_field: source_field for target_field, source_field in fields if source_field},
+                'fields': fields,
+                'compiled': {}
+            }
+            with _shared_lock:
+                schema = _production_schemas.setdefault(registry_key, schema)
+            print(f"[DEBUG] 생산 실적 스키마 확인: 테이블={table_name}, 날짜 필드={date_field}, 컬럼={schema['columns']}")
+            return schema
+        
+        if empty_table:
+            return {'table': empty_table, 'date_field': None, 'field_mapping': None, 'columns': None}
+        return None
+    
+    def _production_select_columns(self, schema, columns, filter_fields=()):
+        """요청한 결과 필드명(한글)을 select에 사용할 DB 컬럼 목록으로 변환
+        
+        커서 페이지네이션에 필요한 id와 날짜 필드, 조건 필드는 항상 포함됩니다.
+        columns가 없으면 스키마에서 확인한 생산 실적 컬럼 전체를 select 합니다.
+        """
+        if not schema or not schema['columns']:
+            return ['*']
+        
+        column_map = schema['columns']
+        if not columns:
+            return list(dict.fromkeys(['id'] + list(column_map.values())))
+        wanted = ['id', '날짜'] + list(filter_fields) + list(columns)
+        select_columns = []
+        for field in wanted:
+            db_column = column_map.get(field, field if field == 'id' else None)
+            if db_column and db_column not in select_columns:
+                select_columns.append(db_column)
+        return select_columns
+    
+    def _production_query(self, table_name, date_field=None, start_date=None, end_date=None, filters=None, count=None, select_columns=None):
+        """생산 실적 조회 쿼리 생성 (조회 컬럼 및 기간/조건 필터 적용)"""
+        query = self.client.table(table_name).select(*(select_columns or ['*']), count=count)
+        if date_field:
+            query = query.gte(date_field, start_date).lte(date_field, end_date)
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        return query
+    
+    def _iter_pages_keyset(self, build_query, label, after_id=None, upto_id=None):
+        """id 커서(keyset) 페이지네이션으로 페이지를 순서대로 반환하는 제너레이터
+        
+        id 오름차순으로 정렬하고 마지막으로 받은 id보다 큰 행만 요청하므로,
+        OFFSET과 달리 뒤쪽 페이지도 느려지지 않고 조회 중 삽입이 있어도 행이 누락/중복되지 않습니다.
+        upto_id가 주어지면 id <= upto_id 구간까지만 조회합니다.
+        """
+        page_size = self.page_size
+        last_id = after_id
+        page_number = 0
+        
+        while True:
+            page_number += 1
+            query = build_query().order('id').limit(page_size)
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            if upto_id is not None:
+                query = query.lte('id', upto_id)
+            
+            print(f"[DEBUG] 커서 페이지 조회: {label}, 페이지={page_number}, id>{last_id}, limit={page_size}")
+            response = self._call(f"생산 실적 페이지 조회 ({label})", query.execute, 'bulk_read')
+            
+            records = response.data if response and hasattr(response, 'data') else []
+            if not records:
+                break
             
-            print(f"[DEBUG] 조회된 전체 레코드 수: {len(all_records)}")
+            yield records
             
-            # 레코드 출력
-            if all_records:
-                print(f"[DEBUG] 첫 번째 레코드: {all_records[0]}")
-                # 필드 이름 출력
-                print(f"[DEBUG] 레코드 필드: {list(all_records[0].keys())}")
+            if len(records) < page_size:
+                break  # 마지막 페이지
             
-            # 필터링된 레코드만 선택
-            records = []
-            date_field = '날짜'
-            
-            # 필드 이름 확인 (날짜 또는 date)
-            if len(all_records) > 0:
-                first_record = all_records[0]
-                if '날짜' not in first_record and 'date' in first_record:
-                    date_field = 'date'
-                elif '날짜' not in first_record:
-                    # 날짜 필드 찾기
-                    for key in first_record.keys():
-                        if 'date' in key.lower() or '날짜' in key:
-                            date_field = key
-                            break
-            
-            print(f"[DEBUG] 사용할 날짜 필드: {date_field}")
-            
-            for record in all_records:
-                record_date = record.get(date_field, '')
-                
-                # 날짜 형식에 따라 비교 방식 조정
-                if record_date:
-                    # 문자열 비교 또는 날짜 객체로 변환 후 비교
-                    if isinstance(record_date, str):
-                        if start_date <= record_date <= end_date:
-                            records.append(record)
-                    else:
-                        # 날짜 객체인 경우 문자열로 변환하여 비교
-                        record_date_str = record_date.strftime('%Y-%m-%d') if hasattr(record_date, 'strftime') else str(record_date)
-                        if start_date <= record_date_str <= end_date:
-                            records.append(record)
-            
-            print(f"[DEBUG] 필터링 후 레코드 수: {len(records)}")
-            
-            # 필드명 매핑 - 필드 이름에 따라 동적으로 처리
-            formatted_records = []
-            field_mapping = {
-                'id': 'STT',  # id 필드를 STT로 변경
-                date_field: '날짜',
-                'worker': '작업자',
-                'line_number': '라인번호',
-                'model': '모델차수',
-                'target_quantity': '목표수량',
-                'production_quantity': '생산수량',
-                'defect_quantity': '불량수량',
-                'note': '특이사항'
-            }
+            last_id = records[-1]['id']
+    
+    def _iter_pages_parallel(self, build_query, label):
+        """id 구간을 나누어 병렬로 조회하고 id 순서대로 반환하는 제너레이터
+        
+        count='exact' 조회로 전체 건수와 id 범위를 확인한 뒤, 구간별 커서 조회를
+        self.fetch_concurrency 크기의 스레드 풀에서 동시에 실행합니다.
+        """
+        probe = self._call(f"생산 실적 건수 조회 ({label})", build_query(count='exact').order('id').limit(1).execute, 'bulk_read')
+        total = getattr(probe, 'count', None)
+        if total is None or total <= self.page_size or not probe.data:
+            if total is None:
+                print(f"[DEBUG] 전체 건수를 확인할 수 없어 순차 조회로 전환: {label}")
+            yield from self._iter_pages_keyset(build_query, label)
+            return
+        
+        last = self._call(f"생산 실적 마지막 id 조회 ({label})", build_query().order('id', desc=True).limit(1).execute, 'bulk_read')
+        if not last.data:
+            yield from self._iter_pages_keyset(build_query, label)
+            return
+        
+        # 첫 번째 id 직전부터 마지막 id까지를 페이지 수만큼의 구간으로 분할
+        lower = probe.data[0]['id'] - 1
+        upper = last.data[0]['id']
+        slice_count = -(-total // self.page_size)
+        width = max(1, -(-(upper - lower) // slice_count))
+        slices = [(start, min(start + width, upper)) for start in range(lower, upper, width)]
+        
+        def fetch_slice(id_range):
+            rows = []
+            for page in self._iter_pages_keyset(build_query, label, after_id=id_range[0], upto_id=id_range[1]):
+                rows.extend(page)
+            return rows
+        
+        max_workers = max(1, min(self.fetch_concurrency, len(slices)))
+        print(f"[DEBUG] 병렬 페이지 조회: {label}, 전체={total}개, 구간={len(slices)}개, 동시 요청={max_workers}")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for rows in executor.map(fetch_slice, slices):
+                if rows:
+                    yield rows
+    
+    def iter_production_pages(self, start_date=None, end_date=None, worker=None, line=None, model=None, parallel=False, columns=None):
+        """생산 실적 원본 행을 페이지 단위로 반환하는 제너레이터 (id 순서)
+        
+        기간과 작업자/라인/모델 조건은 서버에서 필터링합니다. 날짜 필드를 확인할 수 없으면
+        전체 테이블을 조회하면서 기간 조건만 클라이언트에서 적용합니다.
+        parallel=True이면 id 구간을 나누어 병렬로 조회합니다 (전체 기간 조회 등 대량 조회용).
+        columns에 결과 필드명(한글) 목록을 주면 해당 컬럼만 select 합니다.
+        """
+        schema = self._resolve_production_table()
+        if not schema:
+            print(f"[DEBUG] 생산 실적 테이블을 확인할 수 없음")
+            return
+        
+        table_name = schema['table']
+        date_field = schema['date_field']
+        field_mapping = schema['field_mapping']
+        
+        filters = {}
+        filter_fields = []
+        if field_mapping:
+            if worker:
+                filters[field_mapping['worker']] = worker
+                filter_fields.append('작업자')
+            if line:
+                filters[field_mapping['line_number']] = line
+                filter_fields.append('라인번호')
+            if model:
+                filters[field_mapping['model']] = model
+                filter_fields.append('모델차수')
+        
+        select_columns = self._production_select_columns(schema, columns, filter_fields)
+        server_filtered = bool(date_field) or not (start_date or end_date)
+        
+        def build_query(count=None):
+            if server_filtered and date_field and (start_date or end_date):
+                return self._production_query(table_name, date_field, start_date or '0000-01-01', end_date or '9999-12-31', filters, count=count, select_columns=select_columns)
+            return self._production_query(table_name, filters=filters, count=count, select_columns=select_columns)
+        
+        label = f"테이블={table_name}, 기간={start_date}~{end_date}, 필터={filters}"
+        pages = self._iter_pages_parallel(build_query, label) if parallel else self._iter_pages_keyset(build_query, label)
+        
+        for page in pages:
+            if not server_filtered:
+                page = self._filter_by_date(page, start_date or '0000-01-01', end_date or '9999-12-31')
+            if page:
+                yield page
+    
+    def _filter_by_date(self, records, start_date, end_date):
+        """날짜 필드를 기준으로 기간 내 레코드만 선택 (클라이언트 측 필터링)"""
+        if not records:
+            return []
+        
+        date_field = self._detect_date_field(records[0]) or '날짜'
+        filtered = []
+        for record in records:
+            record_date = record.get(date_field, '')
+            
+            # 날짜 형식에 따라 비교 방식 조정
+            if record_date:
+                # 문자열 비교 또는 날짜 객체로 변환 후 비교
+                if isinstance(record_date, str):
+                    if start_date <= record_date <= end_date:
+                        filtered.append(record)
+                else:
+                    # 날짜 객체인 경우 문자열로 변환하여 비교
+                    record_date_str = record_date.strftime('%Y-%m-%d') if hasattr(record_date, 'strftime') else str(record_date)
+                    if start_date <= record_date_str <= end_date:
+                        filtered.append(record)
+        return filtered
+    
+    def get_production_records(self, start_date, end_date, worker=None, line=None, model=None, parallel=False, columns=None):
+        """생산 실적 조회
+        
+        날짜 필드를 확인할 수 있으면 기간(gte/lte)과 작업자/라인/모델 조건을 서버에서 필터링하고,
+        확인할 수 없는 경우에만 전체 테이블을 조회한 뒤 클라이언트에서 필터링합니다.
+        parallel=True이면 여러 페이지를 병렬로 조회합니다 (전체 기간 조회 등 대량 조회용).
+        columns에 필드명 목록(예: ['날짜', '생산수량'])을 주면 해당 필드와 id만 조회/반환합니다.
+        캐시는 날짜별 파티션으로 저장되며, 요청 기간은 캐시된 파티션으로 조합하고 캐시에 없는 날짜 구간만 조회합니다.
+        로컬 복제본의 최초 동기화가 끝났으면 Supabase 대신 복제본의 인덱스로 조회합니다.
+        """
+        print(f"[DEBUG] get_production_records 호출: start_date={start_date}, end_date={end_date}")
+        
+        self._check_data_version('production')
+        if self._replica_ready():
+            records = self.replica.store.get_production_records(start_date, end_date, worker, line, model, columns=columns)
+            if records is not None:
+                return records
+        
+        # 조회 조건 (캐시 파티션 키와, 쓰기 작업 시 변경된 행을 파티션에 반영할지 판단하는 데 사용)
+        filters = {field: value for field, value in (('작업자', worker), ('라인번호', line), ('모델차수', model)) if value}
+        
+        try:
+            formatted_records = self._get_production_partitions(start_date, end_date, filters, columns, parallel)
             
-            # 한글 필드명이 있는 경우 매핑 조정
-            if len(all_records) > 0:
-                first_record = all_records[0]
-                for key in first_record.keys():
-                    if key == 'id' or key == 'STT' or key == 'stt' or key == 'ID':
-                        field_mapping['id'] = key  # id 필드 이름 확인
-                    elif key == '작업자' or '작업자' in key:
-                        field_mapping['worker'] = key
-                    elif key == '라인번호' or '라인' in key:
-                        field_mapping['line_number'] = key
-                    elif key == '모델차수' or '모델' in key:
-                        field_mapping['model'] = key
-                    elif key == '목표수량' or '목표' in key:
-                        field_mapping['target_quantity'] = key
-                    elif key == '생산수량' or '생산' in key:
-                        field_mapping['production_quantity'] = key
-                    elif key == '불량수량' or '불량' in key:
-                        field_mapping['defect_quantity'] = key
-                    elif key == '특이사항' or '비고' in key or '메모' in key:
-                        field_mapping['note'] = key
+            if formatted_records is None and self.replica is not None:
+                # Supabase에 연결할 수 없으면 (동기화가 끝나지 않았더라도) 로컬 복제본의 데이터 사용
+                print(f"[INFO] 생산 실적 조회 실패, 로컬 복제본의 데이터 사용")
+                formatted_records = self.replica.store.get_production_records(start_date, end_date, worker, line, model, columns=columns)
             
-            print(f"[DEBUG] 필드 매핑: {field_mapping}")
+            if formatted_records is None:
+                print(f"[DEBUG] 모든 테이블 조회 시도 실패")
+                return None
             
-            for record in records:
-                formatted_record = {}
-                for eng_field, kor_field in field_mapping.items():
-                    # 영어 필드명으로 데이터 가져오기
-                    if eng_field in record:
-                        formatted_record[kor_field] = record[eng_field]
-                    # 한글 필드명으로 데이터 가져오기
-                    elif kor_field in record:
-                        formatted_record[kor_field] = record[kor_field]
-                    else:
-                        # 기본값 설정
-                        if kor_field in ['목표수량', '생산수량', '불량수량']:
-                            formatted_record[kor_field] = 0
-                        else:
-                            formatted_record[kor_field] = ''
-                
-                formatted_records.append(formatted_record)
+            if not formatted_records:
+                print(f"[DEBUG] 해당 기간의 생산 데이터 없음")
             
             print(f"[DEBUG] 포맷된 레코드 수: {len(formatted_records)}")
-            self._set_cached_data(cache_key, formatted_records)
             return self._filter_production_data(formatted_records, start_date, end_date, worker, line, model)
         except Exception as e:
             print(f"생산 실적 조회 중 오류 발생: {e}")
             import traceback
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+            return None
+    
+    def _production_partition_key(self, day, filters, columns=None):
+        """날짜별 생산 실적 캐시 파티션 키"""
+        cache_key = f'production_{day}'
+        if filters:
+            cache_key += f'_{filters.get("작업자", "")}_{filters.get("라인번호", "")}_{filters.get("모델차수", "")}'
+        if columns:
+            cache_key += '_cols_' + ','.join(columns)
+        return cache_key
+    
+    def _production_partition_timeout(self, day):
+        """파티션 유효 시간 - 지난 날짜는 거의 바뀌지 않으므로 길게, 오늘 이후는 기본 캐시 시간으로"""
+        if day < datetime.now().strftime('%Y-%m-%d'):
+            return self.past_cache_timeout
+        return self.cache_timeout
+    
+    def _get_production_partitions(self, start_date, end_date, filters, columns=None, parallel=False):
+        """요청 기간의 생산 실적을 날짜별 캐시 파티션으로 조합 (조회 실패 시 None)
+        
+        날짜마다 같은 조건의 파티션을 우선 사용하고, 없으면 조건이 더 넓은 파티션을 잘라 사용합니다.
+        캐시에 없는 날짜는 연속 구간으로 묶어 조회한 뒤 날짜별 파티션으로 나눠 저장합니다 (데이터가 없는 날짜도 빈 파티션으로 저장).
+        만료된 지 stale_timeout초 이내의 파티션은 그대로 사용하고 해당 구간을 백그라운드에서 다시 조회합니다.
+        날짜별 파티션은 오늘까지만 만들고, 오늘 이후 기간은 구간 하나로 캐시합니다 (_get_production_future_range).
+        결과는 서버 조회와 같이 id 순서로 정렬됩니다.
+        """
+        start_key, end_key = self._date_key(start_date), self._date_key(end_date)
+        today = datetime.now().strftime('%Y-%m-%d')
+        days = []
+        day = start_key
+        while day <= min(end_key, today):
+            days.append(day)
+            day = self._shift_date(day, 1)
+        
+        # 날짜별로 사용할 파티션 선택 (같은 조건의 파티션 우선)
+        chosen = {}
+        try:
+            for entry in self.cache.find_range_entries('production', start_key, end_key, self.stale_timeout):
+                day = entry['range_start']
+                if entry['range_end'] != day or not self._cached_range_usable(entry['meta'], filters, columns):
+                    continue
+                if day not in chosen or entry['key'] == self._production_partition_key(day, filters, columns):
+                    chosen[day] = entry['key']
+            cached = self.cache.get_many(list(chosen.values()), self.stale_timeout)
+        except Exception as e:
+            print(f"[ERROR] 캐시 파티션 조회 중 오류 발생: {e}")
+            chosen, cached = {}, {}
+        
+        wanted_fields = (set(columns) | set(filters.keys()) | {'id', '날짜'}) if columns else None
+        records = []
+        missing_days = []
+        stale_days = []
+        for day in days:
+            key = chosen.get(day)
+            if key is None or key not in cached:
+                missing_days.append(day)
+                continue
+            
+            day_records, stale = cached[key]
+            if stale:
+                stale_days.append(day)
+            if key != self._production_partition_key(day, filters, columns):
+                # 조건이 더 넓은 파티션은 요청 조건으로 거르고 요청 필드만 남김
+                day_records = [record for record in day_records
+                               if all(record.get(field) == value for field, value in filters.items())]
+                if wanted_fields is not None:
+                    day_records = [{field: value for field, value in record.items() if field in wanted_fields} for record in day_records]
+            records.extend(day_records)
+        
+        print(f"[DEBUG] 캐시 파티션 사용: {len(days) - len(missing_days)}/{len(days)}일 (만료: {len(stale_days)}일)")
+        
+        # 만료된 파티션 구간은 백그라운드에서 다시 조회
+        for run_start, run_end in self._date_runs(stale_days):
+            refresh_key = self._production_partition_key(f'{run_start}_{run_end}', filters, columns)
+            self._refresh_in_background(
+                refresh_key,
+                lambda run_start=run_start, run_end=run_end: self._fetch_production_partitions(run_start, run_end, filters, columns, parallel)
+            )
+        
+        # 캐시에 없는 날짜를 연속 구간으로 묶어 조회
+        for run_start, run_end in self._date_runs(missing_days):
+            print(f"[DEBUG] 캐시에 없는 구간 조회: {run_start} ~ {run_end}")
+            fetched = self._fetch_production_partitions(run_start, run_end, filters, columns, parallel)
+            if fetched is None:
+                return None
+            records.extend(fetched)
+        
+        if end_key > today:
+            future = self._get_production_future_range(max(start_key, self._shift_date(today, 1)), end_key, filters, columns, parallel)
+            if future is None:
+                return None
+            records.extend(future)
+        
+        records.sort(key=lambda record: record.get('id') or 0)
+        return records
+    
+    def _get_production_future_range(self, start_key, end_key, filters, columns=None, parallel=False):
+        """오늘 이후 기간의 생산 실적 (조회 실패 시 None)
+        
+        미래 날짜는 대부분 비어 있으므로 날짜별 파티션 대신 구간 하나를 기본 캐시 시간 동안 캐시합니다.
+        구간 항목도 태그/날짜 범위로 저장되므로 쓰기 시 같은 방식으로 갱신/무효화됩니다.
+        """
+        key = self._production_partition_key(f'{start_key}_{end_key}', filters, columns)
+        records = self._get_cached_data(key)
+        if records is not None:
+            return records
+        
+        records = self._single_flight(key, lambda: self._fetch_production_range(start_key, end_key, filters, columns, parallel))
+        if records is not None:
+            self._set_cached_data(key, records, tag='production', range_start=start_key, range_end=end_key,
+                                  meta={'filters': filters, 'columns': columns})
+        return records
+    
+    def _date_runs(self, days):
+        """정렬된 날짜 목록을 연속 구간 [(시작일, 종료일), ...]으로 묶음"""
+        runs = []
+        for day in days:
+            if runs and self._shift_date(runs[-1][1], 1) == day:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return [tuple(run) for run in runs]
+    
+    def _fetch_production_partitions(self, start_key, end_key, filters, columns=None, parallel=False):
+        """기간의 생산 실적을 조회하여 날짜별 파티션으로 나눠 저장하고 조회 결과 반환 (실패 시 None)
+        데이터가 없는 날짜도 빈 파티션으로 저장
+        여러 세션이 같은 구간을 동시에 조회하면 한 번만 조회하고 결과를 함께 사용
+        """
+        request_key = self._production_partition_key(f'{start_key}_{end_key}', filters, columns)
+        return self._single_flight(
+            request_key,
+            lambda: self._fetch_and_store_production_partitions(start_key, end_key, filters, columns, parallel)
+        )
+    
+    def _fetch_and_store_production_partitions(self, start_key, end_key, filters, columns=None, parallel=False):
+        """_fetch_production_partitions의 실제 조회 및 파티션 저장"""
+        fetched = self._fetch_production_range(start_key, end_key, filters, columns, parallel)
+        if fetched is None:
+            return None
+        
+        partitions = {}
+        day = start_key
+        while day <= end_key:
+            partitions[day] = []
+            day = self._shift_date(day, 1)
+        for record in fetched:
+            day = self._date_key(record.get('날짜'))
+            if day in partitions:
+                partitions[day].append(record)
+        self._set_production_partitions(partitions, filters, columns)
+        return fetched
+    
+    def _set_production_partitions(self, partitions, filters, columns=None):
+        """날짜별 생산 실적 파티션을 한 번에 캐시에 저장"""
+        meta = {'filters': filters, 'columns': columns}
+        try:
+            self.cache.set_many([
+                (self._production_partition_key(day, filters, columns), day_records,
+                 self._production_partition_timeout(day), 'production', day, day, meta)
+                for day, day_records in partitions.items()
+            ])
+            print(f"[DEBUG] 캐시 파티션 저장: {len(partitions)}일")
+        except Exception as e:
+            print(f"[ERROR] 캐시 파티션 저장 중 오류 발생: {e}")
+    
+    def _fetch_production_range(self, start_date, end_date, filters, columns=None, parallel=False):
+        """기간의 생산 실적을 서버에서 조회하여 한글 필드명 레코드로 반환 (실패 시 None)"""
+        if not self.client:
+            print(f"[ERROR] Supabase 클라이언트가 초기화되지 않음")
+            self._initialize_connection()
+            if not self.client:
+                print(f"[ERROR] Supabase 재연결 실패")
+                return None
+        
+        worker, line, model = filters.get('작업자'), filters.get('라인번호'), filters.get('모델차수')
+        records = None
+        
+        # 페이지 요청마다 재시도 정책이 적용되므로 받은 페이지는 다시 받지 않음
+        try:
+            records = []
+            for page in self.iter_production_pages(start_date, end_date, worker, line, model, parallel=parallel, columns=columns):
+                records.extend(page)
+        except Exception as e:
+            records = None
+            print(f"[ERROR] 생산 실적 조회 중 오류 발생: {e}")
+        
+        if not records:
+            return records
+        
+        print(f"[DEBUG] 조회된 레코드 수: {len(records)}")
+        print(f"[DEBUG] 첫 번째 레코드: {records[0]}")
+        # 필드 이름 출력
+        print(f"[DEBUG] 레코드 필드: {list(records[0].keys())}")
+        
+        return self._format_production_records(records, columns, list(filters.keys()))
+    
+    def _cached_range_usable(self, meta, filters, columns):
+        """캐시 파티션(meta)에서 요청 조건(filters, columns)의 결과를 만들 수 있는지 확인
+        
+        파티션의 조건이 요청 조건보다 넓어야 하고 (조건이 같거나 적음),
+        요청한 필드와 조건 필드, 날짜 필드를 모두 담고 있어야 합니다.
+        """
+        if not meta:
+            return False
+        
+        entry_filters = meta.get('filters') or {}
+        if any(filters.get(field) != value for field, value in entry_filters.items()):
+            return False
+        
+        entry_columns = meta.get('columns')
+        if not entry_columns:
+            return True
+        if not columns:
+            return False
+        available = set(entry_columns) | set(entry_filters.keys()) | {'id'}
+        return (set(columns) | set(filters.keys()) | {'날짜'}) <= available
+    
+    def _shift_date(self, date_key, days):
+        """YYYY-MM-DD 문자열 날짜를 days일 이동"""
+        return (datetime.strptime(date_key, '%Y-%m-%d') + timedelta(days=days)).strftime('%Y-%m-%d')
+    
+    def _format_production_records(self, records, columns=None, filter_fields=()):
+        """조회한 원본 레코드를 한글 필드명 레코드로 변환
+        
+        columns가 주어지면 해당 필드와 id, 조건 필드만 결과에 포함합니다.
+        스키마가 확인된 경우 클라이언트별로 컴파일해 둔 매핑을 사용하며, DB 컬럼명이 결과 필드명과 같고
+        행에 그 컬럼만 있으면 (명시적 select 결과) 원본 행을 복사 없이 그대로 반환합니다.
+        """
+        if not records:
             return []
+        
+        mapping = self._production_mapping(records[0], columns, filter_fields)
+        targets = mapping['targets']
+        
+        # DB 컬럼명이 결과 필드명과 같고 다른 컬럼이 없으면 변환할 필요 없음
+        if mapping['identity'] and len(records[0]) == len(targets) and all(target in records[0] for target in targets):
+            return records if isinstance(records, list) else list(records)
+        
+        getter = mapping['getter']
+        template = mapping['template']
+        formatted_records = []
+        try:
+            for record in records:
+                formatted_record = template.copy()
+                formatted_record.update(zip(targets, getter(record)))
+                formatted_records.append(formatted_record)
+        except KeyError:
+            # 일부 행에 컬럼이 없는 경우 (스키마 확인 이후 변경 등) 행마다 값을 찾아 변환
+            sources = mapping['sources']
+            formatted_records = []
+            for record in records:
+                formatted_record = template.copy()
+                for target, source in zip(targets, sources):
+                    if source in record:
+                        formatted_record[target] = record[source]
+                    elif target in record:
+                        formatted_record[target] = record[target]
+                formatted_records.append(formatted_record)
+        
+        return formatted_records
+    
+    def _production_mapping(self, first_record, columns=None, filter_fields=()):
+        """레코드 변환에 사용할 컴파일된 매핑 반환
+        
+        스키마가 확인된 경우 (조회 컬럼, 조건 필드) 조합별로 한 번만 컴파일하여 스키마에 저장하고,
+        스키마를 확인할 수 없으면 (빈 테이블 등) 첫 번째 레코드의 필드 이름으로 매번 만듭니다.
+        """
+        schema = _production_schemas.get((self.url, self.key))
+        if schema is None or not schema.get('fields'):
+            date_field = self._detect_date_field(first_record) or '날짜'
+            field_mapping = self._build_production_field_mapping(first_record, date_field)
+            print(f"[DEBUG] 필드 매핑: {field_mapping}")
+            return self._compile_production_mapping(
+                self._production_source_fields(first_record, field_mapping), columns, filter_fields)
+        
+        compiled_key = (tuple(sorted(columns)) if columns else None, tuple(sorted(filter_fields)) if columns else None)
+        mapping = schema['compiled'].get(compiled_key)
+        if mapping is None:
+            mapping = self._compile_production_mapping(schema['fields'], columns, filter_fields)
+            schema['compiled'][compiled_key] = mapping
+        return mapping
+    
+    def _apply_cached_production_change(self, old_rows, new_rows):
+        """변경 전/후 원본 행(PostgREST 응답)을 캐시된 생산 실적 범위에 직접 반영
+        
+        변경 전/후 날짜를 포함하는 캐시 항목에서 해당 id의 행을 제거하고,
+        변경 후 행이 항목의 기간과 조회 조건에 맞으면 같은 형식으로 변환하여 id 순서대로 추가합니다.
+        id나 날짜를 확인할 수 없는 경우 해당 캐시를 무효화합니다.
+        """
+        changed_ids = {row.get('id') for row in old_rows + new_rows}
+        dates = self._production_record_dates(old_rows + new_rows)
+        if None in changed_ids or None in dates:
+            self._invalidate_tag('production', dates)
+            return
+        
+        self._log_production_dataset_change(changed_ids, new_rows)
+        self._expect_data_version('production', [row.get('id') for row in old_rows], new_rows)
+        # 집계 결과는 행 단위로 반영할 수 없으므로 해당 날짜의 집계 캐시만 무효화
+        self._invalidate_tag('production_summary', dates)
+        self._apply_replica_production_change(changed_ids, new_rows)
+        
+        def apply(data, meta, range_start, range_end):
+            meta = meta or {}
+            filters = meta.get('filters') or {}
+            updated = [record for record in data if record.get('id') not in changed_ids]
+            
+            added = False
+            full_records = self._format_production_records(new_rows)
+            cached_records = self._format_production_records(new_rows, meta.get('columns'), list(filters.keys()))
+            for full_record, record in zip(full_records, cached_records):
+                date = self._date_key(full_record.get('날짜'))
+                if (range_start and date < range_start) or (range_end and date > range_end):
+                    continue
+                if any(full_record.get(field) != value for field, value in filters.items()):
+                    continue
+                updated.append(record)
+                added = True
+            
+            if added:
+                updated.sort(key=lambda record: record.get('id') or 0)
+            return updated
+        
+        try:
+            applied = self.cache.update_tag('production', {self._date_key(d) for d in dates}, apply)
+            if applied:
+                print(f"[DEBUG] 'production' 캐시 {applied}개에 변경 내용 반영")
+        except Exception as e:
+            print(f"[ERROR] 캐시 반영 중 오류 발생: {e}")
+            self._invalidate_tag('production', dates)
+    
+    def _apply_replica_production_change(self, changed_ids, new_rows):
+        """생산 실적 쓰기 결과를 로컬 복제본에 바로 반영 (다음 동기화를 기다리지 않고 조회 결과에 포함되도록)"""
+        if getattr(self, 'replica', None) is None:
+            return
+        try:
+            removed_ids = set(changed_ids) - {row.get('id') for row in new_rows}
+            if removed_ids:
+                self.replica.apply_deletes('Production', removed_ids, notify=False)
+            self.replica.apply_remote_rows('Production', new_rows, notify=False)
+        except Exception as e:
+            print(f"[ERROR] 복제본 반영 중 오류 발생: {e}")
+            self._request_replica_sync()
+    
+    def get_production_dataset(self):
+        """세션 간에 공유하는 전체 기간(PRODUCTION_DATASET_RANGE) 생산 실적 스냅샷 반환
+        
+        모든 세션이 같은 ProductionSnapshot을 참조하므로 세션 수가 늘어도 메모리 사용량이 늘지 않습니다.
+        쓰기 작업은 변경 기록으로 남겨 두었다가 다음 조회 시 새 버전으로 한 번에 반영하고,
+        스냅샷이 cache_timeout보다 오래되면 캐시 파티션에서 다시 만듭니다.
+        다른 프로세스가 생산 실적을 바꾼 것이 버전 확인으로 감지되면 스냅샷을 바로 버립니다.
+        """
+        self._check_data_version('production')
+        with _shared_lock:
+            state = _production_datasets.get(self.url)
+            if state and state['snapshot'] is not None and time.time() - state['snapshot'].created_at < self.cache_timeout:
+                return self._materialize_production_dataset(state)
+        
+        return self._single_flight(f'production_dataset_{self.url}', self._build_production_dataset)
+    
+    def _build_production_dataset(self):
+        """캐시 파티션(또는 Supabase)에서 공유 생산 실적 데이터셋을 새로 만듦"""
+        with _shared_lock:
+            state = _production_datasets.setdefault(self.url, {'snapshot': None, 'changes': [], 'seq': 0, 'generation': 0})
+            start_seq = state['seq']
+            generation = state['generation']
+        
+        start_date, end_date = PRODUCTION_DATASET_RANGE
+        records = self.get_production_records(start_date, end_date, parallel=True)
+        
+        with _shared_lock:
+            # 조회에 실패했거나 조회 중에 데이터셋이 무효화되었으면 이번 결과는 공유하지 않음
+            if records is None:
+                return ProductionSnapshot([], 0, time.time(), start_seq)
+            if state['generation'] != generation:
+                return ProductionSnapshot(records, 0, time.time(), start_seq)
+            
+            previous = state['snapshot']
+            version = previous.version + 1 if previous is not None else 1
+            state['snapshot'] = ProductionSnapshot(records, version, time.time(), start_seq)
+            # 조회 중에 발생한 쓰기는 새 스냅샷에도 반영되도록 남겨 둠
+            state['changes'] = [change for change in state['changes'] if change[0] > start_seq]
+            snapshot = self._materialize_production_dataset(state)
+        
+        print(f"[DEBUG] 공유 생산 실적 데이터셋 생성: 버전 {snapshot.version}, {len(snapshot)}개 레코드")
+        return snapshot
+    
+    def _materialize_production_dataset(self, state):
+        """아직 반영되지 않은 변경 기록을 적용한 새 스냅샷 반환 (_shared_lock 안에서 호출)
+        
+        바뀌지 않은 레코드는 이전 스냅샷과 같은 객체를 공유합니다.
+        """
+        snapshot = state['snapshot']
+        changes = [change for change in state['changes'] if change[0] > snapshot.applied_seq]
+        if not changes:
+            return snapshot
+        
+        # 같은 id가 여러 번 바뀐 경우 마지막 변경만 반영
+        latest = {}
+        for seq, changed_ids, new_records in changes:
+            for record_id in changed_ids:
+                latest[record_id] = None
+            for record in new_records:
+                latest[record.get('id')] = record
+        
+        records = [record for record in snapshot if record.get('id') not in latest]
+        records.extend(record for record in latest.values() if record is not None)
+        records.sort(key=lambda record: record.get('id') or 0)
+        
+        state['snapshot'] = ProductionSnapshot(records, snapshot.version + 1, snapshot.created_at, changes[-1][0])
+        print(f"[DEBUG] 공유 생산 실적 데이터셋 버전 {state['snapshot'].version}: 변경 {len(changes)}건 반영")
+        return state['snapshot']
+    
+    def _log_production_dataset_change(self, changed_ids, new_rows):
+        """생산 실적 쓰기 내용을 공유 데이터셋 변경 기록에 추가 (다음 조회 시 새 버전으로 반영)"""
+        start_date, end_date = PRODUCTION_DATASET_RANGE
+        new_records = [record for record in self._format_production_records(new_rows)
+                       if start_date <= (self._date_key(record.get('날짜')) or '') <= end_date]
+        with _shared_lock:
+            _production_generations[self.url] = _production_generations.get(self.url, 0) + 1
+            state = _production_datasets.get(self.url)
+            if state is None:
+                return
+            state['seq'] += 1
+            state['changes'].append((state['seq'], set(changed_ids), new_records))
+    
+    def _drop_production_dataset(self):
+        """공유 생산 실적 데이터셋을 버려 다음 조회 시 다시 만들도록 함 (이미 참조 중인 세션의 스냅샷은 그대로 유지)"""
+        with _shared_lock:
+            _production_generations[self.url] = _production_generations.get(self.url, 0) + 1
+            state = _production_datasets.get(self.url)
+            if state is not None:
+                state['snapshot'] = None
+                state['changes'] = []
+                state['generation'] += 1
+    
+    def get_production_frame(self, start_date, end_date, worker=None, line=None, model=None, columns=None, parallel=False):
+        """생산 실적을 타입이 지정된 DataFrame으로 조회 (리포트 페이지용)
+        
+        날짜는 datetime64, 수량은 정수(int64), 작업자/라인번호/모델차수는 category 타입입니다.
+        같은 조건의 DataFrame은 생산 실적이 바뀌거나 cache_timeout이 지날 때까지 다시 만들지 않고 세션 간에 재사용하므로,
+        반환된 DataFrame의 값을 직접 수정하지 말아야 합니다 (열 추가나 필터링은 새 DataFrame을 만들므로 안전).
+        category 열로 groupby할 때는 observed=True를 지정해야 데이터가 없는 항목이 결과에 포함되지 않습니다.
+        """
+        self._check_data_version('production')
+        frame_key = (self.url, str(start_date), str(end_date), worker, line, model, tuple(columns) if columns else None)
+        with _shared_lock:
+            generation = _production_generations.get(self.url, 0)
+            entry = _production_frames.get(frame_key)
+            if entry is not None and entry[0] == generation and time.time() - entry[1] < self.cache_timeout:
+                _production_frames.move_to_end(frame_key)
+                print(f"[DEBUG] 생산 실적 DataFrame 재사용: {start_date} ~ {end_date}")
+                return entry[2].copy(deep=False)
+        
+        records = self.get_production_records(start_date, end_date, worker, line, model, parallel=parallel, columns=columns)
+        frame = self._production_records_to_frame(records, columns)
+        
+        with _shared_lock:
+            # 조회에 실패했거나 조회하는 동안 생산 실적이 바뀌었으면 저장하지 않음
+            if records is not None and _production_generations.get(self.url, 0) == generation:
+                _production_frames[frame_key] = (generation, time.time(), frame)
+                _production_frames.move_to_end(frame_key)
+                while len(_production_frames) > _production_frames_limit:
+                    _production_frames.popitem(last=False)
+        return frame.copy(deep=False)
+    
+    def get_production_summary(self, start_date, end_date, group_by=None, filters=None):
+        """기간 내 생산 실적의 목표/생산/불량수량 합계를 group_by 필드별로 조회 (리포트 페이지용 DataFrame)
+        
+        group_by는 PRODUCTION_SUMMARY_GROUPS 중 필드 목록이며, 없으면 전체 합계 한 행을 반환합니다.
+        filters에는 {'작업자'|'라인번호'|'모델차수': 값} 조건을 지정합니다.
+        집계는 Supabase의 production_summary 함수(RPC)가 DB에서 계산하므로 그룹 수만큼의 행만 전송되며,
+        함수가 없으면 생산 실적을 조회하여 로컬에서 집계합니다.
+        결과는 'production_summary' 태그로 캐시되고 해당 기간의 생산 실적이 바뀌면 무효화됩니다.
+        로컬 복제본의 최초 동기화가 끝났으면 캐시 없이 복제본에서 바로 집계합니다.
+        """
+        self._check_data_version('production')
+        if self._replica_ready():
+            summary = self.replica.store.get_production_summary(start_date, end_date, group_by, filters)
+            if summary is not None:
+                return summary
+        
+        start_key = self._date_key(start_date)
+        end_key = self._date_key(end_date)
+        group_by, filters = self._summary_arguments(group_by, filters)
+        
+        key = '_'.join(['production_summary', start_key, end_key] + group_by +
+                       [f"{field}={value}" for field, value in sorted(filters.items())])
+        fetch = lambda: self._single_flight(
+            key, lambda: self._fetch_production_summary(key, start_key, end_key, group_by, filters))
+        rows = self._get_cached_data(key, refresh=fetch)
+        if rows is None:
+            rows = fetch()
+        
+        return self._production_summary_frame(rows, group_by)
+    
+    def _fetch_production_summary(self, key, start_date, end_date, group_by, filters):
+        """production_summary 함수(RPC)로 집계하고, 함수가 없거나 실패하면 로컬에서 집계하여 캐시에 저장"""
+        registry_key = (self.url, self.key)
+        rows = None
+        
+        if self.client and registry_key not in _production_summary_unavailable:
+            try:
+                response = self._call('생산 실적 집계', self.client.rpc('production_summary', {
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'group_by': group_by,
+                    'worker': filters.get('작업자'),
+                    'line': filters.get('라인번호'),
+                    'model': filters.get('모델차수')
+                }).execute)
+                rows = [{field: row.get(field) for field in group_by + PRODUCTION_QUANTITY_FIELDS}
+                        for row in (response.data or [])]
+                print(f"[DEBUG] DB 집계 조회: {key}, {len(rows)}개 그룹")
+            except Exception as e:
+                message = str(e)
+                if 'PGRST202' in message or 'Could not find the function' in message:
+                    _production_summary_unavailable.add(registry_key)
+                    print(f"[INFO] production_summary 함수가 없어 로컬 집계 사용 (데이터 동기화 페이지의 SQL 스크립트 참고)")
+                else:
+                    print(f"[ERROR] DB 집계 조회 중 오류 발생, 로컬 집계로 대체: {e}")
+        
+        if rows is None:
+            rows = self._summarize_production_locally(start_date, end_date, group_by, filters)
+        
+        try:
+            # 지난 기간의 집계는 지난 날짜 파티션과 같은 시간 동안 유지 (쓰기 시 해당 날짜만 무효화)
+            self.cache.set(key, rows, self._production_partition_timeout(end_date), tag='production_summary',
+                           range_start=start_date, range_end=end_date)
+            print(f"[DEBUG] 캐시 저장: {key}")
+        except Exception as e:
+            print(f"[ERROR] 캐시 저장 중 오류 발생: {e}")
+        return rows
+    
+    def _summarize_production_locally(self, start_date, end_date, group_by, filters):
+        """생산 실적을 조회(캐시 파티션 사용)하여 group_by 필드별 합계 행 목록으로 집계"""
+        columns = ['날짜'] + [field for field in group_by if field in PRODUCTION_CATEGORY_FIELDS] + PRODUCTION_QUANTITY_FIELDS
+        frame = self.get_production_frame(start_date, end_date, worker=filters.get('작업자'),
+                                          line=filters.get('라인번호'), model=filters.get('모델차수'), columns=columns)
+        if frame.empty:
+            return []
+        
+        keys = []
+        for field in group_by:
+            if field == '연도':
+                keys.append(frame['날짜'].dt.year.rename('연도'))
+            elif field == '월':
+                keys.append(frame['날짜'].dt.month.rename('월'))
+            elif field == '날짜':
+                keys.append(frame['날짜'].dt.strftime('%Y-%m-%d'))
+            else:
+                keys.append(frame[field])
+        
+        if keys:
+            summary = frame.groupby(keys, observed=True)[PRODUCTION_QUANTITY_FIELDS].sum().reset_index()
+        else:
+            summary = frame[PRODUCTION_QUANTITY_FIELDS].sum().to_frame().T
+        print(f"[DEBUG] 로컬 집계: {start_date} ~ {end_date}, 기준={group_by}, {len(summary)}개 그룹")
+        return [{field: (value.item() if hasattr(value, 'item') else value) for field, value in row.items()}
+                for row in summary.to_dict('records')]
     
     def _filter_production_data(self, records, start_date, end_date, worker=None, line=None, model=None):
         """생산 실적 데이터 필터링"""
@@ -755,6 +1776,14 @@ class SupabaseDB:
             
         return filtered_records
     
+    def _production_record_dates(self, records):
+        """원본 생산 실적 레코드 목록의 날짜 값 목록 (날짜 필드가 없는 레코드는 None)"""
+        dates = []
+        for record in records:
+            date_field = self._detect_date_field(record)
+            dates.append(record.get(date_field) if date_field else None)
+        return dates
+    
     def add_production_record(self, date, worker, line_number, model, target_quantity, 
                              production_quantity, defect_quantity, note):
         """생산 실적 추가"""
@@ -770,10 +1799,13 @@ class SupabaseDB:
                 '특이사항': note
             }
             
-            response = self.client.table('Production').insert(data).execute()
+            response = self._call('생산 실적 추가', self.client.table('Production').insert(data).execute, 'write')
             
-            # 관련 캐시 무효화 - 모든 production_ 관련 캐시 삭제
-            self._invalidate_cache()  # 모든 캐시 무효화
+            # 관련 캐시 갱신 - 추가된 행(PostgREST 응답)을 해당 날짜를 포함하는 생산 실적 캐시에 직접 반영
+            if hasattr(response, 'data') and response.data:
+                self._apply_cached_production_change([], response.data)
+            else:
+                self._invalidate_tag('production', [date])
             
             return True
         except Exception as e:
@@ -782,13 +1814,140 @@ class SupabaseDB:
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
             return False
     
+    def add_production_records(self, rows, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """생산 실적 여러 건을 chunk_size개씩 배열 insert로 추가 (청크마다 요청 한 번), 청크별 결과 목록 반환
+        
+        추가된 행(PostgREST 응답)은 모든 청크를 보낸 뒤 한 번에 캐시/공유 데이터셋/복제본에 반영합니다.
+        실패한 청크는 다시 보내지 않으므로 (중복 추가 방지) 결과를 확인하여 해당 행만 다시 추가해야 합니다.
+        """
+        if not self.client:
+            self._initialize_connection()
+        
+        write_rows = self._production_write_rows(rows)
+        results = []
+        inserted = []
+        unreturned_dates = []
+        for index, start in enumerate(range(0, len(write_rows), chunk_size)):
+            chunk = write_rows[start:start + chunk_size]
+            try:
+                response = self._call(f"생산 실적 일괄 추가 ({index + 1})", self.client.table('Production').insert(chunk).execute, 'write')
+                if response.data:
+                    inserted.extend(response.data)
+                else:
+                    unreturned_dates.extend(row['날짜'] for row in chunk)
+                results.append({'chunk': index, 'rows': len(chunk), 'success': True, 'error': None})
+            except Exception as e:
+                print(f"[ERROR] 생산 실적 일괄 추가 중 오류 발생 (청크 {index + 1}): {e}")
+                results.append({'chunk': index, 'rows': len(chunk), 'success': False, 'error': str(e)})
+        
+        # 캐시 갱신은 마지막에 한 번만
+        if inserted:
+            self._apply_cached_production_change([], inserted)
+        if unreturned_dates:
+            self._invalidate_tag('production', unreturned_dates)
+        
+        self._write_results_summary('생산 실적 일괄 추가', results)
+        return results
+    
+    def upsert_production_records(self, rows, on_conflict='id', chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """on_conflict 컬럼 값이 같은 행은 수정하고 없으면 추가 (청크마다 배열 upsert 요청 한 번), 청크별 결과 목록 반환
+        
+        수정된 행의 변경 전 날짜를 알 수 없으므로 모든 청크를 보낸 뒤 생산 실적 캐시를 한 번 무효화합니다.
+        """
+        if not self.client:
+            self._initialize_connection()
+        
+        keys, valid_rows, skipped = self._split_upsert_rows(rows, on_conflict)
+        write_rows = self._production_write_rows(valid_rows, keep_id='id' in keys)
+        results = []
+        if skipped:
+            print(f"[ERROR] {on_conflict} 값이 없는 생산 실적 {skipped}건은 upsert에서 제외")
+            results.append({'chunk': None, 'rows': skipped, 'success': False, 'error': f"{on_conflict} 값이 없음"})
+        
+        for index, start in enumerate(range(0, len(write_rows), chunk_size)):
+            chunk = write_rows[start:start + chunk_size]
+            try:
+                self._call(f"생산 실적 일괄 upsert ({index + 1})",
+                           self.client.table('Production').upsert(chunk, on_conflict=on_conflict).execute, 'write')
+                results.append({'chunk': index, 'rows': len(chunk), 'success': True, 'error': None})
+            except Exception as e:
+                print(f"[ERROR] 생산 실적 일괄 upsert 중 오류 발생 (청크 {index + 1}): {e}")
+                results.append({'chunk': index, 'rows': len(chunk), 'success': False, 'error': str(e)})
+        
+        if any(result['success'] for result in results):
+            self._invalidate_tag('production')
+        
+        self._write_results_summary('생산 실적 일괄 upsert', results)
+        return results
+    
+    def delete_production_records(self, record_ids, chunk_size=PRODUCTION_WRITE_CHUNK_SIZE):
+        """id 목록의 생산 실적을 chunk_size개씩 삭제 (청크마다 id in 조건 delete 요청 한 번), 청크별 결과 목록 반환
+        
+        삭제된 행(PostgREST 응답)은 모든 청크를 보낸 뒤 한 번에 캐시/공유 데이터셋/복제본에서 제거합니다.
+        """
+        if not self.client:
+            self._initialize_connection()
+        
+        record_ids = list(record_ids)
+        results = []
+        deleted = []
+        unreturned = False
+        for index, start in enumerate(range(0, len(record_ids), chunk_size)):
+            chunk = record_ids[start:start + chunk_size]
+            try:
+                response = self._call(f"생산 실적 일괄 삭제 ({index + 1})", self.client.table('Production').delete().in_('id', chunk).execute, 'write')
+                if response.data:
+                    deleted.extend(response.data)
+                else:
+                    unreturned = True
+                results.append({'chunk': index, 'rows': len(chunk), 'success': True, 'error': None})
+            except Exception as e:
+                print(f"[ERROR] 생산 실적 일괄 삭제 중 오류 발생 (청크 {index + 1}): {e}")
+                results.append({'chunk': index, 'rows': len(chunk), 'success': False, 'error': str(e)})
+        
+        # 캐시 갱신은 마지막에 한 번만 (삭제된 행을 확인할 수 없으면 전체 무효화)
+        if deleted:
+            self._apply_cached_production_change(deleted, [])
+        if unreturned:
+            self._invalidate_tag('production')
+        
+        self._write_results_summary('생산 실적 일괄 삭제', results)
+        return results
+    
+    def supports_natural_key_upsert(self):
+        """생산 실적 자연 키 고유 인덱스가 있는지 클라이언트당 한 번 확인
+        
+        production_natural_key_supported 함수(RPC)로 스키마만 조회하며 데이터는 쓰지 않습니다.
+        함수가 없으면 (SQL 스크립트를 실행하지 않은 경우) 지원하지 않는 것으로 보고, 확인 요청이 실패하면 None (다음에 다시 확인).
+        """
+        registry_key = (self.url, self.key)
+        if registry_key in _natural_key_upsert_support:
+            return _natural_key_upsert_support[registry_key]
+        
+        try:
+            if not self.is_connected():
+                return None
+            response = self._call('자연 키 인덱스 확인', self.client.rpc('production_natural_key_supported', {}).execute, 'probe')
+            supported = bool(response.data)
+        except Exception as e:
+            message = str(e)
+            if 'PGRST202' not in message and 'Could not find the function' not in message:
+                print(f"[ERROR] 자연 키 upsert 가능 여부 확인 중 오류 발생: {e}")
+                return None
+            supported = False
+        
+        if not supported:
+            print(f"[INFO] 생산 실적 자연 키 고유 인덱스 없음 (데이터 동기화 페이지의 SQL 스크립트 참고)")
+        _natural_key_upsert_support[registry_key] = supported
+        return supported
+    
     def update_production_record(self, record_id, data):
         """생산 실적 업데이트"""
         try:
             print(f"[DEBUG] 생산 실적 업데이트 시작: ID={record_id}")
             
             # 레코드 존재 여부 확인
-            response = self.client.table('Production').select('*').eq('id', record_id).execute()
+            response = self._call('생산 실적 조회', self.client.table('Production').select('*').eq('id', record_id).execute, 'read')
             records = response.data
             
             if not records:
@@ -798,13 +1957,13 @@ class SupabaseDB:
             print(f"[INFO] 업데이트할 레코드 정보: {records[0]}")
             
             # 올바른 ID 필드로 업데이트
-            response = self.client.table('Production').update(data).eq('id', record_id).execute()
+            response = self._call('생산 실적 수정', self.client.table('Production').update(data).eq('id', record_id).execute, 'write')
             
             # 응답 확인
             if hasattr(response, 'data') and response.data:
                 print(f"[INFO] 레코드 업데이트 성공: {record_id}, 응답: {response.data}")
-                # 캐시 무효화
-                self._invalidate_cache()  # 모든 캐시 무효화
+                # 캐시 갱신 - 변경 전/후 날짜를 포함하는 생산 실적 캐시에 변경된 행을 직접 반영
+                self._apply_cached_production_change(records, response.data)
                 return True
             else:
                 print(f"[ERROR] 레코드 업데이트 실패: {record_id}, 응답: {response}")
@@ -825,7 +1984,7 @@ class SupabaseDB:
             print(f"[DEBUG] 삭제 시도 중인 레코드 ID: {record_id}")
             
             # 레코드 존재 여부 확인
-            response = self.client.table('Production').select('*').eq('id', record_id).execute()
+            response = self._call('생산 실적 조회', self.client.table('Production').select('*').eq('id', record_id).execute, 'read')
             records = response.data
             
             if not records:
@@ -835,13 +1994,13 @@ class SupabaseDB:
             print(f"[INFO] 삭제할 레코드 정보: {records[0]}")
             
             # 데이터 삭제
-            response = self.client.table('Production').delete().eq('id', record_id).execute()
+            response = self._call('생산 실적 삭제', self.client.table('Production').delete().eq('id', record_id).execute, 'write')
             
             # 응답 확인
             if hasattr(response, 'data') and response.data:
                 print(f"[INFO] 레코드 삭제 성공: {record_id}, 응답: {response.data}")
-                # 캐시 무효화
-                self._invalidate_cache()
+                # 캐시 갱신 - 삭제된 날짜를 포함하는 생산 실적 캐시에서 해당 행만 제거
+                self._apply_cached_production_change(records, [])
                 return True
             else:
                 print(f"[ERROR] 레코드 삭제 실패: {record_id}, 응답: {response}")
@@ -857,13 +2016,17 @@ class SupabaseDB:
             return False
     
     # 모델 관련 메서드
-    def get_all_models(self):
-        """모델 정보 조회"""
+    def get_all_models(self, use_cache=True):
+        """모델 정보 조회 (use_cache=False이면 캐시를 건너뛰고 조회하여 캐시 갱신)"""
         try:
-            cached_data = self._get_cached_data('models')
-            if cached_data:
-                print(f"[DEBUG] 캐시된 모델 데이터 {len(cached_data)}개 반환")
-                return cached_data
+            if use_cache:
+                self._check_data_version('models')
+                fetch = lambda: self._single_flight('models', lambda: self.get_all_models(use_cache=False))
+                cached_data = self._get_cached_data('models', refresh=fetch)
+                if cached_data:
+                    print(f"[DEBUG] 캐시된 모델 데이터 {len(cached_data)}개 반환")
+                    return cached_data
+                return fetch()
             
             print(f"[DEBUG] Supabase에서 모델 데이터 직접 조회")
             if not self.client:
@@ -873,49 +2036,33 @@ class SupabaseDB:
                     print(f"[ERROR] Supabase 재연결 실패")
                     return []
             
-            # 연결 재시도 (최대 3회)
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    print(f"[DEBUG] Model 테이블 쿼리 실행 (시도 {attempt+1}/{max_retries})")
-                    response = self.client.table('Model').select('*').execute()
-                    
-                    if hasattr(response, 'data'):
-                        models = response.data
-                        
-                        # 필드명 매핑
-                        formatted_models = []
-                        for model in models:
-                            formatted_models.append({
-                                'id': model.get('id', ''),
-                                '모델명': model.get('MODEL', model.get('model', '')),
-                                '공정': model.get('PROCESS', model.get('process', ''))
-                            })
-                        
-                        self._set_cached_data('models', formatted_models)
-                        print(f"[INFO] 모델 데이터 {len(formatted_models)}개 반환")
-                        return formatted_models
-                    else:
-                        print(f"[ERROR] 모델 데이터 조회 응답에 data 필드가 없음 (시도 {attempt+1}/{max_retries})")
-                        if attempt < max_retries - 1:
-                            import time
-                            time.sleep(0.5)  # 잠시 대기 후 재시도
-                            self._initialize_connection()  # 연결 재초기화
-                except Exception as e:
-                    print(f"[ERROR] 모델 조회 중 오류 발생 (시도 {attempt+1}/{max_retries}): {e}")
-                    if attempt < max_retries - 1:
-                        import time
-                        time.sleep(0.5)  # 잠시 대기 후 재시도
-                        self._initialize_connection()  # 연결 재초기화
+            # 일시적인 오류는 재시도 정책에 따라 다시 시도하고, 실패하면 만료된 캐시라도 사용
+            try:
+                response = self._call('모델 조회', lambda: self.client.table('Model').select('*').execute())
+            except Exception as e:
+                print(f"[ERROR] 모델 조회 중 오류 발생: {e}")
+                return self._cached_fallback('models')
             
-            print(f"[ERROR] 최대 재시도 횟수를 초과했습니다.")
-            return []
+            # 필드명 매핑
+            formatted_models = [self._format_model(model) for model in response.data or []]
+            
+            self._set_cached_data('models', formatted_models, tag='models')
+            print(f"[INFO] 모델 데이터 {len(formatted_models)}개 반환")
+            return formatted_models
         except Exception as e:
             print(f"[ERROR] 모델 조회 중 오류 발생: {e}")
             import traceback
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
             return []
     
+    def _format_model(self, model):
+        """Model 테이블 행을 모델 목록 형식으로 변환"""
+        return {
+            'id': model.get('id', ''),
+            '모델명': model.get('MODEL', model.get('model', '')),
+            '공정': model.get('PROCESS', model.get('process', ''))
+        }
+    
     def add_model(self, model_name, process):
         """모델 추가"""
         try:
@@ -924,11 +2071,14 @@ class SupabaseDB:
                 'process': process
             }
             
-            response = self.client.table('Model').insert(data).execute()
+            response = self._call('모델 추가', self.client.table('Model').insert(data).execute, 'write')
             print(f"[DEBUG] 모델 추가 응답: {response}")
             
-            # 캐시 무효화
-            self._invalidate_cache('models')
+            # 캐시 갱신 - 추가된 행을 모델 목록 캐시에 직접 반영
+            if hasattr(response, 'data') and response.data:
+                self._apply_cached_list_change('models', [], [self._format_model(row) for row in response.data], response.data)
+            else:
+                self._invalidate_tag('models')
             
             return True
         except Exception as e:
@@ -950,11 +2100,14 @@ class SupabaseDB:
                 if k in field_mapping:
                     update_data[field_mapping[k]] = v
             
-            response = self.client.table('Model').update(update_data).eq('id', model_id).execute()
+            response = self._call('모델 수정', self.client.table('Model').update(update_data).eq('id', model_id).execute, 'write')
             print(f"[DEBUG] 모델 업데이트 응답: {response}")
             
-            # 캐시 무효화
-            self._invalidate_cache('models')
+            # 캐시 갱신 - 변경된 행을 모델 목록 캐시에 직접 반영
+            if hasattr(response, 'data') and response.data:
+                self._apply_cached_list_change('models', [model_id], [self._format_model(row) for row in response.data], response.data)
+            else:
+                self._invalidate_tag('models')
             
             return True
         except Exception as e:
@@ -966,15 +2119,56 @@ class SupabaseDB:
     def delete_model(self, model_id):
         """모델 삭제"""
         try:
-            response = self.client.table('Model').delete().eq('id', model_id).execute()
+            response = self._call('모델 삭제', self.client.table('Model').delete().eq('id', model_id).execute, 'write')
             print(f"[DEBUG] 모델 삭제 응답: {response}")
             
-            # 캐시 무효화
-            self._invalidate_cache('models')
+            # 캐시 갱신 - 삭제된 모델을 모델 목록 캐시에서 제거
+            self._apply_cached_list_change('models', [model_id], [])
             
             return True
         except Exception as e:
             print(f"모델 삭제 중 오류 발생: {e}")
             import traceback
             print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
-            return False 
\ No newline at end of file
+            return False
+    
+    # 연결 확인 및 초기화 메서드
+    def is_connected(self):
+        """Supabase 클라이언트가 초기화되어 있는지 여부 (없으면 한 번 다시 연결)"""
+        if not self.client:
+            self._initialize_connection()
+        return bool(self.client)
+    
+    def _delete_all(self, table, label, tag, keep=None):
+        """table의 행 전체 삭제 (keep=(컬럼, 값)이면 해당 값의 행은 남김)"""
+        try:
+            if not self.is_connected():
+                print(f"[ERROR] Supabase 클라이언트가 초기화되지 않음")
+                return False
+            query = self.client.table(table).delete()
+            query = query.neq(*keep) if keep else query.neq('id', 0)
+            self._call(label, query.execute, 'write')
+            self._invalidate_tag(tag)
+            print(f"[INFO] {label} 완료")
+            return True
+        except Exception as e:
+            print(f"[ERROR] {label} 중 오류 발생: {e}")
+            import traceback
+            print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+            return False
+    
+    def delete_all_production(self):
+        """생산 실적 전체 삭제"""
+        return self._delete_all('Production', '생산 실적 전체 삭제', 'production')
+    
+    def delete_all_models(self):
+        """모델 전체 삭제"""
+        return self._delete_all('Model', '모델 전체 삭제', 'models')
+    
+    def delete_all_workers(self):
+        """작업자 전체 삭제"""
+        return self._delete_all('Workers', '작업자 전체 삭제', 'workers')
+    
+    def delete_all_users(self, keep_role='관리자'):
+        """keep_role 권한을 제외한 사용자 전체 삭제"""
+        return self._delete_all('Users', '사용자 전체 삭제', 'users', keep=('권한', keep_role))
@@ -0,0 +1,241 @@
+"""
+앱(세션 상태)과 저장소 백엔드 사이의 변경분 동기화 모듈
+
+양쪽 행마다 비교 필드의 내용 해시를 계산하여 추가/수정/삭제할 행만 찾고 (SyncPlan),
+확인한 뒤에 변경분만 보냅니다. 생산 실적은 청크 단위 일괄 추가/upsert/삭제를 사용하고,
+행 수가 적은 작업자/모델/사용자는 바뀐 행만 기존 단건 메서드로 반영합니다.
+
+행은 id가 같으면 같은 행으로 보고, id가 없거나 상대편에 없는 행은 자연 키(SYNC_TABLES의 keys)로 찾습니다.
+"""
+import json
+import hashlib
+from utils.storage_backend import PRODUCTION_FIELDS, PRODUCTION_QUANTITY_FIELDS, PRODUCTION_NATURAL_KEY
+
+# 동기화 대상 테이블 설정
+#   label: 화면의 선택 항목 이름, session_key: 세션 상태 키
+#   keys: id가 없을 때 같은 행을 찾는 자연 키, fields: 내용 해시에 포함하는 필드
+#   protect: 삭제하지 않는 행 조건
+# 작업자는 update_worker가 부서를 바꾸지 않으므로 부서는 비교하지 않습니다.
+SYNC_TABLES = {
+    'workers': {
+        'label': '작업자 데이터',
+        'session_key': 'workers',
+        'keys': ['사번'],
+        'fields': ['사번', '이름', '라인번호']
+    },
+    'production': {
+        'label': '생산 실적 데이터',
+        'session_key': 'production_data',
+        'keys': PRODUCTION_NATURAL_KEY,
+        'fields': [field for field in PRODUCTION_FIELDS if field != 'id']
+    },
+    'users': {
+        'label': '사용자 데이터',
+        'session_key': 'users',
+        'keys': ['이메일'],
+        'fields': ['이메일', '비밀번호', '이름', '권한'],
+        'protect': lambda row: row.get('권한') == '관리자'
+    },
+    'models': {
+        'label': '모델 데이터',
+        'session_key': 'models',
+        'keys': ['모델명', '공정'],
+        'fields': ['모델명', '공정']
+    }
+}
+
+
+class SyncPlan:
+    """한 테이블의 동기화 계획
+
+    source_rows를 기준으로 target에 추가할 행(inserts), 수정할 (target 행, source 행) 쌍(updates),
+    target에서 삭제할 행(deletes)과 내용이 같은 행 수(unchanged)를 담습니다.
+    """
+
+    def __init__(self, table, source_rows, inserts, updates, deletes, unchanged):
+        self.table = table
+        self.source_rows = source_rows
+        self.inserts = inserts
+        self.updates = updates
+        self.deletes = deletes
+        self.unchanged = unchanged
+
+    @property
+    def label(self):
+        return SYNC_TABLES[self.table]['label']
+
+    @property
+    def has_changes(self):
+        return bool(self.inserts or self.updates or self.deletes)
+
+    def counts(self):
+        """화면 표시용 건수"""
+        return {'추가': len(self.inserts), '수정': len(self.updates), '삭제': len(self.deletes), '변경 없음': self.unchanged}
+
+
+def _normalize(field, value):
+    """비교용 값 정리 - 날짜는 YYYY-MM-DD, 수량은 정수, 나머지는 문자열 (None은 빈 값)"""
+    if value is None:
+        return 0 if field in PRODUCTION_QUANTITY_FIELDS else ''
+    if field == '날짜':
+        return str(value)[:10]
+    if field in PRODUCTION_QUANTITY_FIELDS:
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+    return str(value)
+
+
+def row_key(table, row):
+    """행의 자연 키 (정리된 값 튜플)"""
+    return tuple(_normalize(field, row.get(field)) for field in SYNC_TABLES[table]['keys'])
+
+
+def row_hash(table, row):
+    """비교 필드의 내용 해시"""
+    values = [_normalize(field, row.get(field)) for field in SYNC_TABLES[table]['fields']]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def build_sync_plan(table, source_rows, target_rows):
+    """source_rows와 같아지도록 target_rows에 반영할 동기화 계획 계산
+
+    id가 같은 행을 먼저 짝짓고, 남은 행은 자연 키가 같은 행 중 내용이 같은 행, 그 다음 아무 행 순서로 짝짓습니다.
+    짝이 없는 source 행은 추가, 짝이 없는 target 행은 삭제 대상입니다 (protect 조건에 맞는 행은 제외).
+    """
+    source_rows = list(source_rows or [])
+    target_rows = list(target_rows or [])
+    target_hashes = [row_hash(table, row) for row in target_rows]
+    target_by_id = {row.get('id'): index for index, row in enumerate(target_rows) if row.get('id') not in (None, '')}
+    matched = set()
+    pairs = []
+    pending = []
+
+    for row in source_rows:
+        index = target_by_id.get(row.get('id')) if row.get('id') not in (None, '') else None
+        if index is None or index in matched:
+            pending.append(row)
+        else:
+            matched.add(index)
+            pairs.append((index, row))
+
+    # id로 짝짓지 못한 행은 자연 키로 찾음 (같은 키가 여러 행이면 내용이 같은 행 우선)
+    by_hash = {}
+    by_key = {}
+    for index, row in enumerate(target_rows):
+        if index not in matched:
+            by_hash.setdefault(target_hashes[index], []).append(index)
+            by_key.setdefault(row_key(table, row), []).append(index)
+
+    def take(candidates):
+        while candidates:
+            index = candidates.pop()
+            if index not in matched:
+                matched.add(index)
+                return index
+        return None
+
+    inserts = []
+    for row in pending:
+        index = take(by_hash.get(row_hash(table, row), []))
+        if index is None:
+            index = take(by_key.get(row_key(table, row), []))
+        if index is None:
+            inserts.append(row)
+        else:
+            pairs.append((index, row))
+
+    updates = []
+    unchanged = 0
+    for index, row in pairs:
+        if target_hashes[index] == row_hash(table, row):
+            unchanged += 1
+        else:
+            updates.append((target_rows[index], row))
+
+    protect = SYNC_TABLES[table].get('protect')
+    deletes = [row for index, row in enumerate(target_rows)
+               if index not in matched and not (protect and protect(row))]
+
+    print(f"[INFO] {table} 동기화 계획: 추가 {len(inserts)}건, 수정 {len(updates)}건, 삭제 {len(deletes)}건, 변경 없음 {unchanged}건")
+    return SyncPlan(table, source_rows, inserts, updates, deletes, unchanged)
+
+
+def load_backend_rows(db, table):
+    """백엔드의 최신 행 목록 조회 (캐시를 건너뛰고, 복제본은 삭제 확인까지 동기화한 뒤 조회)"""
+    if table == 'workers':
+        return db.get_workers(use_cache=False)
+    if table == 'models':
+        return db.get_all_models(use_cache=False)
+    if table == 'users':
+        return db.get_all_users(use_cache=False)
+
+    replica = getattr(db, 'replica', None)
+    if replica is not None:
+        replica.sync_once(reconcile=True)
+    return db.get_production_dataset()
+
+
+def apply_sync_plan(db, plan, allow_deletes=False):
+    """동기화 계획의 변경분을 백엔드에 반영하고 {'추가', '수정', '삭제', '실패', 'errors'} 결과 반환
+
+    allow_deletes가 False이면 삭제 대상 행은 그대로 둡니다.
+    """
+    result = {'추가': 0, '수정': 0, '삭제': 0, '실패': 0, 'errors': []}
+    deletes = plan.deletes if allow_deletes else []
+
+    def record(kind, success, rows=1, error=None):
+        if success:
+            result[kind] += rows
+        else:
+            result['실패'] += rows
+            if error:
+                result['errors'].append(f"{kind}: {error}")
+
+    try:
+        if plan.table == 'production':
+            chunk_results = []
+            if plan.inserts:
+                chunk_results.append(('추가', db.add_production_records(plan.inserts)))
+            if plan.updates:
+                rows = [dict(source, id=target['id']) for target, source in plan.updates]
+                chunk_results.append(('수정', db.upsert_production_records(rows, on_conflict='id')))
+            if deletes:
+                chunk_results.append(('삭제', db.delete_production_records([row['id'] for row in deletes])))
+            for kind, results in chunk_results:
+                for chunk in results:
+                    record(kind, chunk['success'], chunk['rows'], chunk['error'])
+
+        elif plan.table == 'workers':
+            for row in plan.inserts:
+                record('추가', db.add_worker(row.get('사번', ''), row.get('이름', ''), row.get('부서') or 'CNC', row.get('라인번호', '')))
+            for target, source in plan.updates:
+                record('수정', db.update_worker(target.get('이름'), source.get('이름', ''), source.get('사번', ''), source.get('라인번호', '')))
+            for row in deletes:
+                record('삭제', db.delete_worker(row.get('이름')))
+
+        elif plan.table == 'models':
+            for row in plan.inserts:
+                record('추가', db.add_model(row.get('모델명', ''), row.get('공정', '')))
+            for target, source in plan.updates:
+                record('수정', db.update_model(target.get('id'), {'모델명': source.get('모델명', ''), '공정': source.get('공정', '')}))
+            for row in deletes:
+                record('삭제', db.delete_model(row.get('id')))
+
+        elif plan.table == 'users':
+            for row in plan.inserts:
+                record('추가', db.add_user(row.get('이메일', ''), row.get('비밀번호', ''), row.get('이름', ''), row.get('권한') or 'user'))
+            for target, source in plan.updates:
+                data = {field: source.get(field, '') for field in ['이메일', '비밀번호', '이름', '권한']}
+                record('수정', db.update_user(target.get('이메일'), data))
+            for row in deletes:
+                record('삭제', db.delete_user(row.get('이메일')))
+    except Exception as e:
+        print(f"[ERROR] {plan.table} 동기화 반영 중 오류 발생: {e}")
+        import traceback
+        print(f"[DEBUG] 상세 오류: {traceback.format_exc()}")
+        result['errors'].append(str(e))
+
+    print(f"[INFO] {plan.table} 동기화 반영: 추가 {result['추가']}건, 수정 {result['수정']}건, 삭제 {result['삭제']}건, 실패 {result['실패']}건")
+    return result
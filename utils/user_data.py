@@ -1,11 +1,11 @@
 import json
 import os
-from utils.supabase_db import SupabaseDB
+from utils.storage_backend import get_db
 
 def load_user_data():
     try:
         # Supabase에서 사용자 데이터 로드
-        db = SupabaseDB()
+        db = get_db()
         users = db.get_all_users()
         
         # 사용자 데이터 형식 변환
@@ -39,7 +39,7 @@ def load_user_data():
 def save_user_data(user_data):
     try:
         # Supabase에 사용자 데이터 저장
-        db = SupabaseDB()
+        db = get_db()
         
         # 기존 사용자 데이터 로드
         existing_users = {user.get('이메일', ''): user for user in db.get_all_users()}